@@ -1,14 +1,15 @@
-import json
-import csv
-import glob
 import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple
 import numpy as np
 import pandas as pd
-from pymoo.indicators.hv import HV
-from pymoo.indicators.spacing import SpacingIndicator # <-- 1. IMPORT SPACING
 import matplotlib.pyplot as plt
 
+from src.ga.indicators import ReferenceFront, hypervolumes, igd_plus_values, non_dominated, spacings
+from src.ga.result_store import load_runs, store_path
+
 # ============================================================================
 # CONFIGURATION SECTION
 # ============================================================================
@@ -21,63 +22,91 @@ PARAMETER_SETS = ["Baseline", "Deep Search", "High Exploration"]
 ALGORITHMS = ["NSGA-II", "SPEA2"]
 RESULTS_DIR = "results"
 PLOTS_DIR = os.path.join(RESULTS_DIR, "plots")
+# Best-known front of each problem, merged from every campaign analysed so far
+REFERENCE_FRONTS_DIR = os.path.join(RESULTS_DIR, "reference_fronts")
+# Per-run indicator values and plot inputs from earlier invocations; only runs
+# whose front (or problem reference point/front) changed are recomputed
+CACHE_FILE = os.path.join(RESULTS_DIR, "analysis_cache.json")
+# Processes used for indicator computation and plot rendering (None: all CPUs)
+ANALYSIS_WORKERS = None
 
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_summary_data(algorithm: str, problem: str, param_set: str) -> List[Dict]:
-    """Load all summary.json files for a given scenario."""
-    pattern = os.path.join(RESULTS_DIR, algorithm, problem, param_set, "run_*", "summary.json")
-    summaries = []
-    for file_path in glob.glob(pattern):
-        try:
-            with open(file_path, 'r') as f:
-                summaries.append(json.load(f))
-        except Exception as e:
-            print(f"Warning: Could not load {file_path}: {e}")
-    return summaries
-
-def load_pareto_fronts(algorithm: str, problem: str, param_set: str) -> List[List[Dict]]:
-    """Load all final_pareto_front.csv files for a given scenario."""
-    pattern = os.path.join(RESULTS_DIR, algorithm, problem, param_set, "run_*", "final_pareto_front.csv")
-    fronts = []
-    for file_path in glob.glob(pattern):
-        try:
-            with open(file_path, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                front = [{'total_distance': float(row['total_distance']), 'max_route_length': float(row['max_route_length'])} for row in reader]
-                if front:
-                    fronts.append(front)
-        except Exception as e:
-            print(f"Warning: Could not load {file_path}: {e}")
-    return fronts
-
-def fronts_to_array(fronts: List[List[Dict]]) -> List[np.ndarray]:
-    """Convert list of fronts to list of numpy arrays."""
-    return [np.array([[sol['total_distance'], sol['max_route_length']] for sol in front]) for front in fronts if front]
+def load_campaign(store_file: str) -> Dict[str, Dict[str, Dict[str, Dict]]]:
+    """Load every run of a campaign from its result store with one bulk query.
+
+    Returns all_data[problem][param_set][algorithm] = {'summaries': [...], 'fronts_np': [...],
+    'run_ids': [...]} for the configured problems, parameter sets and algorithms;
+    run_ids[i] is the run that produced fronts_np[i].
+    """
+    all_data = {p: {ps: {a: {'summaries': [], 'fronts_np': [], 'run_ids': []} for a in ALGORITHMS} for ps in PARAMETER_SETS} for p in PROBLEM_NAMES}
+    if not os.path.exists(store_file):
+        print(f"Warning: No result store found at {store_file}")
+        return all_data
+    for algorithm, problem, param_set, run_id, runtime, objectives in load_runs(store_file):
+        scenario = all_data.get(problem, {}).get(param_set, {}).get(algorithm)
+        if scenario is None:
+            continue
+        scenario['summaries'].append({'run_id': run_id, 'wall_clock_time_sec': runtime})
+        if objectives.size > 0:
+            scenario['fronts_np'].append(objectives)
+            scenario['run_ids'].append(run_id)
+    return all_data
+
+def load_cache(cache_file: str) -> Dict:
+    """Indicator and plot cache written by a previous analysis (empty if missing or unreadable)."""
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.setdefault('indicators', {})
+    cache.setdefault('plots', {})
+    return cache
+
+def save_cache(cache: Dict, cache_file: str):
+    """Write the cache atomically so an interrupted analysis never corrupts it."""
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+def front_digest(front: np.ndarray) -> str:
+    """Content hash of a front's objective values."""
+    return hashlib.sha1(np.ascontiguousarray(front, dtype=np.float64).tobytes()).hexdigest()
 
 # ============================================================================
 # STATISTICAL AND PLOTTING HELPER FUNCTIONS
 # ============================================================================
 
+def compute_indicators(task: Tuple[List[str], List[np.ndarray], np.ndarray, np.ndarray]) -> List[Tuple[str, float, float | None, float]]:
+    """Hypervolume, spacing and IGD+ of all stale fronts of one problem at once; runs in a worker.
+
+    task is (cache keys, fronts, reference point, best-known front); returns
+    (cache key, hypervolume, spacing, igd+) per front.
+    """
+    keys, fronts, ref_point, reference_front = task
+    hv_values = hypervolumes(fronts, ref_point)
+    # Spacing is only defined for fronts with more than one solution (NaN otherwise)
+    sp_values = spacings(fronts)
+    igd_values = igd_plus_values(fronts, reference_front)
+    return [
+        (key, float(hv), None if np.isnan(sp) else float(sp), float(igd))
+        for key, hv, sp, igd in zip(keys, hv_values, sp_values, igd_values)
+    ]
+
 def find_non_dominated_front(points: np.ndarray) -> np.ndarray:
-    """Finds the non-dominated front from a given set of points."""
+    """Finds the non-dominated front from a given set of points, sorted by total distance."""
     if points.size == 0:
         return np.array([])
-    unique_points = np.unique(points, axis=0)
-    is_dominated = np.zeros(len(unique_points), dtype=bool)
-    for i, p1 in enumerate(unique_points):
-        dominating_mask = np.all(unique_points <= p1, axis=1) & np.any(unique_points < p1, axis=1)
-        if np.any(dominating_mask):
-            is_dominated[i] = True
-    non_dominated_points = unique_points[~is_dominated]
-    return non_dominated_points[non_dominated_points[:, 0].argsort()]
+    return non_dominated(points)
 
 def create_summary_csv(all_results: List[Dict]):
     """Create a CSV file containing summary statistics for all analyzed scenarios."""
     # --- 2. ADD SPACING TO THE CSV HEADERS ---
-    headers = ["Problem", "Parameters", "Algorithm", "Mean Runtime (s)", "Std Dev Runtime (s)", "Mean Hypervolume", "Std Dev Hypervolume", "Mean Spacing", "Std Dev Spacing"]
+    headers = ["Problem", "Parameters", "Algorithm", "Mean Runtime (s)", "Std Dev Runtime (s)", "Mean Hypervolume", "Std Dev Hypervolume", "Mean Spacing", "Std Dev Spacing", "Mean IGD+", "Std Dev IGD+"]
     df = pd.DataFrame(all_results, columns=headers)
     df.sort_values(by=["Problem", "Parameters", "Algorithm"], inplace=True)
     output_filename = "analysis_summary.csv"
@@ -141,18 +170,18 @@ def main():
     
     # Step 1: Load all data
     print("\n--- Loading all summary and front data... ---")
-    all_data = {p: {ps: {a: {} for a in ALGORITHMS} for ps in PARAMETER_SETS} for p in PROBLEM_NAMES}
-    for problem in PROBLEM_NAMES:
-        for param_set in PARAMETER_SETS:
-            for algorithm in ALGORITHMS:
-                all_data[problem][param_set][algorithm]['summaries'] = load_summary_data(algorithm, problem, param_set)
-                fronts_list = load_pareto_fronts(algorithm, problem, param_set)
-                all_data[problem][param_set][algorithm]['fronts_np'] = fronts_to_array(fronts_list)
+    all_data = load_campaign(store_path(RESULTS_DIR))
     print("All data loaded successfully.")
 
-    # Step 2: Perform statistical analysis
+    # Step 2: Perform statistical analysis. Indicator values are cached per run,
+    # keyed by a hash of its front, the problem's reference point (which moves
+    # when new runs extend the objective ranges) and the problem's best-known
+    # front used for IGD+; only stale runs are recomputed.
     print("\n--- Performing statistical analysis... ---")
-    statistical_results = []
+    cache = load_cache(CACHE_FILE)
+    tasks = []
+    run_keys = {}
+    num_stale = 0
     for problem in PROBLEM_NAMES:
         all_points_for_problem = []
         for param_set in PARAMETER_SETS:
@@ -163,30 +192,63 @@ def main():
         if not all_points_for_problem: continue
         ref_point = np.max(np.vstack(all_points_for_problem), axis=0) * 1.1
         print(f"  - Unified Reference Point for {problem}: [{ref_point[0]:.2f}, {ref_point[1]:.2f}]")
+        reference_file = os.path.join(REFERENCE_FRONTS_DIR, f"{problem}.npy")
+        reference = ReferenceFront.load(reference_file)
+        if reference.update(np.vstack(all_points_for_problem)):
+            reference.save(reference_file)
+        reference_digest = front_digest(reference.points)
+        stale_keys, stale_fronts = [], []
 
         for param_set in PARAMETER_SETS:
             for algorithm in ALGORITHMS:
-                summaries = all_data[problem][param_set][algorithm]['summaries']
-                fronts_np = all_data[problem][param_set][algorithm]['fronts_np']
-                
+                data = all_data[problem][param_set][algorithm]
+                data['keys'] = []
+                for run_id, front in zip(data['run_ids'], data['fronts_np']):
+                    key = f"{algorithm}|{problem}|{param_set}|{run_id}"
+                    data['keys'].append(key)
+                    run_keys[key] = {'digest': front_digest(front), 'ref_point': ref_point.tolist(), 'reference': reference_digest}
+                    entry = cache['indicators'].get(key)
+                    if entry is None or any(entry.get(field) != value for field, value in run_keys[key].items()):
+                        stale_keys.append(key)
+                        stale_fronts.append(front)
+        if stale_keys:
+            tasks.append((stale_keys, stale_fronts, ref_point, reference.points))
+            num_stale += len(stale_keys)
+
+    print(f"  - {len(run_keys) - num_stale} runs cached, computing indicators for {num_stale}")
+    if tasks:
+        with ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+            for results in executor.map(compute_indicators, tasks):
+                for key, hv, spacing, igd_plus in results:
+                    cache['indicators'][key] = {**run_keys[key], 'hv': hv, 'spacing': spacing, 'igd_plus': igd_plus}
+        save_cache(cache, CACHE_FILE)
+
+    statistical_results = []
+    for problem in PROBLEM_NAMES:
+        for param_set in PARAMETER_SETS:
+            for algorithm in ALGORITHMS:
+                data = all_data[problem][param_set][algorithm]
+                if 'keys' not in data: continue
+                summaries = data['summaries']
+                entries = [cache['indicators'][key] for key in data['keys']]
+
                 time_mean, time_std = (np.mean([s['wall_clock_time_sec'] for s in summaries]), np.std([s['wall_clock_time_sec'] for s in summaries])) if summaries else (0,0)
-                
-                hv_indicator = HV(ref_point=ref_point)
-                hv_values = [hv_indicator(f) for f in fronts_np if f.size > 0]
+
+                hv_values = [e['hv'] for e in entries]
                 hv_mean, hv_std = (np.mean(hv_values), np.std(hv_values)) if hv_values else (0,0)
- 
-                # --- 3. CALCULATE SPACING METRIC ---
-                sp_indicator = SpacingIndicator()
-                # Spacing is only defined for fronts with more than one solution
-                sp_values = [sp_indicator(f) for f in fronts_np if f.shape[0] > 1]
+
+                sp_values = [e['spacing'] for e in entries if e['spacing'] is not None]
                 sp_mean, sp_std = (np.mean(sp_values), np.std(sp_values)) if sp_values else (0,0)
 
-                # --- 4. ADD SPACING TO THE RESULTS DICTIONARY ---
+                igd_values = [e['igd_plus'] for e in entries]
+                igd_mean, igd_std = (np.mean(igd_values), np.std(igd_values)) if igd_values else (0,0)
+
                 statistical_results.append({
                     "Problem": problem, "Parameters": param_set, "Algorithm": algorithm,
                     "Mean Runtime (s)": time_mean, "Std Dev Runtime (s)": time_std,
                     "Mean Hypervolume": hv_mean, "Std Dev Hypervolume": hv_std,
-                    "Mean Spacing": sp_mean, "Std Dev Spacing": sp_std
+                    "Mean Spacing": sp_mean, "Std Dev Spacing": sp_std,
+                    "Mean IGD+": igd_mean, "Std Dev IGD+": igd_std
                 })
     print("Statistical analysis complete.")
 
@@ -194,13 +256,31 @@ def main():
     if statistical_results:
         create_summary_csv(statistical_results)
 
-    # Step 4: Generate plots
+    # Step 4: Generate plots, in parallel, skipping problems whose fronts are
+    # unchanged since their plot was last rendered
     print("\n--- Generating comparison plots for each problem... ---")
+    stale_plots = {}
     for problem in PROBLEM_NAMES:
-        try:
-            plot_problem_comparison(problem, all_data[problem], PLOTS_DIR)
-        except Exception as e:
-            print(f"  [ERROR] Could not generate plot for {problem}: {e}")
+        digests = sorted(run_keys[key]['digest'] for key in run_keys if key.split('|')[1] == problem)
+        plot_digest = hashlib.sha1("".join(digests).encode()).hexdigest()
+        plot_file = os.path.join(PLOTS_DIR, f"{problem}_fronts_comparison.png")
+        if cache['plots'].get(problem) == plot_digest and os.path.exists(plot_file):
+            print(f"  - Plot for {problem} is up to date")
+            continue
+        stale_plots[problem] = plot_digest
+    if stale_plots:
+        with ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+            futures = {
+                problem: executor.submit(plot_problem_comparison, problem, all_data[problem], PLOTS_DIR)
+                for problem in stale_plots
+            }
+            for problem, future in futures.items():
+                try:
+                    future.result()
+                    cache['plots'][problem] = stale_plots[problem]
+                except Exception as e:
+                    print(f"  [ERROR] Could not generate plot for {problem}: {e}")
+        save_cache(cache, CACHE_FILE)
     print("Plot generation complete.")
     
     print("\n" + "="*80)
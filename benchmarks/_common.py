@@ -0,0 +1,31 @@
+import random
+import time
+
+
+def make_scenario(num_customers: int, seed: int = 0, capacity: int = 100, num_vehicles: int | None = None) -> dict:
+    """Builds a random uniform CVRP scenario_data dict (X-set style coordinates in [0, 1000])."""
+    rng = random.Random(seed)
+    customers = [(float(rng.randint(0, 1000)), float(rng.randint(0, 1000))) for _ in range(num_customers)]
+    demands = [rng.randint(1, 30) for _ in range(num_customers)]
+    if num_vehicles is None:
+        num_vehicles = max(1, -(-sum(demands) // capacity))
+    return {
+        "name": f"bench-n{num_customers}",
+        "num_vehicles": num_vehicles,
+        "depot": (500.0, 500.0),
+        "customers": customers,
+        "customer_demands": demands,
+        "num_customers": num_customers,
+        "vehicle_capacity": capacity,
+        "fleet_utilization": sum(demands) / (num_vehicles * capacity),
+    }
+
+
+def best_of(fn, repeats: int = 3) -> float:
+    """Returns the best wall-clock time (seconds) of `repeats` calls to fn()."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
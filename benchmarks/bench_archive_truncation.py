@@ -0,0 +1,41 @@
+"""SPEA2 archive truncation cost per removed individual.
+
+Truncates 2A non-dominated candidates down to an archive of size A and reports
+the time per removal, which should grow roughly linearly with A.
+
+Run from the repository root:
+    python -m benchmarks.bench_archive_truncation
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks._common import best_of
+from src.ga.spea2_fitness import truncate_archive
+
+
+class _Point:
+    # Minimal stand-in for Individual: truncation only reads the objectives
+    __slots__ = ("objectives",)
+
+    def __init__(self, objectives):
+        self.objectives = objectives
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SPEA2 archive truncation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'A':>6} | {'candidates':>10} | {'total (ms)':>10} | {'per removal (us)':>16} | {'us / A':>7}")
+    for size in args.sizes:
+        x = np.sort(rng.uniform(0, 1, 2 * size))
+        candidates = [_Point([1000 + 500 * a, 200 + 100 * (1 - a) ** 2]) for a in x.tolist()]
+        elapsed = best_of(lambda: truncate_archive(candidates, size), repeats=2)
+        per_removal = 1e6 * elapsed / size
+        print(f"{size:>6} | {2 * size:>10} | {1000 * elapsed:10.1f} | {per_removal:16.1f} | {per_removal / size:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
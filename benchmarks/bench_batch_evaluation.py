@@ -0,0 +1,36 @@
+"""Population evaluation: evaluate() per individual vs. evaluate_batch().
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_evaluation
+"""
+import argparse
+import glob
+import os
+import random
+
+from benchmarks._common import best_of
+from src.ga.fitness import FitnessEvaluator
+from src.ga.individual import Individual
+from src.vrp.load_set import load_problem_instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch population evaluation.")
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--split-mode", default="penalty")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'problem':>12} | {'per-individual (ms)':>19} | {'batch (ms)':>10} | speedup")
+    for file_path in sorted(glob.glob(os.path.join("data", "*.txt"))):
+        problem = load_problem_instance(file_path)
+        evaluator = FitnessEvaluator(problem, split_mode=args.split_mode)
+        pop = [Individual(problem) for _ in range(args.population)]
+
+        t_single = best_of(lambda: [evaluator.evaluate(ind) for ind in pop])
+        t_batch = best_of(lambda: evaluator.evaluate_batch(pop))
+        print(f"{problem.name:>12} | {1000 * t_single:19.2f} | {1000 * t_batch:10.2f} | {t_single / t_batch:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
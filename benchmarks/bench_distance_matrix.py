@@ -0,0 +1,54 @@
+"""Distance matrix construction time: vectorised NumPy vs. the old nested Python loop,
+and the memory of the dense matrix vs. on-demand distances with a k-NN cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_distance_matrix
+"""
+import argparse
+import math
+
+import numpy as np
+
+from benchmarks._common import make_scenario, best_of
+from src.vrp.distances import dense_matrix
+from src.vrp.problem import ProblemInstance
+
+
+def legacy_distance_matrix(locations):
+    # The original list-of-lists implementation, kept here for comparison only
+    n = len(locations)
+    matrix = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                p1, p2 = locations[i], locations[j]
+                matrix[i][j] = math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark distance matrix construction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000, 10000])
+    parser.add_argument("--legacy-max", type=int, default=2000, help="Largest n to time the nested loop on.")
+    args = parser.parse_args()
+
+    print(f"{'n':>7} | {'loop (s)':>10} | {'float64 (s)':>11} | {'float32 (s)':>11} | {'MB f64':>8} | {'MB on-demand':>12}")
+    for n in args.sizes:
+        scenario = make_scenario(n)
+        # Built on demand so only the timed calls materialise the matrix
+        problem = ProblemInstance(scenario, distance_mode="on_demand")
+        problem.nearest_neighbours()
+        t64 = best_of(lambda: dense_matrix(problem.coordinates, np.float64))
+        t32 = best_of(lambda: dense_matrix(problem.coordinates, np.float32))
+        if n <= args.legacy_max:
+            t_loop = best_of(lambda: legacy_distance_matrix(problem.all_locations), repeats=1)
+            loop_str = f"{t_loop:10.4f}"
+        else:
+            loop_str = f"{'-':>10}"
+        mb = (n + 1) ** 2 * np.dtype(np.float64).itemsize / 1e6
+        mb_on_demand = problem.distances.nbytes / 1e6
+        print(f"{n:>7} | {loop_str} | {t64:11.4f} | {t32:11.4f} | {mb:8.1f} | {mb_on_demand:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
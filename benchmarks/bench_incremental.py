@@ -0,0 +1,74 @@
+"""Mutation-only offspring: full re-split vs. incremental suffix re-evaluation.
+
+Each parent is copied (no crossover) and swap-mutated once, then the children
+are evaluated with and without the parents' split labels.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental
+"""
+import argparse
+import glob
+import os
+import random
+
+from benchmarks._common import make_scenario, best_of
+from src.ga.fitness import FitnessEvaluator
+from src.ga.individual import Individual
+from src.ga.operators import pmx_crossover, swap_mutation
+from src.vrp.load_set import load_problem_instance
+from src.vrp.problem import ProblemInstance
+
+
+def mutated_children(parents):
+    children = []
+    for parent in parents:
+        child, _ = pmx_crossover(parent, parent, 0.0)
+        swap_mutation(child, 1.0)
+        children.append(child)
+    return children
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental split re-evaluation.")
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--split-mode", default="penalty", choices=["penalty", "bounded"])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[200, 400])
+    args = parser.parse_args()
+
+    problems = [load_problem_instance(f) for f in sorted(glob.glob(os.path.join("data", "X-*.txt")))]
+    problems += [ProblemInstance(make_scenario(n)) for n in args.sizes]
+
+    random.seed(0)
+    print(f"{'problem':>12} | {'path':>6} | {'full (ms)':>9} | {'incremental (ms)':>16} | speedup")
+    for problem in problems:
+        evaluator = FitnessEvaluator(problem, split_mode=args.split_mode)
+        parents = [Individual(problem) for _ in range(args.population)]
+        evaluator.evaluate_batch(parents)
+        children = mutated_children(parents)
+
+        def fresh():
+            # Same chromosomes without any inherited split labels
+            return [Individual(problem, chromosome=list(c.chromosome)) for c in children]
+
+        # First modified position of each child, to restore its state between repeats
+        positions = [child.split_valid_prefix for child in children]
+
+        def reset(pop):
+            for child, parent, position in zip(pop, parents, positions):
+                child.inherit_split_state(parent)
+                child.mark_modified(position)
+
+        for path, run in (("single", lambda pop: [evaluator.evaluate(c) for c in pop]),
+                          ("batch", evaluator.evaluate_batch)):
+            t_full = best_of(lambda: run(fresh()))
+            pop = children
+
+            def incremental():
+                reset(pop)
+                run(pop)
+            t_incr = best_of(incremental)
+            print(f"{problem.name:>12} | {path:>6} | {1000 * t_full:9.2f} | {1000 * t_incr:16.2f} | {t_full / t_incr:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Instance loading time: parsing the CVRPLIB file vs. reading its .npz/.npy cache.
+
+Writes X-set style instance files for each size to a temporary directory and
+times load_problem_instance with and without the cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_instance_loading
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks._common import make_scenario, best_of
+from src.vrp.load_set import load_problem_instance
+
+
+def write_instance(path: str, scenario: dict) -> None:
+    # CVRPLIB layout as in data/X-*.txt (tab separated, depot is node 1)
+    locations = [scenario["depot"]] + scenario["customers"]
+    demands = [0] + scenario["customer_demands"]
+    with open(path, "w") as f:
+        f.write(f"NAME : \t{scenario['name']}-k{scenario['num_vehicles']}\t\n")
+        f.write(f"TYPE : \tCVRP\t\nDIMENSION : \t{len(locations)}\t\nEDGE_WEIGHT_TYPE : \tEUC_2D\t\n")
+        f.write(f"CAPACITY : \t{scenario['vehicle_capacity']}\t\nNODE_COORD_SECTION\t\t\n")
+        f.writelines(f"{i + 1}\t{int(x)}\t{int(y)}\t\n" for i, (x, y) in enumerate(locations))
+        f.write("DEMAND_SECTION\t\t\n")
+        f.writelines(f"{i + 1}\t{d}\t\n" for i, d in enumerate(demands))
+        f.write("DEPOT_SECTION\t\t\n\t1\t\n\t-1\t\nEOF\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark instance parsing vs. the binary instance cache.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'n':>7} | {'parse (ms)':>10} | {'cached (ms)':>11} | {'speed-up':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.sizes:
+            path = os.path.join(directory, f"bench-n{n}.txt")
+            write_instance(path, make_scenario(n))
+            t_parse = best_of(lambda: load_problem_instance(path, use_cache=False))
+            load_problem_instance(path)  # writes the cache
+            t_cached = best_of(lambda: load_problem_instance(path))
+            print(f"{n:>7} | {t_parse * 1e3:10.1f} | {t_cached * 1e3:11.1f} | {t_parse / t_cached:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
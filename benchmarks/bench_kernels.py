@@ -0,0 +1,68 @@
+"""Numba kernels vs. the pure-Python fallback: identical results and timings.
+
+Run from the repository root (numba must be installed for the compiled column):
+    python -m benchmarks.bench_kernels
+"""
+import argparse
+import glob
+import os
+import random
+
+from benchmarks._common import best_of
+from src.ga import kernels
+from src.ga.fitness import FitnessEvaluator
+from src.ga.individual import Individual
+from src.ga.pareto_selection import fast_non_dominated_sort
+from src.ga.spea2_fitness import calculate_spea2_fitness
+from src.vrp.load_set import load_problem_instance
+
+
+def run_all(problem, chromosomes, split_mode):
+    """Evaluates, ranks and SPEA2-scores the chromosomes with the current backend."""
+    evaluator = FitnessEvaluator(problem, split_mode=split_mode)
+    pop = [Individual(problem, chromosome=list(c)) for c in chromosomes]
+    timings = {
+        "evaluate": best_of(lambda: [evaluator.evaluate(ind) for ind in pop]),
+        "sort": best_of(lambda: fast_non_dominated_sort(pop)),
+        "spea2": best_of(lambda: calculate_spea2_fitness(pop, [])),
+    }
+    results = [(tuple(ind.objectives), ind.routes, ind.pareto_rank, ind.spea2_fitness) for ind in pop]
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the numba kernels with the Python fallback.")
+    parser.add_argument("--population", type=int, default=200)
+    parser.add_argument("--split-mode", default="penalty", choices=["penalty", "bounded"])
+    args = parser.parse_args()
+
+    if not kernels.NUMBA_AVAILABLE:
+        print("numba is not installed; only the Python path is available.")
+        return
+    kernels.warm_up()
+
+    rng = random.Random(0)
+    print(f"{'problem':>12} | {'phase':>8} | {'python (ms)':>11} | {'numba (ms)':>10} | speedup")
+    for file_path in sorted(glob.glob(os.path.join("data", "*.txt"))):
+        problem = load_problem_instance(file_path)
+        chromosomes = []
+        for _ in range(args.population):
+            chromo = list(range(1, problem.num_customers + 1))
+            rng.shuffle(chromo)
+            chromosomes.append(chromo)
+
+        kernels.set_enabled(False)
+        py_results, py_times = run_all(problem, chromosomes, args.split_mode)
+        kernels.set_enabled(True)
+        jit_results, jit_times = run_all(problem, chromosomes, args.split_mode)
+
+        if py_results != jit_results:
+            raise SystemExit(f"Mismatch between Python and numba results on {problem.name}")
+        for phase in py_times:
+            print(f"{problem.name:>12} | {phase:>8} | {1000 * py_times[phase]:11.2f} | "
+                  f"{1000 * jit_times[phase]:10.2f} | {py_times[phase] / jit_times[phase]:6.1f}x")
+    print("Objectives, routes, Pareto ranks and SPEA2 fitness are identical on both paths.")
+
+
+if __name__ == "__main__":
+    main()
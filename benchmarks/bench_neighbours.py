@@ -0,0 +1,45 @@
+"""k-nearest-neighbour index build time: distance-matrix argpartition, blocked
+coordinate scan and (with scipy) KD-tree.
+
+Run from the repository root:
+    python -m benchmarks.bench_neighbours
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks._common import make_scenario, best_of
+from src.vrp.distances import dense_matrix
+from src.vrp.neighbours import SCIPY_AVAILABLE, build_neighbour_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark k-nearest-neighbour index construction.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000, 10000])
+    parser.add_argument("-k", type=int, default=10, help="Neighbours per location.")
+    parser.add_argument("--matrix-max", type=int, default=5000, help="Largest n to build a dense distance matrix for.")
+    args = parser.parse_args()
+
+    print(f"{'n':>7} | {'matrix (s)':>10} | {'brute (s)':>10} | {'kdtree (s)':>10} | {'index KB':>8}")
+    for n in args.sizes:
+        scenario = make_scenario(n)
+        coordinates = np.asarray([scenario["depot"]] + scenario["customers"], dtype=np.float64)
+        if n <= args.matrix_max:
+            # Built directly: ProblemInstance stops materialising it above DENSE_MAX_CUSTOMERS
+            distance_matrix = dense_matrix(coordinates)
+            t_matrix = best_of(lambda: build_neighbour_index(coordinates, args.k, distance_matrix, "matrix"))
+            matrix_str = f"{t_matrix:10.4f}"
+        else:
+            matrix_str = f"{'-':>10}"
+        t_brute = best_of(lambda: build_neighbour_index(coordinates, args.k, method="brute"))
+        if SCIPY_AVAILABLE:
+            t_kdtree = best_of(lambda: build_neighbour_index(coordinates, args.k, method="kdtree"))
+            kdtree_str = f"{t_kdtree:10.4f}"
+        else:
+            kdtree_str = f"{'n/a':>10}"
+        kb = build_neighbour_index(coordinates, args.k, method="brute").nbytes / 1e3
+        print(f"{n:>7} | {matrix_str} | {t_brute:10.4f} | {kdtree_str} | {kb:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Non-dominated sorting: Deb's fast sort vs. the O(N log N) bi-objective sweep.
+
+Objectives are random points on a few noisy trade-off curves, so populations
+contain several fronts and duplicates, as in a running GA.
+
+Run from the repository root:
+    python -m benchmarks.bench_non_dominated_sort
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks._common import best_of
+from src.ga import kernels
+from src.ga.pareto_selection import fast_non_dominated_sort, bi_objective_non_dominated_sort
+
+
+class _Point:
+    # Minimal stand-in for Individual: the sorters only touch these two attributes
+    __slots__ = ("objectives", "pareto_rank")
+
+    def __init__(self, objectives):
+        self.objectives = objectives
+        self.pareto_rank = -1
+
+
+def make_population(size, rng):
+    x = rng.uniform(0, 1, size)
+    layer = rng.integers(0, 10, size)
+    y = (1 - x) + 0.1 * layer + rng.normal(0, 0.01, size)
+    objectives = np.round(np.column_stack([1000 + 500 * x, 200 + 100 * y]), 1)
+    return [_Point(list(obj)) for obj in objectives.tolist()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark non-dominated sorting.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--fast-max", type=int, default=2000, help="Largest N to run the O(N^2) sort on.")
+    args = parser.parse_args()
+
+    kernels.warm_up()
+    rng = np.random.default_rng(0)
+    print(f"{'N':>7} | {'fast (ms)':>10} | {'bi_objective (ms)':>17} | {'fronts':>6} | speedup")
+    for size in args.sizes:
+        pop = make_population(size, rng)
+        t_bi = best_of(lambda: bi_objective_non_dominated_sort(pop))
+        bi_ranks = [p.pareto_rank for p in pop]
+        num_fronts = max(bi_ranks)
+        if size <= args.fast_max:
+            t_fast = best_of(lambda: fast_non_dominated_sort(pop), repeats=1)
+            if [p.pareto_rank for p in pop] != bi_ranks:
+                raise SystemExit(f"Rank mismatch at N={size}")
+            print(f"{size:>7} | {1000 * t_fast:10.2f} | {1000 * t_bi:17.2f} | {num_fronts:>6} | {t_fast / t_bi:6.1f}x")
+        else:
+            print(f"{size:>7} | {'-':>10} | {1000 * t_bi:17.2f} | {num_fronts:>6} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Split engine micro-benchmark: penalty (original O(n^2)) vs. bounded vs. linear.
+
+Every engine runs compiled when numba is available; set CVRP_NUMBA=0 to time
+the pure-Python versions.
+
+Run from the repository root:
+    python -m benchmarks.bench_split
+"""
+import argparse
+import glob
+import os
+import random
+
+from benchmarks._common import make_scenario, best_of
+from src.ga import kernels
+from src.ga.fitness import FitnessEvaluator, SPLIT_MODES
+from src.vrp.load_set import load_problem_instance
+from src.vrp.problem import ProblemInstance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the split engines.")
+    parser.add_argument("--chromosomes", type=int, default=200, help="Chromosomes evaluated per timing.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[200, 500], help="Extra random instance sizes.")
+    args = parser.parse_args()
+
+    problems = [load_problem_instance(f) for f in sorted(glob.glob(os.path.join("data", "*.txt")))]
+    problems += [ProblemInstance(make_scenario(n)) for n in args.sizes]
+
+    rng = random.Random(0)
+    print(f"Split engines {'compiled with numba' if kernels.is_enabled() else 'in pure Python'}")
+    print(f"{'problem':>14} | " + " | ".join(f"{m + ' (ms)':>14}" for m in SPLIT_MODES) + " | speedup")
+    for problem in problems:
+        chromosomes = []
+        for _ in range(args.chromosomes):
+            chromo = list(range(1, problem.num_customers + 1))
+            rng.shuffle(chromo)
+            chromosomes.append(chromo)
+
+        times = {}
+        for mode in SPLIT_MODES:
+            evaluator = FitnessEvaluator(problem, split_mode=mode)
+            times[mode] = best_of(lambda: [evaluator._split(c, problem.num_vehicles) for c in chromosomes])
+        per_call = " | ".join(f"{1000 * times[m] / args.chromosomes:14.3f}" for m in SPLIT_MODES)
+        print(f"{problem.name:>14} | {per_call} | {times['penalty'] / times['linear']:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Offspring creation: per-pair PMX + swap loop vs. the batched operators.
+
+The loop is the previous variation step (pmx_chromosomes and a list swap per
+child, one pair at a time); the batched path is operators.create_offspring.
+
+Run from the repository root:
+    python -m benchmarks.bench_variation
+"""
+import argparse
+import random
+
+import numpy as np
+
+from benchmarks._common import make_scenario, best_of
+from src.ga.operators import create_offspring, pmx_chromosomes
+from src.ga.population import Population
+from src.vrp.problem import ProblemInstance
+
+
+def loop_offspring(parents, pc, pm, offspring_size):
+    pool_size = len(parents)
+    size = len(parents[0])
+    children = []
+    for i in range(0, offspring_size, 2):
+        o1, o2, _ = pmx_chromosomes(parents[i % pool_size], parents[(i + 1) % pool_size], pc)
+        for child in (o1, o2):
+            if random.random() < pm:
+                idx1, idx2 = random.sample(range(size), 2)
+                child[idx1], child[idx2] = child[idx2], child[idx1]
+        children.extend((o1, o2))
+    return children[:offspring_size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched PMX crossover and swap mutation.")
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--populations", type=int, nargs="*", default=[100, 1000, 10000])
+    parser.add_argument("--pc", type=float, default=0.9)
+    parser.add_argument("--pm", type=float, default=0.2)
+    args = parser.parse_args()
+
+    problem = ProblemInstance(make_scenario(args.customers))
+    rng = np.random.default_rng(0)
+    random.seed(0)
+
+    print(f"{'population':>10} | {'loop (ms)':>10} | {'batched (ms)':>12} | speedup")
+    for population_size in args.populations:
+        chromosomes = np.array([rng.permutation(args.customers) + 1 for _ in range(population_size)])
+        pool = Population(problem, chromosomes)
+        parents = pool.chromosomes.tolist()
+
+        t_loop = best_of(lambda: loop_offspring(parents, args.pc, args.pm, population_size))
+        t_batch = best_of(lambda: create_offspring(pool, args.pc, args.pm, population_size, rng))
+        print(f"{population_size:>10} | {1000 * t_loop:10.2f} | {1000 * t_batch:12.2f} | {t_loop / t_batch:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,49 @@ from src.ga.fitness import FitnessEvaluator
 from src.ga.individual import Individual
 from src.ga.algorithms import run_nsga2, run_spea2, create_valid_pop, save_population_chromosomes, load_population_from_file
 from src.ga.pareto_selection import fast_non_dominated_sort
-from src.ga.logger import log_run_results
+from src.ga.logger import log_run_results, run_directory
+from src.ga.result_store import ResultStore, store_path
+from src.ga import kernels
+from src.vrp import shared
+from src.experiments.scheduler import Job, run_jobs
+from src.ga.seeding import describe_seed, run_generators, spawn_seeds
+from src.ga.profiling import PROFILE_MODES, PhaseProfiler
+from src.ga.local_search import LocalSearch
 import glob
+import json
+import shutil
 import time
-from concurrent.futures import ProcessPoolExecutor
-from itertools import repeat
+import zlib
+import numpy as np
 from contextlib import redirect_stdout, redirect_stderr
 
 ## -- Configuration -- ##
 runs_per = 20
 output_base_dir = "results"
+# Split engine used by the FitnessEvaluator: "penalty" (original, overloaded routes x10),
+# "bounded" (capacity-windowed DP) or "linear" (Vidal's O(n) deque split)
+split_mode = "penalty"
+# Max chromosomes kept in each FitnessEvaluator's LRU evaluation cache (0 disables it)
+evaluation_cache_size = 20000
+# Round EUC_2D distances to integers as TSPLIB specifies (int32 matrix, integer split
+# costs), so objectives are comparable with the published CVRPLIB best-knowns;
+# False keeps exact Euclidean distances
+round_distances = True
+# Non-dominated sorting used by NSGA-II: "fast" (Deb's O(MN^2)) or "bi_objective" (O(N log N))
+nsga2_sorter = "bi_objective"
+# Generations between run checkpoints, used by --resume to continue interrupted runs (0 disables)
+checkpoint_interval = 50
+# Entropy of the campaign's root seed; None draws fresh entropy (recorded in
+# {output_base_dir}/campaign.json so --resume keeps the same per-run seeds)
+campaign_seed = None
+# Write per-generation convergence telemetry (telemetry.bin in each run's directory)
+record_telemetry = True
+# Result directory of each algorithm under output_base_dir
+algorithm_dirs = {'nsga2': 'NSGA-II', 'spea2': 'SPEA2'}
+
+# A parameter set may add "local_search": {"neighbours": 10, "rate": 0.2} to educate
+# that fraction of each generation's offspring with granular local search
+# (see src/ga/local_search.py); re-evaluations count towards the evaluations
 parameter_sets = [
     {
         "name": "Baseline",
@@ -61,40 +94,108 @@ def load_CVRP() -> ProblemSet:
 
     for file_path in txt_files:
         try:
-            problem_instance = load_problem_instance(file_path)
+            problem_instance = load_problem_instance(file_path, round_euc_2d=round_distances)
             problem_instances.append(problem_instance)
         except Exception as e:
             print(f"\nError processing file {os.path.basename(file_path)}: {e}")
 
     return problem_instances
 
+def replay_base_dir() -> str:
+    """Where --replay writes its results, apart from the original campaign's."""
+    return os.path.join(output_base_dir, "replays")
+
+def process_log_path(algorithm_tag: str, problem_name: str, param_set_name: str, run_idx: int, base_dir: str) -> str:
+    """The run's stdout/stderr log in data/process_logs; a replay gets its own
+    "-replay" log so the original run's log is kept."""
+    suffix = "-replay" if base_dir == replay_base_dir() else ""
+    return os.path.join("data", "process_logs", f"{algorithm_tag}-{problem_name}-{param_set_name}-run{run_idx+1}{suffix}.log")
+
+def initial_population_path(base_dir: str, problem_name: str, param_set_name: str, run_idx: int) -> str:
+    return f"{base_dir}/initial_populations/{problem_name}/{param_set_name}/run_{run_idx}_pop.json"
+
+def checkpoint_path(base_dir: str, algorithm: str, problem_name: str, param_set_name: str, run_idx: int) -> str:
+    return os.path.join(run_directory(f"{base_dir}/{algorithm_dirs[algorithm]}", problem_name, param_set_name, run_idx), "checkpoint.npz")
+
+def telemetry_path(base_dir: str, algorithm: str, problem_name: str, param_set_name: str, run_idx: int) -> str | None:
+    if not record_telemetry:
+        return None
+    return os.path.join(run_directory(f"{base_dir}/{algorithm_dirs[algorithm]}", problem_name, param_set_name, run_idx), "telemetry.bin")
+
+def profile_path(base_dir: str, algorithm: str, problem_name: str, param_set_name: str, run_idx: int) -> str:
+    return os.path.join(run_directory(f"{base_dir}/{algorithm_dirs[algorithm]}", problem_name, param_set_name, run_idx), "profile.pstats")
+
+def run_info(seed, profiler: PhaseProfiler) -> dict:
+    """Extra summary fields of a run: its seed and, when profiling, the phase timings."""
+    info = {"seed": describe_seed(seed)}
+    if profiler.enabled:
+        info["profile"] = profiler.summary()
+    return info
+
+def prepare_checkpoint(base_dir: str, algorithm: str, problem_name: str, param_set_name: str, run_idx: int, resume: bool) -> str:
+    """Checkpoint path for a run; a stale checkpoint is discarded unless resuming."""
+    path = checkpoint_path(base_dir, algorithm, problem_name, param_set_name, run_idx)
+    if not resume and os.path.exists(path):
+        os.remove(path)
+    return path
+
 def run_and_log_nsga2(run_args):
-    """Helper function to run NSGA-II and log results, designed for parallel execution."""
-    problem, evaluator, param_set, run_idx, base_dir, initial_pop = run_args
-    log_dir = os.path.join("data", "process_logs")
-    log_file_path = os.path.join(log_dir, f"NSGA2-{problem.name}-{param_set['name']}-run{run_idx+1}.log")
+    """Helper function to run NSGA-II and log results, designed for parallel execution.
 
-    with open(log_file_path, 'w') as log_file:
+    Tasks carry only the shared problem key and a seed; the worker attaches the
+    problem from shared memory, builds its own evaluator and creates (and saves)
+    the initial population that SPEA2 later reuses. The run's seed (a
+    SeedSequence) is split into one child for the initial population and one
+    for the algorithm, so the run is a pure function of it.
+    """
+    problem_key, param_set, run_idx, base_dir, seed, resume = run_args
+    problem = shared.get_problem(problem_key)
+    evaluator = FitnessEvaluator(problem, split_mode=split_mode, cache_size=evaluation_cache_size)
+    population_seed, algorithm_seed = spawn_seeds(seed, 2)
+    checkpoint = prepare_checkpoint(base_dir, 'nsga2', problem.name, param_set['name'], run_idx, resume)
+    log_file_path = process_log_path("NSGA2", problem.name, param_set['name'], run_idx, base_dir)
+
+    with open(log_file_path, 'a' if resume else 'w') as log_file:
         with redirect_stdout(log_file), redirect_stderr(log_file):
             # All print statements and errors from the algorithm will go to the log file
-            final_front, runtime, evaluations = run_nsga2(
-                problem,
-                evaluator,
-                param_set["generations"],
-                param_set["crossover_prob"],
-                param_set["mutation_prob"],
-                param_set["population_size"],
-                initial_pop=initial_pop
-            )
+            initial_pop = None
+            if not os.path.exists(checkpoint):
+                # A resumed run continues from its checkpoint and keeps the saved population
+                initial_pop = create_valid_pop(problem, param_set["population_size"], run_generators(population_seed)[0])
+                save_population_chromosomes(initial_pop, initial_population_path(base_dir, problem.name, param_set['name'], run_idx))
+            profiler = PhaseProfiler.from_environment()
+            with profiler.cprofile(profile_path(base_dir, 'nsga2', problem.name, param_set['name'], run_idx)):
+                final_front, runtime, evaluations = run_nsga2(
+                    problem,
+                    evaluator,
+                    param_set["generations"],
+                    param_set["crossover_prob"],
+                    param_set["mutation_prob"],
+                    param_set["population_size"],
+                    initial_pop=initial_pop,
+                    sorter=nsga2_sorter,
+                    seed=algorithm_seed,
+                    checkpoint_path=checkpoint,
+                    checkpoint_interval=checkpoint_interval,
+                    telemetry_path=telemetry_path(base_dir, 'nsga2', problem.name, param_set['name'], run_idx),
+                    profiler=profiler,
+                    local_search=LocalSearch.from_config(problem, param_set.get("local_search"))
+                )
             log_run_results(
-                f"{base_dir}/NSGA-II",
+                store_path(base_dir),
+                algorithm_dirs['nsga2'],
                 problem,
                 param_set,
                 run_idx,
                 runtime,
                 evaluations,
-                final_front
+                final_front,
+                evaluator_stats=evaluator.cache_stats(),
+                run_info=run_info(seed, profiler)
             )
+            # The run is complete; its checkpoint is no longer needed
+            if os.path.exists(checkpoint):
+                os.remove(checkpoint)
             # This print will also go to the log file
             print(f"NSGA-II Run {run_idx + 1}/{runs_per} for {problem.name} ({param_set['name']}) logged successfully.")
     
@@ -102,48 +203,197 @@ def run_and_log_nsga2(run_args):
 
 
 def run_and_log_spea2(run_args):
-    """Helper function to run SPEA2 and log results, designed for parallel execution."""
-    problem, evaluator, param_set, run_idx, base_dir, initial_pop = run_args
-    log_dir = os.path.join("data", "process_logs")
-    log_file_path = os.path.join(log_dir, f"SPEA2-{problem.name}-{param_set['name']}-run{run_idx+1}.log")
+    """Helper function to run SPEA2 and log results, designed for parallel execution.
+
+    Like run_and_log_nsga2, but starts from the initial population NSGA-II saved.
+    """
+    problem_key, param_set, run_idx, base_dir, seed, resume = run_args
+    problem = shared.get_problem(problem_key)
+    evaluator = FitnessEvaluator(problem, split_mode=split_mode, cache_size=evaluation_cache_size)
+    population_seed, algorithm_seed = spawn_seeds(seed, 2)
+    checkpoint = prepare_checkpoint(base_dir, 'spea2', problem.name, param_set['name'], run_idx, resume)
+    initial_pop = load_population_from_file(problem, initial_population_path(base_dir, problem.name, param_set['name'], run_idx))
+    log_file_path = process_log_path("SPEA2", problem.name, param_set['name'], run_idx, base_dir)
 
-    with open(log_file_path, 'w') as log_file:
+    with open(log_file_path, 'a' if resume else 'w') as log_file:
         with redirect_stdout(log_file), redirect_stderr(log_file):
             # All print statements and errors from the algorithm will go to the log file
-            final_front, runtime, evaluations = run_spea2(
-                problem,
-                evaluator,
-                param_set["generations"],
-                param_set["crossover_prob"],
-                param_set["mutation_prob"],
-                param_set["population_size"],
-                param_set["archive_size"],
-                initial_pop=initial_pop
-            )
+            profiler = PhaseProfiler.from_environment()
+            with profiler.cprofile(profile_path(base_dir, 'spea2', problem.name, param_set['name'], run_idx)):
+                final_front, runtime, evaluations = run_spea2(
+                    problem,
+                    evaluator,
+                    param_set["generations"],
+                    param_set["crossover_prob"],
+                    param_set["mutation_prob"],
+                    param_set["population_size"],
+                    param_set["archive_size"],
+                    initial_pop=initial_pop,
+                    seed=algorithm_seed,
+                    checkpoint_path=checkpoint,
+                    checkpoint_interval=checkpoint_interval,
+                    telemetry_path=telemetry_path(base_dir, 'spea2', problem.name, param_set['name'], run_idx),
+                    profiler=profiler,
+                    local_search=LocalSearch.from_config(problem, param_set.get("local_search"))
+                )
             log_run_results(
-                f"{base_dir}/SPEA2",
+                store_path(base_dir),
+                algorithm_dirs['spea2'],
                 problem,
                 param_set,
                 run_idx,
                 runtime,
                 evaluations,
-                final_front
+                final_front,
+                evaluator_stats=evaluator.cache_stats(),
+                run_info=run_info(seed, profiler)
             )
+            # The run is complete; its checkpoint is no longer needed
+            if os.path.exists(checkpoint):
+                os.remove(checkpoint)
             # This print will also go to the log file
             print(f"SPEA2 Run {run_idx + 1}/{runs_per} for {problem.name} ({param_set['name']}) logged successfully.")
 
     return f"Finished: SPEA2 Run {run_idx + 1}/{runs_per} for {problem.name} ({param_set['name']})"
 
+def campaign_entropy(seed: int | None, resume: bool) -> int:
+    """Root entropy of the campaign, recorded in campaign.json.
+
+    An explicit seed wins; otherwise a resumed campaign reuses the recorded
+    entropy and a new one draws fresh entropy from the OS.
+    """
+    path = os.path.join(output_base_dir, "campaign.json")
+    if seed is None and resume and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)["entropy"]
+    entropy = seed if seed is not None else np.random.SeedSequence().entropy
+    os.makedirs(output_base_dir, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"entropy": entropy}, f, indent=2)
+    return entropy
+
+def run_seed(entropy: int, algorithm: str, problem_name: str, param_set_name: str, run_idx: int) -> np.random.SeedSequence:
+    """Independent child seed of one run, fixed by its identity rather than by
+    scheduling order, so adding or skipping runs never changes another's seed."""
+    spawn_key = (
+        list(algorithm_dirs).index(algorithm),
+        zlib.crc32(problem_name.encode()),
+        zlib.crc32(param_set_name.encode()),
+        run_idx,
+    )
+    return np.random.SeedSequence(entropy, spawn_key=spawn_key)
+
+def build_jobs(problem_instances: ProblemSet, algorithms: list[str], entropy: int, resume: bool = False) -> list[Job]:
+    """One Job per (algorithm, problem, parameter set, run).
+
+    A SPEA2 run starts from the initial population its NSGA-II run saves: with
+    both algorithms scheduled it depends on that job, otherwise the file must
+    already exist. With `resume`, runs already in the result store are
+    skipped and the others continue from their checkpoint if they have one.
+    Each run gets its own seed derived from the campaign `entropy`.
+    """
+    jobs = []
+    completed = set()
+    if resume:
+        with ResultStore(store_path(output_base_dir)) as store:
+            completed = store.completed_runs()
+    for problem in problem_instances:
+        for param_set in parameter_sets:
+            for run_idx in range(runs_per):
+                for algorithm in algorithms:
+                    if (algorithm_dirs[algorithm], problem.name, param_set['name'], run_idx) in completed:
+                        continue
+                    depends_on = None
+                    if algorithm == 'spea2':
+                        depends_on = ('nsga2', problem.name, param_set['name'], run_idx)
+                        pop_file_path = initial_population_path(output_base_dir, problem.name, param_set['name'], run_idx)
+                        nsga2_scheduled = any(job.key == depends_on for job in jobs)
+                        if not nsga2_scheduled and not os.path.exists(pop_file_path):
+                            print(f"Error: Initial population for run {run_idx} not found at {pop_file_path}. Please run NSGA-II first. Skipping this run.")
+                            continue
+                    seed = run_seed(entropy, algorithm, problem.name, param_set['name'], run_idx)
+                    run_args = (problem.name, param_set, run_idx, output_base_dir, seed, resume)
+                    jobs.append(Job(algorithm, problem.name, problem.num_customers, param_set, run_idx, run_args, depends_on))
+    return jobs
+
+def replay_run(algorithm: str, problem_name: str, param_set_name: str, run_idx: int, problem_instances: ProblemSet) -> int:
+    """Re-runs one stored run in this process from the seed in its summary.
+
+    Results go to a separate store under {output_base_dir}/replays, and the
+    log to a separate "-replay" process log, so the original run is kept for
+    comparison. A SPEA2 replay starts from the
+    original run's saved initial population, just as the run itself did.
+    """
+    with ResultStore(store_path(output_base_dir)) as results:
+        summary = results.summary(algorithm_dirs[algorithm], problem_name, param_set_name, run_idx)
+    if summary is None:
+        print(f"Error: no stored {algorithm_dirs[algorithm]} run {run_idx} for {problem_name} ({param_set_name}).")
+        return 1
+    seed = np.random.SeedSequence(summary["seed"]["entropy"], spawn_key=tuple(summary["seed"]["spawn_key"]))
+    problem = next(problem for problem in problem_instances if problem.name == problem_name)
+    param_set = next(param_set for param_set in parameter_sets if param_set["name"] == param_set_name)
+
+    replay_dir = replay_base_dir()
+    if algorithm == 'spea2':
+        source = initial_population_path(output_base_dir, problem.name, param_set['name'], run_idx)
+        target = initial_population_path(replay_dir, problem.name, param_set['name'], run_idx)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target)
+
+    workers = {'nsga2': run_and_log_nsga2, 'spea2': run_and_log_spea2}
+    with shared.SharedProblemStore() as store:
+        store.publish(problem)
+        shared.init_worker(store.handles())
+        run_args = (problem.name, param_set, run_idx, replay_dir, seed, False)
+        print(workers[algorithm](run_args))
+    print(f"Replayed run written to {store_path(replay_dir)}")
+    return 0
+
 ## -- Main Function -- ##
 def main():
     parser = argparse.ArgumentParser(description="Run NSGA-II or SPEA2 for VRP.")
     parser.add_argument(
         "-a", "--algorithm",
-        choices=['nsga2', 'spea2'],
+        choices=['nsga2', 'spea2', 'all'],
         required=True,
-        help="The algorithm to execute."
+        help="The algorithm to execute ('all' runs NSGA-II and then SPEA2 from the same initial populations)."
+    )
+    parser.add_argument(
+        "-r", "--resume",
+        action="store_true",
+        help="Skip runs already in the result store and continue interrupted runs from their last checkpoint."
+    )
+    parser.add_argument(
+        "-s", "--seed",
+        type=int,
+        default=campaign_seed,
+        help="Campaign seed; every run derives its own independent seed from it (default: fresh entropy, or the recorded one with --resume)."
+    )
+    parser.add_argument(
+        "--replay",
+        nargs=3,
+        metavar=("PROBLEM", "PARAM_SET", "RUN"),
+        default=None,
+        help="Re-run one stored run of the chosen algorithm with its recorded seed, writing under results/replays/."
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Time each GA phase and store the histograms in each run's summary ('cprofile' also dumps profile.pstats per run). Same as setting CVRP_PROFILE."
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)."
     )
     args = parser.parse_args()
+    if args.profile is not None:
+        # Worker processes inherit the environment and read it in PhaseProfiler.from_environment()
+        os.environ["CVRP_PROFILE"] = args.profile
+    if args.replay is not None and args.algorithm == 'all':
+        parser.error("--replay needs a single algorithm (-a nsga2 or -a spea2)")
 
     problem_instances: ProblemSet = load_CVRP()
     if not problem_instances:
@@ -153,64 +403,37 @@ def main():
     # Create the directory for process-specific logs
     os.makedirs(os.path.join("data", "process_logs"), exist_ok=True)
 
-    fitness_evaluators = [FitnessEvaluator(p) for p in problem_instances]
-
-    with ProcessPoolExecutor() as executor:
-        for i, (problem, evaluator) in enumerate(zip(problem_instances, fitness_evaluators)):
-            for param_set in parameter_sets:
-                print(f"\n--- Starting simulations for {problem.name} with '{param_set['name']}' parameters for {args.algorithm} ---")
-                
-                if args.algorithm == 'nsga2':
-                    # For NSGA-II, create, save, and then run.
-                    initial_pops = []
-                    for run_idx in range(runs_per):
-                        pop_file_path = f"{output_base_dir}/initial_populations/{problem.name}/run_{run_idx}_pop.json"
-                        initial_pop = create_valid_pop(problem, param_set["population_size"])
-                        save_population_chromosomes(initial_pop, pop_file_path)
-                        initial_pops.append(initial_pop)
-
-                    nsga2_args = zip(
-                        repeat(problem),
-                        repeat(evaluator),
-                        repeat(param_set),
-                        range(runs_per),
-                        repeat(output_base_dir),
-                        initial_pops
-                    )
-                    # Run NSGA-II simulations in parallel and print status as they complete
-                    for result in executor.map(run_and_log_nsga2, nsga2_args):
-                        print(result)
-
-                elif args.algorithm == 'spea2':
-                    # For SPEA2, load populations and then run.
-                    initial_pops = []
-                    run_indices = []
-                    for run_idx in range(runs_per):
-                        pop_file_path = f"{output_base_dir}/initial_populations/{problem.name}/run_{run_idx}_pop.json"
-                        if not os.path.exists(pop_file_path):
-                            print(f"Error: Initial population for run {run_idx} not found at {pop_file_path}. Please run NSGA-II first. Skipping this run.")
-                            continue
-                        
-                        initial_pop = load_population_from_file(problem, pop_file_path)
-                        initial_pops.append(initial_pop)
-                        run_indices.append(run_idx)
+    # Compile the numba kernels once up front so workers load them from the on-disk cache
+    kernels.warm_up()
 
-                    if not initial_pops:
-                        print(f"No valid initial populations found for {problem.name} with '{param_set['name']}'. Skipping SPEA2 runs for this configuration.")
-                        continue
+    if args.replay is not None:
+        problem_name, param_set_name, run_idx = args.replay
+        return replay_run(args.algorithm, problem_name, param_set_name, int(run_idx), problem_instances)
+
+    algorithms = ['nsga2', 'spea2'] if args.algorithm == 'all' else [args.algorithm]
+    entropy = campaign_entropy(args.seed, args.resume)
+    print(f"Campaign seed: {entropy}")
+    jobs = build_jobs(problem_instances, algorithms, entropy, resume=args.resume)
+    if not jobs:
+        print("No runs to execute. Exiting.")
+        return
+    print(f"\n--- Scheduling {len(jobs)} runs ({', '.join(algorithms)}) over {len(problem_instances)} problems ---")
 
-                    spea2_args = zip(
-                        repeat(problem),
-                        repeat(evaluator),
-                        repeat(param_set),
-                        run_indices,
-                        repeat(output_base_dir),
-                        initial_pops
-                    )
-                    # Run SPEA2 simulations in parallel and print status as they complete
-                    for result in executor.map(run_and_log_spea2, spea2_args):
-                        print(result)
+    # Publish each instance's arrays once; workers attach to them zero-copy
+    with shared.SharedProblemStore() as store:
+        for problem in problem_instances:
+            store.publish(problem)
+        failures = run_jobs(
+            jobs,
+            {'nsga2': run_and_log_nsga2, 'spea2': run_and_log_spea2},
+            max_workers=args.workers,
+            initializer=shared.init_worker,
+            initargs=(store.handles(),)
+        )
 
+    if failures:
+        print(f"\n{len(failures)} of {len(jobs)} runs did not complete.")
+        return 1
     return 0
 
 if __name__ == "__main__":
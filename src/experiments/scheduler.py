@@ -0,0 +1,121 @@
+"""Campaign scheduler: every run of every experiment on one process pool.
+
+All jobs are submitted up front, longest expected first, so the pool never
+drains between problems or parameter sets and the large instances do not
+straggle at the end. Completions are reported as they arrive with a
+progress/ETA line based on the work actually finished so far.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple
+
+
+class Job:
+    """One (algorithm, problem, parameter set, run) execution.
+
+    - args: the picklable task tuple passed to the algorithm's worker function
+    - cost: expected work, customers x evaluations (generations x population size)
+    - depends_on: key of a job that must finish before this one can start
+    """
+
+    def __init__(self, algorithm: str, problem_name: str, num_customers: int, param_set: dict,
+                 run_idx: int, args: tuple, depends_on: Tuple | None = None):
+        self.algorithm = algorithm
+        self.problem_name = problem_name
+        self.param_set = param_set
+        self.run_idx = run_idx
+        self.args = args
+        self.depends_on = depends_on
+        self.cost = num_customers * param_set["generations"] * param_set["population_size"]
+
+    @property
+    def key(self) -> Tuple[str, str, str, int]:
+        return (self.algorithm, self.problem_name, self.param_set["name"], self.run_idx)
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def progress_line(done: int, total: int, done_cost: float, total_cost: float, elapsed: float) -> str:
+    """'[done/total] pct | elapsed | ETA', with the ETA from the cost-weighted completion rate."""
+    fraction = done_cost / total_cost if total_cost else 1.0
+    if done_cost > 0:
+        eta = _format_duration(elapsed * (total_cost - done_cost) / done_cost)
+    else:
+        eta = "?"
+    width = len(str(total))
+    return f"[{done:>{width}}/{total}] {100 * fraction:5.1f}% | elapsed {_format_duration(elapsed)} | ETA {eta}"
+
+
+def run_jobs(
+    jobs: List[Job],
+    workers: Dict[str, Callable[[tuple], str]],
+    max_workers: int | None = None,
+    initializer: Callable | None = None,
+    initargs: tuple = ()
+) -> List[Tuple[Job, BaseException]]:
+    """Runs every job on a single ProcessPoolExecutor and streams the results.
+
+    - workers maps an algorithm name to its (module-level) worker function.
+    - Jobs whose dependency is in `jobs` are submitted when it completes; all
+      others are submitted immediately. Each batch is submitted longest first.
+    - A failing job is reported and does not stop the campaign; the failures
+      are returned as (job, exception) pairs.
+    """
+    scheduled = {job.key for job in jobs}
+    waiting: Dict[Tuple, List[Job]] = {}
+    ready: List[Job] = []
+    for job in jobs:
+        if job.depends_on is not None and job.depends_on in scheduled:
+            waiting.setdefault(job.depends_on, []).append(job)
+        else:
+            ready.append(job)
+
+    total = len(jobs)
+    total_cost = sum(job.cost for job in jobs)
+    done = 0
+    done_cost = 0
+    failures: List[Tuple[Job, BaseException]] = []
+    start = time.time()
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs) as executor:
+        running: Dict[Future, Job] = {}
+
+        def submit(batch: List[Job]) -> None:
+            for job in sorted(batch, key=lambda j: j.cost, reverse=True):
+                running[executor.submit(workers[job.algorithm], job.args)] = job
+
+        submit(ready)
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = running.pop(future)
+                done += 1
+                done_cost += job.cost
+                error = future.exception()
+                if error is None:
+                    message = future.result()
+                else:
+                    failures.append((job, error))
+                    message = f"FAILED: {job.algorithm} run {job.run_idx + 1} for {job.problem_name} ({job.param_set['name']}): {error!r}"
+                print(f"{progress_line(done, total, done_cost, total_cost, time.time() - start)} | {message}")
+                sys.stdout.flush()
+
+                dependents = waiting.pop(job.key, [])
+                if error is None:
+                    submit(dependents)
+                else:
+                    # Dependents cannot run without this job's output
+                    for dependent in dependents:
+                        done += 1
+                        done_cost += dependent.cost
+                        failures.append((dependent, error))
+                        print(f"{progress_line(done, total, done_cost, total_cost, time.time() - start)} | "
+                              f"SKIPPED: {dependent.algorithm} run {dependent.run_idx + 1} for {dependent.problem_name} "
+                              f"({dependent.param_set['name']}), its {job.algorithm} run failed")
+    return failures
@@ -1,10 +1,17 @@
 from src.vrp.problem import ProblemInstance
 from src.ga.fitness import FitnessEvaluator
-from src.ga.individual import Individual
-from src.ga.operators import pmx_crossover, swap_mutation
-from src.ga.pareto_selection import fast_non_dominated_sort, calculate_crowding_distance
-from src.ga.selection import tournament_selection, spea2_tournament_selection
-from src.ga.spea2_fitness import calculate_spea2_fitness
+from src.ga.individual import Individual, random_chromosome
+from src.ga.population import Population
+from src.ga.operators import create_offspring
+from src.ga.pareto_selection import crowding_distances, non_dominated_fronts, NON_DOMINATED_SORTERS
+from src.ga.selection import tournament_selection_indices, spea2_tournament_selection_indices
+from src.ga.spea2_fitness import spea2_fitness_values, truncation_survivors
+from src.ga.checkpoint import save_checkpoint, load_checkpoint
+from src.ga.seeding import Seed, run_generators
+from src.ga.telemetry import RunTelemetry, count_distinct_rows
+from src.ga.profiling import PhaseProfiler
+from src.ga.local_search import LocalSearch
+from src.ga import kernels
 
 import time
 import sys
@@ -12,68 +19,73 @@ import random
 import json
 import os
 
+import numpy as np
 
-def save_population_chromosomes(population: list[Individual], file_path: str):
-    """Saves the chromosomes of a list of Individuals to a JSON file."""
+
+def save_population_chromosomes(population: Population | list[Individual], file_path: str):
+    """Saves the chromosomes of a Population (or list of Individuals) to a JSON file."""
     # Ensure the directory exists
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
-    chromosome_list = [ind.chromosome for ind in population]
+    if isinstance(population, Population):
+        chromosome_list = population.chromosomes.tolist()
+    else:
+        chromosome_list = [ind.chromosome for ind in population]
     with open(file_path, 'w') as f:
         json.dump(chromosome_list, f)
 
-def load_population_from_file(problem: ProblemInstance, file_path: str) -> list[Individual]:
+def load_population_from_file(problem: ProblemInstance, file_path: str) -> Population:
     """Loads a list of chromosomes from a JSON file and creates a population."""
     with open(file_path, 'r') as f:
         chromosome_list = json.load(f)
     
-    return [Individual(problem, chromosome=chromo) for chromo in chromosome_list]
+    return Population(problem, chromosome_list)
 
 
-def create_valid_pop(problem: ProblemInstance, population_size: int) -> list[Individual]:
+def create_valid_pop(problem: ProblemInstance, population_size: int, rng: random.Random = random) -> Population:
     """
     Creates a hybrid initial population.
     - 50% of individuals are created with purely random chromosomes.
     - 50% are created by finding random chromosomes that are "packable"
+    Chromosomes are drawn from rng (the global `random` module by default).
     """
     random_count = population_size // 2
     fixed_count = population_size - random_count
 
     # 1. Create purely random individuals
-    pop = [Individual(problem) for _ in range(random_count)]
+    pop = [random_chromosome(problem, rng) for _ in range(random_count)]
 
     # 2. Create individuals by finding random chromosomes that are packable
-    packable_pop: list[Individual] = []
+    packable_pop: list[list[int]] = []
     # Add a safety break to prevent potential infinite loops
     max_attempts = fixed_count * 200
     attempts = 0
     while len(packable_pop) < fixed_count and attempts < max_attempts:
-        tmp_ind = Individual(problem)
-        if _is_packable(tmp_ind, problem):
-            packable_pop.append(tmp_ind)
+        chromosome = random_chromosome(problem, rng)
+        if _is_packable(chromosome, problem):
+            packable_pop.append(chromosome)
         attempts += 1
 
     # If not enough packable individuals were found, fill with random ones
     if len(packable_pop) < fixed_count:
         print(f"Warning: Could only find {len(packable_pop)}/{fixed_count} packable individuals. Filling rest randomly.")
         needed = fixed_count - len(packable_pop)
-        packable_pop.extend([Individual(problem) for _ in range(needed)])
+        packable_pop.extend([random_chromosome(problem, rng) for _ in range(needed)])
     else:
         print(f"Found {len(packable_pop)} packable individuals.. lets go")
     
 
     pop.extend(packable_pop)
-    return pop
+    return Population(problem, pop)
 
 
-def _is_packable(ind: Individual, problem: ProblemInstance) -> bool:
+def _is_packable(chromosome: list[int], problem: ProblemInstance) -> bool:
     """
     Checks if a chromosome is "packable" by assigning customers to vehicles
     in the order they appear, starting a new vehicle only when the current
     one is full. Returns True if the number of vehicles used does not exceed
     the available number of vehicles.
     """
-    chromosome = ind.chromosome
     demands = problem.customer_demands
     capacity = problem.vehicle_capacity
     num_vehicles = problem.num_vehicles
@@ -101,6 +113,23 @@ def _is_packable(ind: Individual, problem: ProblemInstance) -> bool:
     return True
 
 
+def _run_generators(seed: Seed | None) -> tuple[random.Random, np.random.Generator]:
+    """(scalar, batched) generators for a run; unseeded runs use the global `random` stream."""
+    if seed is not None:
+        return run_generators(seed)
+    return random, np.random.default_rng(random.getrandbits(64))
+
+
+def _checkpoint_due(checkpoint_path: str | None, checkpoint_interval: int, generation: int, generations: int) -> bool:
+    """True when a checkpoint should be written after `generation` (never after the last one)."""
+    return (
+        checkpoint_path is not None
+        and checkpoint_interval > 0
+        and (generation + 1) % checkpoint_interval == 0
+        and generation < generations - 1
+    )
+
+
 def run_nsga2(
     problem: ProblemInstance,
     evaluator: FitnessEvaluator,
@@ -108,15 +137,62 @@ def run_nsga2(
     pc: float,
     pm: float,
     population_size: int,
-    initial_pop: list[Individual] | None = None
-) -> tuple[list[Individual], float, int]:
+    initial_pop: Population | list[Individual] | None = None,
+    sorter: str = "fast",
+    seed: Seed | None = None,
+    checkpoint_path: str | None = None,
+    checkpoint_interval: int = 0,
+    telemetry_path: str | None = None,
+    profiler: PhaseProfiler | None = None,
+    local_search: LocalSearch | None = None
+) -> tuple[Population, float, int]:
+    """
+    NSGA-II main loop. `sorter` picks the non-dominated sorting routine from
+    NON_DOMINATED_SORTERS ("fast" or the O(N log N) "bi_objective"); both give
+    the same fronts and ranks.
+
+    The population is kept as a Population throughout; the returned final front
+    is one too (iterating it yields Individual views).
+
+    `seed` (an int or numpy SeedSequence) makes the run self-contained: every
+    random draw (initial population, selection, crossover, mutation) comes from
+    generators derived from it (see src/ga/seeding.py), so the same seed replays
+    the run bit-for-bit. Without it the run draws from the global `random`
+    module, so random.seed() still makes it reproducible.
+
+    With `checkpoint_path` and `checkpoint_interval` set, the state is saved
+    every `checkpoint_interval` generations (see src/ga/checkpoint.py). If the
+    file already exists the run resumes from it instead of starting over.
+
+    With `telemetry_path` set, one record per generation (best/mean objectives,
+    first-front size and hypervolume, distinct chromosomes, evaluations and the
+    wall time of each phase) is written there (see src/ga/telemetry.py).
+
+    `profiler` times each phase in finer detail (sorting, crowding, selection,
+    crossover, mutation, evaluation, ...; see src/ga/profiling.py). It defaults
+    to PhaseProfiler.from_environment(), which is off unless CVRP_PROFILE is set.
+
+    With `local_search` set, offspring are educated by it after evaluation
+    (memetic mode, see src/ga/local_search.py); its re-evaluations count
+    towards the returned evaluations.
+    """
+    if sorter not in NON_DOMINATED_SORTERS:
+        raise ValueError(f"Unknown sorter '{sorter}', expected one of {list(NON_DOMINATED_SORTERS)}.")
+    resuming = checkpoint_path is not None and os.path.exists(checkpoint_path)
+    py_random, rng = _run_generators(seed)
+
     ## create population
-    if initial_pop:
-        pop = initial_pop
+    if resuming:
+        pop = None  # restored from the checkpoint below
+    elif initial_pop:
+        pop = initial_pop if isinstance(initial_pop, Population) else Population.from_individuals(problem, initial_pop)
     else:
         # Fallback for old behavior if needed
-        pop = create_valid_pop(problem, population_size)
+        pop = create_valid_pop(problem, population_size, py_random)
     
+    # Compile the optional numba kernels before anything is timed
+    kernels.warm_up()
+
     sys.stdout.flush()
     print(f"""
         --------------------------------
@@ -128,94 +204,132 @@ def run_nsga2(
         Mutation probability: {pm}
     """)
 
-    ## evaluate and store results in individuals
-    for indiv in pop:
-        evaluator.evaluate(indiv)
-
-    # -- Initial Population Logging --
-    total_distances = [ind.objectives[0] for ind in pop]
-    longest_routes = [ind.objectives[1] for ind in pop]
-    unique_chromosomes = set(tuple(ind.chromosome) for ind in pop)
-
-    avg_total_dist = sum(total_distances) / len(total_distances)
-    best_total_dist = min(total_distances)
-    avg_longest_route = sum(longest_routes) / len(longest_routes)
-    best_longest_route = min(longest_routes)
-
-    print(f"""
-            Unique Solutions: {len(unique_chromosomes)}/{population_size}
-            Total Distance (Avg): {avg_total_dist:.2f}
-            Total Distance (Best): {best_total_dist:.2f}
-            Longest Route (Avg): {avg_longest_route:.2f}
-            Longest Route (Best): {best_longest_route:.2f}
-            -------------------------------------
-        """)
-
-    start_time = time.time()
-    evaluations = len(pop)  # initial evaluations
+    if resuming:
+        checkpoint = load_checkpoint(checkpoint_path, problem, rng, py_random)
+        pop = checkpoint["populations"]["population"]
+        evaluator.restore_stats(checkpoint["evaluator_stats"])
+        evaluations = checkpoint["evaluations"]
+        first_generation = checkpoint["generation"] + 1
+        start_time = time.time() - checkpoint["runtime"]
+        print(f"Resuming from checkpoint {checkpoint_path} at generation {first_generation + 1}/{generations}")
+    else:
+        ## evaluate and store results in the population arrays
+        evaluator.reset_stats()
+        evaluator.evaluate_batch(pop)
+
+        # -- Initial Population Logging --
+        total_distances = pop.objectives[:, 0].tolist()
+        longest_routes = pop.objectives[:, 1].tolist()
+        unique_chromosomes = count_distinct_rows(pop.chromosomes)
+
+        avg_total_dist = sum(total_distances) / len(total_distances)
+        best_total_dist = min(total_distances)
+        avg_longest_route = sum(longest_routes) / len(longest_routes)
+        best_longest_route = min(longest_routes)
+
+        print(f"""
+                Unique Solutions: {unique_chromosomes}/{population_size}
+                Total Distance (Avg): {avg_total_dist:.2f}
+                Total Distance (Best): {best_total_dist:.2f}
+                Longest Route (Avg): {avg_longest_route:.2f}
+                Longest Route (Best): {best_longest_route:.2f}
+                -------------------------------------
+            """)
+
+        start_time = time.time()
+        evaluations = len(pop)  # initial evaluations
+        first_generation = 0
+
+    telemetry = RunTelemetry(telemetry_path, problem.name, first_generation) if telemetry_path else None
+    if profiler is None:
+        profiler = PhaseProfiler.from_environment()
 
     # Generational loop
     print(f"NSGA-II start: gens={generations}, pop={population_size}")
     sys.stdout.flush()
-    for g in range(generations):
+    for g in range(first_generation, generations):
+        phase_start = time.perf_counter()
         # Rank current population and compute crowding distances per front
-        fronts = fast_non_dominated_sort(pop)
-        for front in fronts:
-            calculate_crowding_distance(front)
+        with profiler.phase("non_dominated_sort"):
+            fronts = non_dominated_fronts(pop, sorter)
+        with profiler.phase("crowding_distance"):
+            for front in fronts:
+                pop.crowding_distance[front] = crowding_distances(pop.objectives[front])[0]
 
         # Build mating pool via tournament selection
-        mating_pool: list[Individual] = [tournament_selection(pop) for _ in range(population_size)]
-        random.shuffle(mating_pool)
+        with profiler.phase("tournament_selection"):
+            mating_rows = tournament_selection_indices(pop.pareto_rank, pop.crowding_distance, population_size, py_random)
+            py_random.shuffle(mating_rows)
+        selection_end = time.perf_counter()
 
         # Variation: create offspring of size N
-        offspring: list[Individual] = []
-        for i in range(0, population_size, 2):
-            p1 = mating_pool[i % population_size]
-            p2 = mating_pool[(i + 1) % population_size]
-            c1, c2 = pmx_crossover(p1, p2, pc)
-            swap_mutation(c1, pm)
-            swap_mutation(c2, pm)
-            offspring.append(c1)
-            if len(offspring) < population_size:
-                offspring.append(c2)
+        offspring = create_offspring(pop.take(mating_rows), pc, pm, population_size, rng, profiler)
+        variation_end = time.perf_counter()
 
         # Evaluate offspring
-        for child in offspring:
-            evaluator.evaluate(child)
+        with profiler.phase("evaluation"):
+            evaluator.evaluate_batch(offspring)
         evaluations += len(offspring)
+        if local_search is not None:
+            with profiler.phase("local_search"):
+                evaluations += local_search.educate(offspring, evaluator, rng)
+        evaluation_end = time.perf_counter()
 
         # Environmental selection: combine and select next generation
-        combined = pop + offspring
-        combined_fronts = fast_non_dominated_sort(combined)
-
-        next_pop: list[Individual] = []
-        for front in combined_fronts:
-            if len(next_pop) + len(front) <= population_size:
-                next_pop.extend(front)
-            else:
-                # Need to take only a subset from this front
-                calculate_crowding_distance(front)
-                # Sort descending by crowding distance
-                front.sort(key=lambda ind: ind.crowding_distance, reverse=True)
-                slots = population_size - len(next_pop)
-                next_pop.extend(front[:slots])
-                break
-
-        pop = next_pop
+        with profiler.phase("survival_sort"):
+            combined = Population.concat(pop, offspring)
+            combined_fronts = non_dominated_fronts(combined, sorter)
+
+        with profiler.phase("survival_truncation"):
+            next_rows: list[np.ndarray] = []
+            selected = 0
+            for front in combined_fronts:
+                if selected + len(front) <= population_size:
+                    next_rows.append(front)
+                    selected += len(front)
+                else:
+                    # Need to take only a subset from this front
+                    distances, order = crowding_distances(combined.objectives[front])
+                    combined.crowding_distance[front] = distances
+                    # Sort descending by crowding distance (stable, like list.sort(reverse=True))
+                    ranked = order[np.argsort(-distances[order], kind="stable")]
+                    next_rows.append(front[ranked[:population_size - selected]])
+                    break
+
+            pop = combined.take(np.concatenate(next_rows))
+
+        if telemetry is not None:
+            survival_end = time.perf_counter()
+            # Selected rows come front by front, so the first block is the new population's first front
+            telemetry.record(g, evaluations, time.time() - start_time, pop.objectives,
+                             combined.objectives[next_rows[0]], pop.chromosomes, {
+                                 "selection": selection_end - phase_start,
+                                 "variation": variation_end - selection_end,
+                                 "evaluation": evaluation_end - variation_end,
+                                 "survival": survival_end - evaluation_end,
+                             })
 
         # Progress output every ~5% of gens or at the end
         step = max(1, generations // 20)
         if (g + 1) % step == 0 or g == generations - 1:
-            best_td, best_lr = min(ind.objectives for ind in pop)
+            best_td, best_lr = min(pop.objectives.tolist())
             num_rank1 = len(fronts[0]) if fronts else 0
             print(f"Gen {g+1}/{generations} | best_total={best_td:.2f} | best_longest_route={best_lr:.2f} | rank1={num_rank1}")
             sys.stdout.flush()
 
+        if _checkpoint_due(checkpoint_path, checkpoint_interval, g, generations):
+            if telemetry is not None:
+                telemetry.flush()  # a resume continues from here, so these records are final
+            save_checkpoint(checkpoint_path, g, evaluations, time.time() - start_time,
+                            {"population": pop}, rng, py_random, evaluator.cache_stats())
+
+    if telemetry is not None:
+        telemetry.close()
     end_time = time.time()
     runtime = end_time - start_time
     # Final front from the final population
-    final_fronts = fast_non_dominated_sort(pop)
-    final_front = final_fronts[0] if final_fronts else []
+    final_fronts = non_dominated_fronts(pop, sorter)
+    final_front = pop.take(final_fronts[0] if final_fronts else [])
 
     return final_front, runtime, evaluations
 
@@ -227,19 +341,37 @@ def run_spea2(
     pm: float,
     population_size: int,
     archive_size: int,
-    initial_pop: list[Individual] | None = None
-) -> tuple[list[Individual], float, int]:
+    initial_pop: Population | list[Individual] | None = None,
+    seed: Seed | None = None,
+    checkpoint_path: str | None = None,
+    checkpoint_interval: int = 0,
+    telemetry_path: str | None = None,
+    profiler: PhaseProfiler | None = None,
+    local_search: LocalSearch | None = None
+) -> tuple[Population, float, int]:
     """
     Implementation of the Strength Pareto Evolutionary Algorithm 2 (SPEA2).
+
+    Population and archive are both kept as Populations; the final archive is returned.
+    `seed`, checkpointing, resuming, telemetry, `profiler` and `local_search`
+    work as in run_nsga2 (the archive is saved along with the population, and telemetry
+    describes the archive).
     """
+    resuming = checkpoint_path is not None and os.path.exists(checkpoint_path)
+    py_random, rng = _run_generators(seed)
     # --- MODIFICATION ---
-    if initial_pop:
-        pop = initial_pop
+    if resuming:
+        pop = None  # restored from the checkpoint below
+    elif initial_pop:
+        pop = initial_pop if isinstance(initial_pop, Population) else Population.from_individuals(problem, initial_pop)
     else:
         # Fallback for old behavior if needed
-        pop = create_valid_pop(problem, population_size)
+        pop = create_valid_pop(problem, population_size, py_random)
     # --- END MODIFICATION ---
-    archive = []
+    archive = Population(problem, [])
+
+    # Compile the optional numba kernels before anything is timed
+    kernels.warm_up()
     
     print(f"""
         --------------------------------
@@ -254,86 +386,124 @@ def run_spea2(
     """)
     sys.stdout.flush()
 
-    # Evaluate initial population
-    for ind in pop:
-        evaluator.evaluate(ind)
-    
-    evaluations = len(pop)
-    start_time = time.time()
+    if resuming:
+        checkpoint = load_checkpoint(checkpoint_path, problem, rng, py_random)
+        pop = checkpoint["populations"]["population"]
+        archive = checkpoint["populations"]["archive"]
+        evaluator.restore_stats(checkpoint["evaluator_stats"])
+        evaluations = checkpoint["evaluations"]
+        first_generation = checkpoint["generation"] + 1
+        start_time = time.time() - checkpoint["runtime"]
+        print(f"Resuming from checkpoint {checkpoint_path} at generation {first_generation + 1}/{generations}")
+    else:
+        # Evaluate initial population
+        evaluator.reset_stats()
+        evaluator.evaluate_batch(pop)
+
+        evaluations = len(pop)
+        start_time = time.time()
+        first_generation = 0
+
+    telemetry = RunTelemetry(telemetry_path, problem.name, first_generation) if telemetry_path else None
+
+    def record_telemetry(g, phase_times):
+        # The archive's first front is its members with raw fitness 0 (SPEA2 fitness < 1)
+        telemetry.record(g, evaluations, time.time() - start_time, archive.objectives,
+                         archive.objectives[archive.spea2_fitness < 1], archive.chromosomes, phase_times)
+
+    if profiler is None:
+        profiler = PhaseProfiler.from_environment()
 
     # Step 2: Main Generational Loop
-    for g in range(generations):
+    for g in range(first_generation, generations):
+        phase_start = time.perf_counter()
         # A. Fitness Assignment
-        calculate_spea2_fitness(pop, archive)
+        with profiler.phase("spea2_fitness"):
+            combined_pop = Population.concat(pop, archive)
+            fitness, kth_distances = spea2_fitness_values(combined_pop.objectives)
+            combined_pop.spea2_fitness[:] = fitness
+            combined_pop.kth_distance[:] = kth_distances
         
         # B. Environmental Selection
-        combined_pop = pop + archive
-        
-        
-        next_archive = [ind for ind in combined_pop if ind.spea2_fitness < 1]
+        next_archive = np.flatnonzero(fitness < 1)
 
         # Manage Archive Size
         if len(next_archive) > archive_size:
-            # --- FIXED ARCHIVE TRUNCATION ---
-            # The density (kth_distance) is already calculated for the combined population by the
-            # calculate_spea2_fitness call above. We just need to sort and slice.
-            next_archive.sort(key=lambda ind: ind.kth_distance)
-            archive = next_archive[:archive_size]
+            # Archive Overflow: SPEA2 truncation, iteratively dropping the most crowded individual
+            with profiler.phase("archive_truncation"):
+                survivors = truncation_survivors(combined_pop.objectives[next_archive], archive_size)
+                archive = combined_pop.take(next_archive[survivors])
 
         elif len(next_archive) < archive_size:
             # Archive Underflow: Fill with the best dominated individuals
-            dominated_individuals = [ind for ind in combined_pop if ind.spea2_fitness >= 1]
-            dominated_individuals.sort(key=lambda ind: ind.spea2_fitness)
-            fill_count = archive_size - len(next_archive)
-            next_archive.extend(dominated_individuals[:fill_count])
-            archive = next_archive
+            with profiler.phase("archive_fill"):
+                dominated_rows = np.flatnonzero(fitness >= 1)
+                dominated_rows = dominated_rows[np.argsort(fitness[dominated_rows], kind="stable")]
+                fill_count = archive_size - len(next_archive)
+                archive = combined_pop.take(np.concatenate([next_archive, dominated_rows[:fill_count]]))
         else:
             # Archive is exactly the right size
-            archive = next_archive
+            archive = combined_pop.take(next_archive)
+
+        survival_end = time.perf_counter()
 
         # C. Termination Check
         if g == generations - 1:
+            if telemetry is not None:
+                record_telemetry(g, {"survival": survival_end - phase_start})
             break
 
         # D. Mating Pool & Offspring Creation
         # -- FIX -- Check if archive is empty, if so populate with best from pop
-        if not archive:
+        if len(archive) == 0:
             print(f"Archive empty at gen {g+1}, repopulating from current population.")
             # Sort population by SPEA2 fitness (lower is better) and pick the best
-            pop.sort(key=lambda ind: ind.spea2_fitness)
-            archive.extend(pop[:archive_size])
+            best_rows = np.argsort(fitness[:len(pop)], kind="stable")
+            archive = combined_pop.take(best_rows[:archive_size])
 
-        mating_pool = [spea2_tournament_selection(archive) for _ in range(population_size)]
-        
-        offspring = []
-        for i in range(0, population_size, 2):
-            p1 = mating_pool[i % population_size]
-            p2 = mating_pool[(i + 1) % population_size]
-            c1, c2 = pmx_crossover(p1, p2, pc)
-            swap_mutation(c1, pm)
-            swap_mutation(c2, pm)
-            offspring.append(c1)
-            if len(offspring) < population_size:
-                offspring.append(c2)
+        with profiler.phase("tournament_selection"):
+            mating_rows = spea2_tournament_selection_indices(archive.spea2_fitness, population_size, py_random)
+        selection_end = time.perf_counter()
+        offspring = create_offspring(archive.take(mating_rows), pc, pm, population_size, rng, profiler)
+        variation_end = time.perf_counter()
 
         # Evaluate offspring
-        for child in offspring:
-            evaluator.evaluate(child)
+        with profiler.phase("evaluation"):
+            evaluator.evaluate_batch(offspring)
         evaluations += len(offspring)
+        if local_search is not None:
+            with profiler.phase("local_search"):
+                evaluations += local_search.educate(offspring, evaluator, rng)
 
         # E. Advance Generation
         pop = offspring
 
+        if telemetry is not None:
+            record_telemetry(g, {
+                "survival": survival_end - phase_start,
+                "selection": selection_end - survival_end,
+                "variation": variation_end - selection_end,
+                "evaluation": time.perf_counter() - variation_end,
+            })
+
         # Progress output
         step = max(1, generations // 20)
         if (g + 1) % step == 0 or g == generations - 1:
-            best_td = min(ind.objectives[0] for ind in archive) if archive else float('inf')
-            best_lr = min(ind.objectives[1] for ind in archive) if archive else float('inf')
+            best_td = archive.objectives[:, 0].min() if len(archive) else float('inf')
+            best_lr = archive.objectives[:, 1].min() if len(archive) else float('inf')
             print(f"Gen {g+1}/{generations} | Archive Size: {len(archive)} | Best Total Dist: {best_td:.2f} | Best Longest Route: {best_lr:.2f}")
             sys.stdout.flush()
 
+        if _checkpoint_due(checkpoint_path, checkpoint_interval, g, generations):
+            if telemetry is not None:
+                telemetry.flush()  # a resume continues from here, so these records are final
+            save_checkpoint(checkpoint_path, g, evaluations, time.time() - start_time,
+                            {"population": pop, "archive": archive}, rng, py_random, evaluator.cache_stats())
+
+    if telemetry is not None:
+        telemetry.close()
     end_time = time.time()
     runtime = end_time - start_time
     
     # Step 3: Return Value
-    return archive, runtime, evaluations
\ No newline at end of file
+    return archive, runtime, evaluations
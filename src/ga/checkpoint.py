@@ -0,0 +1,95 @@
+"""Binary checkpoints of a running GA, so an interrupted run can be resumed.
+
+A checkpoint is a single .npz file written at the end of a generation. It
+contains, for each named Population (e.g. "population", "archive"), the int32
+chromosomes, the objectives and the routes. Routes are stored as route lengths,
+because every route is a contiguous slice of the chromosome. It also holds the
+state of the run's scalar (random.Random) and batched (NumPy) generators, the
+generation counter, and the evaluation, runtime and evaluator counters.
+
+Resuming from a checkpoint continues the exact random streams, so the resumed
+run ends with the same result as an uninterrupted one. Split labels and the
+evaluation cache are not saved; they only affect speed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+
+import numpy as np
+
+from src.ga.population import Population, flatten_routes, unflatten_routes
+
+
+def save_checkpoint(
+    path: str,
+    generation: int,
+    evaluations: int,
+    runtime: float,
+    populations: dict[str, Population],
+    rng: np.random.Generator,
+    py_random: random.Random = random,
+    evaluator_stats: dict | None = None
+) -> None:
+    """Writes the state after `generation` (0-based, completed) to `path` atomically.
+
+    rng and py_random are the run's batched and scalar generators.
+    """
+    version, internal_state, gauss_next = py_random.getstate()
+    meta = {
+        "generation": generation,
+        "evaluations": evaluations,
+        "runtime": runtime,
+        "populations": list(populations),
+        "random_version": version,
+        "random_gauss_next": gauss_next,
+        "rng_state": rng.bit_generator.state,
+        "evaluator_stats": evaluator_stats or {},
+    }
+    arrays = {
+        "meta": np.array(json.dumps(meta)),
+        "random_state": np.array(internal_state, dtype=np.uint32),
+    }
+    for name, pop in populations.items():
+        arrays[f"{name}_chromosomes"] = pop.chromosomes
+        arrays[f"{name}_objectives"] = pop.objectives
+        arrays[f"{name}_route_counts"], arrays[f"{name}_route_lengths"] = flatten_routes(pop.routes)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    # Never leave a half-written checkpoint behind if we are killed mid-write
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, problem_instance, rng: np.random.Generator, py_random: random.Random = random) -> dict:
+    """Reads a checkpoint written by save_checkpoint and restores the random streams.
+
+    Sets the state of `rng` and `py_random` in place. Returns a dict
+    with generation, evaluations, runtime, evaluator_stats and populations
+    (name -> Population with chromosomes, objectives and routes).
+    """
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        internal_state = tuple(int(x) for x in data["random_state"])
+        populations = {}
+        for name in meta["populations"]:
+            pop = Population(problem_instance, data[f"{name}_chromosomes"])
+            pop.objectives[:] = data[f"{name}_objectives"]
+            pop.routes = unflatten_routes(
+                pop.chromosomes, data[f"{name}_route_counts"], data[f"{name}_route_lengths"]
+            )
+            populations[name] = pop
+
+    py_random.setstate((meta["random_version"], internal_state, meta["random_gauss_next"]))
+    rng.bit_generator.state = meta["rng_state"]
+    return {
+        "generation": meta["generation"],
+        "evaluations": meta["evaluations"],
+        "runtime": meta["runtime"],
+        "evaluator_stats": meta["evaluator_stats"],
+        "populations": populations,
+    }
+
@@ -1,59 +1,361 @@
+from collections import OrderedDict
 from typing import List
+import hashlib
 from src.ga.individual import Individual
+from src.ga.population import Population
+from src.ga import kernels
 import numpy as np
 
+# Available split engines:
+# - "penalty": O(n^2) DP, overloaded routes allowed at x10 cost (original behaviour)
+# - "bounded": capacity-windowed DP, stops extending a route once it is overloaded
+# - "linear":  Vidal's O(n) monotone-deque split, same model as "bounded"
+SPLIT_MODES = ("penalty", "bounded", "linear")
+
 # This class figures out how good a solution is (lower distance is better)
 FitnessSet = tuple[float, float]
+# DP labels (C, L, P) of a split, kept on the Individual for incremental re-evaluation
+SplitState = tuple[np.ndarray, np.ndarray, np.ndarray]
+# Stand-in for an infinite route cost in int64 labels, far from overflowing when added
+_INT_UNREACHABLE = np.iinfo(np.int64).max // 4
 class FitnessEvaluator:
-    def __init__(self, problem_instance):
+    def __init__(self, problem_instance, split_mode: str = "penalty", cache_size: int = 0):
+        if split_mode not in SPLIT_MODES:
+            raise ValueError(f"Unknown split_mode '{split_mode}', expected one of {SPLIT_MODES}.")
         self.problem = problem_instance
+        self.split_mode = split_mode
+        self._demands = np.asarray(problem_instance.customer_demands, dtype=np.int64)
+        # Integer (TSPLIB-rounded) distances are summed as int64 labels, exactly;
+        # objectives are still reported as floats
+        self._cost_dtype = problem_instance.distances.cost_dtype
+        self._unreachable = _INT_UNREACHABLE if self._cost_dtype.kind == "i" else np.inf
+        # The deque split assumes every single customer fits in a vehicle
+        if split_mode == "linear" and self._demands.size and self._demands.max() > problem_instance.vehicle_capacity:
+            self.split_mode = "bounded"
+        self._split = {
+            "penalty": self._optimal_split,
+            "bounded": self._bounded_split,
+            "linear": self._linear_split,
+        }[self.split_mode]
+        # Compiled split (DP or deque) when numba is available
+        self._kernel_mode = kernels.SPLIT_PENALTY if self.split_mode == "penalty" else kernels.SPLIT_BOUNDED
+        if kernels.is_enabled():
+            kernels.warm_up()
+            self._split = self._kernel_split
+
+        # LRU cache of chromosome hash -> (objectives, routes); disabled when cache_size is 0
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, tuple[FitnessSet, tuple[tuple[int, ...], ...]]] = OrderedDict()
+        self.split_calls = 0
+        self.cache_hits = 0
 
     def evaluate(self, individual: Individual) -> None:
         """
         Calculates the multi-objective fitness of an individual and updates it in-place.
+
+        If the individual still carries the split labels of an earlier evaluation
+        (e.g. it was copied from a parent and then swap-mutated), only the DP
+        suffix from the first modified position onwards is recomputed.
         """
         chromosome = individual.chromosome
+        key = self._cache_key(chromosome) if self.cache_size else None
+        if key is not None and self._cache_lookup(key, individual):
+            return
         num_vehicles = self.problem.num_vehicles
-        fitness_values, best_routes = self._optimal_split(chromosome, num_vehicles)
-        individual.set_evaluation(fitness_values, best_routes)
+        state, start = self._reusable_state(individual)
+        fitness_values, best_routes, new_state = self._split(chromosome, num_vehicles, state, start)
+        self.split_calls += 1
+        if key is not None:
+            self._cache_store(key, fitness_values, best_routes)
+        individual.set_evaluation(fitness_values, best_routes, new_state)
+
+    def _reusable_state(self, individual: Individual) -> tuple[SplitState | None, int]:
+        # Split labels C[0..start] stay valid when positions [0, start) are unchanged.
+        # Falls back to a full split (start 0) when there is nothing local to reuse.
+        state = individual.split_state
+        start = individual.split_valid_prefix
+        if state is None or start <= 0 or self.split_mode == "linear" or len(state[0]) != len(individual.chromosome) + 1:
+            return None, 0
+        return state, start
+
+    def evaluate_batch(self, individuals: List[Individual] | Population) -> None:
+        """
+        Evaluates a whole population at once and updates every individual in-place.
+
+        All chromosomes are stacked into one (P, n) int array; prefix demands and
+        edge costs are gathered for every row in a single pass and the split DP
+        runs over all rows simultaneously (see _batch_split, or the compiled
+        kernels.split_dp_batch when numba is available). "linear" mode runs the
+        deque split on each row instead (kernels.split_linear_batch, or
+        _linear_labels). Objectives and routes are identical to calling
+        evaluate() on each individual in every mode.
+        """
+        if not len(individuals):
+            return
+        if isinstance(individuals, Population):
+            chromosomes = individuals.chromosomes.astype(np.intp)
+            individuals = individuals.individuals()
+        else:
+            chromosomes = np.asarray([ind.chromosome for ind in individuals], dtype=np.intp)
+        if chromosomes.shape[1] == 0:
+            for ind in individuals:
+                self.evaluate(ind)
+            return
+
+        if self.cache_size:
+            # Serve cached chromosomes (and duplicates within the batch) without splitting
+            pending: dict[bytes, list[Individual]] = {}
+            for row, ind in enumerate(individuals):
+                key = self._cache_key(chromosomes[row])
+                if key in pending:
+                    self.cache_hits += 1
+                    pending[key].append(ind)
+                elif not self._cache_lookup(key, ind):
+                    pending[key] = [ind]
+            if not pending:
+                return
+            keys = list(pending)
+            individuals = [pending[key][0] for key in keys]
+            chromosomes = np.asarray([ind.chromosome for ind in individuals], dtype=np.intp)
+
+        # Rows that carry reusable split labels only recompute their DP suffix
+        num_rows, n = chromosomes.shape
+        C = np.full((num_rows, n + 1), self._unreachable, dtype=self._cost_dtype)
+        L = np.zeros((num_rows, n + 1), dtype=self._cost_dtype)
+        P = np.zeros((num_rows, n + 1), dtype=np.int64)
+        C[:, 0] = 0
+        starts = np.zeros(num_rows, dtype=np.int64)
+        for row, ind in enumerate(individuals):
+            state, start = self._reusable_state(ind)
+            if state is not None:
+                C[row, :start + 1] = state[0][:start + 1]
+                L[row, :start + 1] = state[1][:start + 1]
+                P[row, :start + 1] = state[2][:start + 1]
+                starts[row] = start
+
+        if self.split_mode == "linear":
+            # The deque cannot resume mid-tour, so every row starts from scratch
+            if kernels.is_enabled():
+                kernels.warm_up()
+                kernels.split_linear_batch(*self._batch_inputs(chromosomes), self.problem.vehicle_capacity, C, L, P)
+            else:
+                for row, chromosome in enumerate(chromosomes):
+                    C[row], L[row], P[row] = self._linear_labels(chromosome)
+        elif kernels.is_enabled():
+            kernels.warm_up()
+            kernels.split_dp_batch(
+                *self._batch_inputs(chromosomes), self.problem.vehicle_capacity, self._kernel_mode, C, L, P, starts
+            )
+        else:
+            self._batch_split(chromosomes, C, L, P, starts)
+        num_vehicles = self.problem.num_vehicles
+        self.split_calls += num_rows
+        for row, ind in enumerate(individuals):
+            fitness_values, routes = self._finalize_split(
+                ind.chromosome, num_vehicles, float(C[row, n]), float(L[row, n]), P[row].tolist()
+            )
+            if self.cache_size:
+                self._cache_store(keys[row], fitness_values, routes)
+                for duplicate in pending[keys[row]][1:]:
+                    duplicate.set_evaluation(fitness_values, [list(r) for r in routes])
+            ind.set_evaluation(fitness_values, routes, (C[row], L[row], P[row]))
+
+    def cache_stats(self) -> dict:
+        """Split invocations and cache hit/miss counters since the last reset_stats()."""
+        lookups = self.split_calls + self.cache_hits
+        return {
+            "split_invocations": self.split_calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.split_calls if self.cache_size else 0,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "cache_entries": len(self._cache),
+            "cache_capacity": self.cache_size,
+        }
+
+    def reset_stats(self) -> None:
+        """Zeroes the counters reported by cache_stats() (cached entries are kept)."""
+        self.split_calls = 0
+        self.cache_hits = 0
+
+    def restore_stats(self, stats: dict) -> None:
+        """Sets the counters back to a cache_stats() snapshot (used when resuming a run)."""
+        self.split_calls = stats.get("split_invocations", 0)
+        self.cache_hits = stats.get("cache_hits", 0)
+
+    def _cache_key(self, chromosome) -> bytes:
+        # 128-bit digest of the int32 chromosome bytes
+        data = np.asarray(chromosome, dtype=np.int32).tobytes()
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _cache_lookup(self, key: bytes, individual: Individual) -> bool:
+        # Applies a cached evaluation to the individual; returns False on a miss
+        cached = self._cache.get(key)
+        if cached is None:
+            return False
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        fitness_values, routes = cached
+        individual.set_evaluation(fitness_values, [list(r) for r in routes])
+        return True
+
+    def _cache_store(self, key: bytes, fitness_values: FitnessSet, routes: list[list[int]]) -> None:
+        self._cache[key] = (fitness_values, tuple(tuple(r) for r in routes))
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _batch_inputs(self, chromosomes: np.ndarray):
+        # Prefix demands and depot/edge distances for every row of a (P, n) array
+        num_rows, n = chromosomes.shape
+        dist = self.problem.distances
+        prefix_demand = np.zeros((num_rows, n + 1), dtype=np.int64)
+        np.cumsum(self._demands[chromosomes - 1], axis=1, out=prefix_demand[:, 1:])
+        depot_out = dist.pairs(0, chromosomes)
+        depot_in = dist.pairs(chromosomes, 0)
+        edge = dist.pairs(chromosomes[:, :-1], chromosomes[:, 1:])
+        return depot_out, depot_in, edge, prefix_demand
+
+    def _batch_split(self, chromosomes: np.ndarray, C: np.ndarray, L: np.ndarray, P: np.ndarray, starts: np.ndarray) -> None:
+        # Split DP over a (P, n) chromosome array, filling the C/L/P label arrays
+        # in-place. Labels up to starts[row] are taken as already valid. For each
+        # end position i every candidate start j < i is scored at once for all
+        # active rows; the tail costs are built with a cumulative sum in the same
+        # backward order as _optimal_split so the floating-point results match the
+        # scalar version exactly.
+        num_rows, n = chromosomes.shape
+        capacity = self.problem.vehicle_capacity
+        penalise = self.split_mode == "penalty"
+
+        # Process rows ordered by start so the rows still active at step i are a prefix
+        order = np.argsort(starts, kind="stable")
+        sorted_starts = starts[order]
+        depot_out, depot_in, edge, prefix_demand = self._batch_inputs(chromosomes[order])
+        C_s, L_s, P_s = C[order], L[order], P[order]
+
+        # In bounded mode no feasible route holds more customers than fit when
+        # taking the smallest demands first, so older start positions are skipped
+        window = n
+        if not penalise:
+            smallest = np.cumsum(np.sort(self._demands))
+            window = max(1, int(np.searchsorted(smallest, capacity, side="right")))
+
+        all_rows = np.arange(num_rows)
+
+        for i in range(int(sorted_starts[0]) + 1, n + 1):
+            active = int(np.searchsorted(sorted_starts, i, side="left"))
+            rows = all_rows[:active]
+            # Column k corresponds to start position j = i - 1 - k, for j >= lo
+            width = min(i, window)
+            lo = i - width
+            back = slice(i - 1, lo - 1 if lo > 0 else None, -1)
+            tail = np.empty((active, width), dtype=self._cost_dtype)
+            tail[:, 0] = depot_in[:active, i - 1]
+            if width > 1:
+                tail[:, 1:] = edge[:active, slice(i - 2, lo - 1 if lo > 0 else None, -1)]
+            np.cumsum(tail, axis=1, out=tail)
+            route_cost = depot_out[:active, back] + tail
+
+            overloaded = (prefix_demand[:active, i:i + 1] - prefix_demand[:active, back]) > capacity
+            if penalise:
+                route_cost[overloaded] *= 10
+            else:
+                # A single customer is always allowed, as in _bounded_split
+                overloaded[:, 0] = False
+                route_cost[overloaded] = self._unreachable
+
+            total = C_s[:active, back] + route_cost
+            # argmin keeps the first minimum, i.e. the largest j, like the scalar loop
+            k = np.argmin(total, axis=1)
+            j = i - 1 - k
+            C_s[:active, i] = total[rows, k]
+            L_s[:active, i] = np.maximum(L_s[rows, j], route_cost[rows, k])
+            P_s[:active, i] = j
+
+        C[order], L[order], P[order] = C_s, L_s, P_s
+
+    def _split_inputs(self, chromosome):
+        # Prefix demands plus the depot/edge distances the split needs, gathered with
+        # fancy indexing so the DP loops work on plain Python numbers
+        dist = self.problem.distances
+        nodes = np.asarray(chromosome, dtype=np.intp)
+        prefix_demand = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(self._demands[nodes - 1], out=prefix_demand[1:])
+        depot_out: List[float] = dist.pairs(0, nodes).tolist()
+        depot_in: List[float] = dist.pairs(nodes, 0).tolist()
+        edge: List[float] = dist.pairs(nodes[:-1], nodes[1:]).tolist()
+        return prefix_demand.tolist(), depot_out, depot_in, edge
+
+    def _initial_labels(self, n: int, state: SplitState | None, start: int) -> tuple[List[float], List[float], List[int]]:
+        # Fresh DP labels, or the first start+1 labels of a previous split
+        C: List[float] = [float('inf')] * (n + 1)
+        L: List[float] = [0.0] * (n + 1)
+        P: List[int] = [0] * (n + 1)
+        C[0] = 0
+        if state is not None:
+            C[:start + 1] = state[0][:start + 1].tolist()
+            L[:start + 1] = state[1][:start + 1].tolist()
+            P[:start + 1] = state[2][:start + 1].tolist()
+        return C, L, P
+
+    def _kernel_split(self, chromosome, num_vehicles, state=None, start=0) -> tuple[FitnessSet, list[list[int]], SplitState]:
+        # _optimal_split / _bounded_split / _linear_split through the compiled kernels
+        dist = self.problem.distances
+        nodes = np.asarray(chromosome, dtype=np.intp)
+        n = len(nodes)
+        prefix_demand = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self._demands[nodes - 1], out=prefix_demand[1:])
+        C = np.full(n + 1, self._unreachable, dtype=self._cost_dtype)
+        L = np.zeros(n + 1, dtype=self._cost_dtype)
+        P = np.zeros(n + 1, dtype=np.int64)
+        C[0] = 0
+        if state is not None:
+            C[:start + 1] = state[0][:start + 1]
+            L[:start + 1] = state[1][:start + 1]
+            P[:start + 1] = state[2][:start + 1]
+        inputs = (
+            dist.pairs(0, nodes),
+            dist.pairs(nodes, 0),
+            dist.pairs(nodes[:-1], nodes[1:]),
+            prefix_demand,
+            self.problem.vehicle_capacity,
+        )
+        if self.split_mode == "linear":
+            kernels.split_linear(*inputs, C, L, P)
+        else:
+            kernels.split_dp_from(*inputs, self._kernel_mode, C, L, P, start)
+        fitness_values, routes = self._finalize_split(chromosome, num_vehicles, float(C[n]), float(L[n]), P.tolist())
+        return fitness_values, routes, (C, L, P)
 
-    def _optimal_split(self, chromosome, num_vehicles) -> tuple[FitnessSet, list[list[int]]]:
+    def _optimal_split(self, chromosome, num_vehicles, state=None, start=0) -> tuple[FitnessSet, list[list[int]], SplitState]:
         # Implements the Split algorithm using dynamic programming to find the optimal
         # way to partition a single giant tour (chromosome) into a set of feasible
         # vehicle routes with the minimum total distance.
+        # C: best cost, L: longest route on that path, P: predecessor. Labels up to
+        # `start` may come from a previous split of a chromosome sharing that prefix.
         n: int = len(chromosome)
-        C: List[float]= [float('inf')] * (n + 1)
-        L: List[float]= [0.0] * (n + 1) # Tracks the longest route distance
-        P: List[int] = [0] * (n + 1)
-        C[0] = 0
+        C, L, P = self._initial_labels(n, state, start)
 
         # Prefix sums for O(1) demand queries over chromosome subsequences
-        prefix_demand: List[int] = [0] * (n + 1)
-        for idx in range(n):
-            c_id = chromosome[idx]
-            prefix_demand[idx + 1] = prefix_demand[idx] + self.problem.customer_demands[c_id - 1]
+        prefix_demand, depot_out, depot_in, edge = self._split_inputs(chromosome)
+        capacity = self.problem.vehicle_capacity
 
         # Dynamic programming with incremental route cost computation (O(n^2))
-        for i in range(1, n + 1):
+        for i in range(start + 1, n + 1):
             # Maintain tail cost of route from chromosome[j]..chromosome[i-1] to depot as j moves backward
             # Base tail cost when subroute is just [i-1]: cost to return to depot
-            current_tail_cost = self.problem.get_distance(chromosome[i - 1], 0)
+            current_tail_cost = depot_in[i - 1]
             for j in range(i - 1, -1, -1):
                 if j < i - 1:
                     # Add edge from chromosome[j] to next node chromosome[j+1]
-                    current_tail_cost = (
-                        self.problem.get_distance(chromosome[j], chromosome[j + 1])
-                        + current_tail_cost
-                    )
+                    current_tail_cost = edge[j] + current_tail_cost
 
                 # Demand for customers chromosome[j:i]
                 route_demand = prefix_demand[i] - prefix_demand[j]
 
                 # Route cost includes leaving depot to first customer
-                route_cost = self.problem.get_distance(0, chromosome[j]) + current_tail_cost
+                route_cost = depot_out[j] + current_tail_cost
 
                 # Capacity penalty (proportional)
-                if route_demand > self.problem.vehicle_capacity:
+                if route_demand > capacity:
                     route_cost *= 10
 
                 if C[j] + route_cost < C[i]:
@@ -61,15 +363,107 @@ class FitnessEvaluator:
                     L[i] = max(L[j], route_cost)
                     P[i] = j
 
-        best_distance = C[n]
-        longest_route_dist = L[n]
+        return self._split_result(chromosome, num_vehicles, C, L, P)
+
+    def _bounded_split(self, chromosome, num_vehicles, state=None, start=0) -> tuple[FitnessSet, list[list[int]], SplitState]:
+        # Same DP as _optimal_split, but a route is never extended past the vehicle
+        # capacity, so the inner loop only scans the feasible window (O(n*B) where B
+        # is the max number of customers per route). A single customer is always
+        # allowed so that oversized demands still yield a solution.
+        n: int = len(chromosome)
+        C, L, P = self._initial_labels(n, state, start)
+
+        prefix_demand, depot_out, depot_in, edge = self._split_inputs(chromosome)
+        capacity = self.problem.vehicle_capacity
+
+        for i in range(start + 1, n + 1):
+            current_tail_cost = depot_in[i - 1]
+            for j in range(i - 1, -1, -1):
+                if j < i - 1:
+                    if prefix_demand[i] - prefix_demand[j] > capacity:
+                        break
+                    current_tail_cost = edge[j] + current_tail_cost
+
+                route_cost = depot_out[j] + current_tail_cost
+                if C[j] + route_cost < C[i]:
+                    C[i] = C[j] + route_cost
+                    L[i] = max(L[j], route_cost)
+                    P[i] = j
+
+        return self._split_result(chromosome, num_vehicles, C, L, P)
+
+    def _linear_split(self, chromosome, num_vehicles, state=None, start=0) -> tuple[FitnessSet, list[list[int]], SplitState]:
+        # The deque split cannot be resumed mid-tour, so `state` is ignored
+        C, L, P = self._linear_labels(chromosome)
+        return self._split_result(chromosome, num_vehicles, C, L, P)
+
+    def _linear_labels(self, chromosome) -> tuple[List[float], List[float], List[int]]:
+        # Vidal (2016), "Split algorithm in O(n) for the capacitated vehicle routing
+        # problem". Same model as _bounded_split: the cost of the route serving
+        # positions j..i-1 is depot_out[j] + D[i-1] - D[j] + depot_in[i-1], where D
+        # is the cumulative edge length along the giant tour. Candidate predecessors
+        # j are kept in a deque with increasing demand and strictly increasing
+        # C[j] + depot_out[j] - D[j], so the front is always the best feasible one.
+        # On equal keys the later j wins, which is the predecessor _bounded_split
+        # picks on equal labels, so with integer distances both splits agree exactly.
+        n: int = len(chromosome)
+        C: List[float]= [float('inf')] * (n + 1)
+        L: List[float]= [0.0] * (n + 1)
+        P: List[int] = [0] * (n + 1)
+        C[0] = 0
+
+        prefix_demand, depot_out, depot_in, edge = self._split_inputs(chromosome)
+        capacity = self.problem.vehicle_capacity
+
+        # D[k] = distance travelled from chromosome[0] to chromosome[k] along the tour
+        D: List[float] = [0.0] * (n + 1)
+        for k in range(1, n):
+            D[k] = D[k - 1] + edge[k - 1]
+
+        def key(j):
+            return C[j] + depot_out[j] - D[j]
+
+        deque = [0]
+        head = 0  # deque[head:] holds the live candidates
+        for i in range(1, n + 1):
+            j = deque[head]
+            route_cost = depot_out[j] + D[i - 1] - D[j] + depot_in[i - 1]
+            C[i] = C[j] + route_cost
+            L[i] = max(L[j], route_cost)
+            P[i] = j
+
+            if i < n:
+                key_i = key(i)
+                back = deque[-1]
+                # Skip i if the back candidate has the same load and a better key
+                if not (prefix_demand[back] == prefix_demand[i] and key(back) < key_i):
+                    # i stays feasible at least as long as any earlier candidate
+                    while len(deque) > head and key_i <= key(deque[-1]):
+                        deque.pop()
+                    deque.append(i)
+                # Drop predecessors that can no longer reach customer i
+                while prefix_demand[i + 1] - prefix_demand[deque[head]] > capacity:
+                    head += 1
+
+        return C, L, P
+
+    def _split_result(self, chromosome, num_vehicles, C, L, P) -> tuple[FitnessSet, list[list[int]], SplitState]:
+        # Final objectives and routes plus the DP labels for later incremental splits
+        fitness_values, routes = self._finalize_split(chromosome, num_vehicles, float(C[-1]), float(L[-1]), P)
+        state = (np.array(C, dtype=self._cost_dtype), np.array(L, dtype=self._cost_dtype), np.array(P, dtype=np.int64))
+        return fitness_values, routes, state
+
+    def _finalize_split(self, chromosome, num_vehicles, best_distance, longest_route_dist, P) -> tuple[FitnessSet, list[list[int]]]:
+        # Walks the predecessor labels back into routes and applies the fleet-size penalty
+        if isinstance(chromosome, np.ndarray):
+            chromosome = chromosome.tolist()
         routes = []
-        end = n
+        end = len(chromosome)
         while end > 0:
             start = P[end]
             routes.append(chromosome[start:end])
             end = start
-        
+
         routes.reverse()
 
         # Handle case where solution requires more vehicles than available
@@ -79,4 +473,4 @@ class FitnessEvaluator:
             penalty = extra_vehicles * 10000  # Large penalty per extra vehicle
             return (best_distance + penalty, longest_route_dist + penalty), routes
 
-        return (best_distance, longest_route_dist), routes
\ No newline at end of file
+        return (best_distance, longest_route_dist), routes
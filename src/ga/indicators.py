@@ -0,0 +1,213 @@
+"""Quality indicators for bi-objective fronts (both objectives minimised).
+
+- hypervolume / hypervolumes: exact 2-D hypervolume by one sort and a sweep,
+  O(n log n) per front; hypervolumes handles a whole list of fronts with a
+  single lexsort.
+- igd / igd_plus (and the list versions igd_values / igd_plus_values):
+  inverted generational distance to a reference front, plain and IGD+
+  (only the amount by which a point is worse counts).
+- spacing / spacings: Schott's spacing with city-block nearest neighbours,
+  the definition pymoo's SpacingIndicator uses.
+- ReferenceFront: a running best-known front of a problem, merged from any
+  number of fronts (e.g. every generation of a GA or every run of a
+  campaign), against which IGD/IGD+ can be computed online.
+
+Fronts are (k, 2) float arrays of [total_distance, longest_route_distance].
+"""
+from __future__ import annotations
+
+import os
+from typing import Sequence
+
+import numpy as np
+
+
+def _concatenate(fronts: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    # All points of all fronts in one (T, 2) array, and the front of each point
+    sizes = [len(front) for front in fronts]
+    points = np.concatenate([np.asarray(front, dtype=np.float64).reshape(-1, 2) for front in fronts]) if fronts else np.empty((0, 2))
+    front_ids = np.repeat(np.arange(len(fronts)), sizes)
+    return points, front_ids
+
+
+def hypervolumes(fronts: Sequence[np.ndarray], ref_point: Sequence[float]) -> np.ndarray:
+    """Exact hypervolume of every front with respect to the same reference point.
+
+    Points not strictly better than ref_point in both objectives add nothing.
+    After sorting each front by the first objective, the region dominated by
+    the front is a staircase: between consecutive x values its height is
+    ref_y minus the lowest y seen so far. The running minimum restarts at every
+    front, which is done on integer ranks of y (offset by front) to stay exact.
+    """
+    points, front_ids = _concatenate(fronts)
+    ref_x, ref_y = float(ref_point[0]), float(ref_point[1])
+    inside = (points[:, 0] < ref_x) & (points[:, 1] < ref_y)
+    points, front_ids = points[inside], front_ids[inside]
+    result = np.zeros(len(fronts))
+    if len(points) == 0:
+        return result
+
+    order = np.lexsort((points[:, 1], points[:, 0], front_ids))
+    x, y, front_ids = points[order, 0], points[order, 1], front_ids[order]
+    y_values, y_ranks = np.unique(y, return_inverse=True)
+    # Later fronts get lower ranks than every earlier one, so the running
+    # minimum never carries over from the previous front
+    offset = front_ids.astype(np.int64) * len(y_values)
+    lowest_y = y_values[np.minimum.accumulate(y_ranks.reshape(-1) - offset) + offset]
+    next_x = np.append(x[1:], ref_x)
+    last_of_front = np.append(front_ids[1:] != front_ids[:-1], True)
+    next_x[last_of_front] = ref_x
+    areas = (next_x - x) * (ref_y - lowest_y)
+    result += np.bincount(front_ids, weights=areas, minlength=len(fronts))
+    return result
+
+
+def hypervolume(front: np.ndarray, ref_point: Sequence[float]) -> float:
+    """Exact hypervolume of one front (see hypervolumes)."""
+    return float(hypervolumes([front], ref_point)[0])
+
+
+def _distance_to_reference(fronts: Sequence[np.ndarray], reference_front: np.ndarray, plus: bool) -> np.ndarray:
+    # Mean over reference points of the distance to the closest point of each front
+    points, front_ids = _concatenate(fronts)
+    reference_front = np.asarray(reference_front, dtype=np.float64).reshape(-1, 2)
+    result = np.full(len(fronts), np.nan)
+    sizes = np.bincount(front_ids, minlength=len(fronts))
+    non_empty = np.flatnonzero(sizes)
+    if len(non_empty) == 0 or len(reference_front) == 0:
+        return result
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[non_empty]
+
+    totals = np.zeros(len(non_empty))
+    # Bound the (reference x points) distance matrix to a few MB per block
+    block = max(1, (1 << 19) // len(points))
+    for first in range(0, len(reference_front), block):
+        diff = points[np.newaxis, :, :] - reference_front[first:first + block, np.newaxis, :]
+        if plus:
+            np.maximum(diff, 0.0, out=diff)
+        distances = np.sqrt(np.einsum("rtk,rtk->rt", diff, diff))
+        totals += np.minimum.reduceat(distances, starts, axis=1).sum(axis=0)
+    result[non_empty] = totals / len(reference_front)
+    return result
+
+
+def igd_values(fronts: Sequence[np.ndarray], reference_front: np.ndarray) -> np.ndarray:
+    """IGD of every front to reference_front (NaN for empty fronts)."""
+    return _distance_to_reference(fronts, reference_front, plus=False)
+
+
+def igd_plus_values(fronts: Sequence[np.ndarray], reference_front: np.ndarray) -> np.ndarray:
+    """IGD+ of every front to reference_front (NaN for empty fronts).
+
+    A point only pays for the objectives in which it is worse than the
+    reference point it is matched to, so IGD+ is weakly Pareto-compliant.
+    """
+    return _distance_to_reference(fronts, reference_front, plus=True)
+
+
+def igd(front: np.ndarray, reference_front: np.ndarray) -> float:
+    return float(igd_values([front], reference_front)[0])
+
+
+def igd_plus(front: np.ndarray, reference_front: np.ndarray) -> float:
+    return float(igd_plus_values([front], reference_front)[0])
+
+
+def spacings(fronts: Sequence[np.ndarray]) -> np.ndarray:
+    """Spacing of every front (NaN for fronts with fewer than two points).
+
+    Spacing is the population standard deviation of each point's city-block
+    distance to its nearest neighbour. In a mutually non-dominated 2-D front
+    sorted by the first objective that neighbour is always adjacent, so all
+    such fronts are done with one lexsort; any other front falls back to the
+    pairwise distances.
+    """
+    points, front_ids = _concatenate(fronts)
+    result = np.full(len(fronts), np.nan)
+    if len(points) == 0:
+        return result
+    order = np.lexsort((-points[:, 1], points[:, 0], front_ids))
+    points, front_ids = points[order], front_ids[order]
+    same_front = front_ids[1:] == front_ids[:-1]
+    gaps = np.abs(np.diff(points, axis=0)).sum(axis=1)
+    # Sorted by x ascending, a non-dominated front has y non-increasing
+    rising = same_front & (points[1:, 1] > points[:-1, 1])
+    irregular = np.zeros(len(fronts), dtype=bool)
+    irregular[front_ids[1:][rising]] = True
+
+    # Nearest neighbour is the closer of the previous and next point of the same front
+    to_previous = np.concatenate([[np.inf], np.where(same_front, gaps, np.inf)])
+    to_next = np.concatenate([np.where(same_front, gaps, np.inf), [np.inf]])
+    nearest = np.minimum(to_previous, to_next)
+    sizes = np.bincount(front_ids, minlength=len(fronts))
+    means = np.bincount(front_ids, weights=np.where(np.isfinite(nearest), nearest, 0.0), minlength=len(fronts))
+    valid = sizes > 1
+    means[valid] /= sizes[valid]
+    squares = np.bincount(front_ids, weights=np.where(np.isfinite(nearest), (nearest - means[front_ids]) ** 2, 0.0), minlength=len(fronts))
+    result[valid] = np.sqrt(squares[valid] / sizes[valid])
+
+    for k in np.flatnonzero(irregular & valid):
+        front = np.asarray(fronts[k], dtype=np.float64)
+        distances = np.abs(front[:, np.newaxis, :] - front[np.newaxis, :, :]).sum(axis=2)
+        np.fill_diagonal(distances, np.inf)
+        nearest_k = distances.min(axis=1)
+        result[k] = np.sqrt(np.mean((nearest_k - nearest_k.mean()) ** 2))
+    return result
+
+
+def spacing(front: np.ndarray) -> float:
+    return float(spacings([front])[0])
+
+
+def non_dominated(points: np.ndarray) -> np.ndarray:
+    """The distinct non-dominated points of a (k, 2) array, sorted by the first objective."""
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 2), axis=0)
+    if len(points) == 0:
+        return points
+    # np.unique sorts by x then y: a point survives if its y beats every earlier y
+    earlier_best = np.minimum.accumulate(np.concatenate([[np.inf], points[:-1, 1]]))
+    return points[points[:, 1] < earlier_best]
+
+
+class ReferenceFront:
+    """Running best-known front of one problem.
+
+    update() merges any front into it (keeping only non-dominated points), so
+    it can follow a GA generation by generation or collect every run of a
+    campaign; igd()/igd_plus() then measure a front against the best known so
+    far. save()/load() keep it in an .npy file across sessions.
+    """
+
+    def __init__(self, points: np.ndarray | None = None):
+        self.points = non_dominated(points if points is not None else np.empty((0, 2)))
+
+    def update(self, front: np.ndarray) -> bool:
+        """Merges `front` in; returns True if the best-known front changed."""
+        merged = non_dominated(np.concatenate([self.points, np.asarray(front, dtype=np.float64).reshape(-1, 2)]))
+        changed = not np.array_equal(merged, self.points)
+        self.points = merged
+        return changed
+
+    def nadir(self) -> np.ndarray:
+        """Worst value of each objective over the front."""
+        return self.points.max(axis=0)
+
+    def igd(self, front: np.ndarray) -> float:
+        return igd(front, self.points)
+
+    def igd_plus(self, front: np.ndarray) -> float:
+        return igd_plus(front, self.points)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.save(path, self.points)
+
+    @classmethod
+    def load(cls, path: str) -> ReferenceFront:
+        """The front saved at `path`, or an empty one if there is none."""
+        if not os.path.exists(path):
+            return cls()
+        return cls(np.load(path))
+
+    def __len__(self) -> int:
+        return len(self.points)
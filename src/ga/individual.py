@@ -1,34 +1,141 @@
 import random
 
+
+def random_chromosome(problem_instance, rng=random):
+    # Make a random route (customers are 1-indexed, 0 is depot); rng is a
+    # random.Random, the global `random` module by default
+    customer_indicies = list(range(1, problem_instance.num_customers + 1))
+    rng.shuffle(customer_indicies)
+    return customer_indicies
+
 # Represents a possible solution (a route order)
+#
+# An Individual is a lightweight view onto one row of a Population (see
+# src/ga/population.py), which stores every attribute in NumPy arrays. Creating
+# an Individual directly gives it a private one-row Population, so it can still
+# be used standalone exactly as before. `chromosome` and `objectives` read as
+# list copies of the row; assign a whole new list to change them.
 class Individual:
-    def __init__(self, problem_instance, chromosome=None):
+    __slots__ = ("problem", "population", "index")
+
+    def __init__(self, problem_instance, chromosome=None, rng=random):
+        from src.ga.population import Population
+
         self.problem = problem_instance
-        if chromosome is not None:
-            # Used when loading a specific chromosome (route order)
-            self.chromosome = chromosome
-        else:
-            # Make a random route (customers are 1-indexed, 0 is depot)
-            customer_indicies = list(range(1, self.problem.num_customers + 1))
-            random.shuffle(customer_indicies)
-            self.chromosome = customer_indicies
-
-        # Multi-objective attributes (minimize both)
-        # Store as a mutable list so they can be updated in-place
-        # objectives[0] = total_distance, objectives[1] = longest_route_distance
-        self.objectives = [float('inf'), float('inf')]
-        # Routes produced by the split evaluation for this chromosome
-        self.routes = []
-        # NSGA-II metadata
-        self.pareto_rank = -1
-        self.crowding_distance = 0.0
-        # SPEA2 metadata
-        self.spea2_fitness = float('inf')
-        self.kth_distance = float('inf')
-
-    def set_evaluation(self, fitness_values, routes):
+        if chromosome is None:
+            chromosome = random_chromosome(self.problem, rng)
+        # Used when loading a specific chromosome (route order)
+        self.population = Population(problem_instance, [chromosome])
+        self.index = 0
+
+    @classmethod
+    def view(cls, population, index):
+        # View onto row `index` of an existing Population (no copy)
+        ind = cls.__new__(cls)
+        ind.problem = population.problem
+        ind.population = population
+        ind.index = index
+        return ind
+
+    @property
+    def chromosome(self):
+        return self.population.chromosomes[self.index].tolist()
+
+    @chromosome.setter
+    def chromosome(self, value):
+        self.population.chromosomes[self.index] = value
+
+    # Multi-objective attributes (minimize both)
+    # objectives[0] = total_distance, objectives[1] = longest_route_distance
+    @property
+    def objectives(self):
+        return self.population.objectives[self.index].tolist()
+
+    @objectives.setter
+    def objectives(self, value):
+        self.population.objectives[self.index] = value
+
+    # Routes produced by the split evaluation for this chromosome
+    @property
+    def routes(self):
+        return self.population.routes[self.index]
+
+    @routes.setter
+    def routes(self, value):
+        self.population.routes[self.index] = value
+
+    # NSGA-II metadata
+    @property
+    def pareto_rank(self):
+        return int(self.population.pareto_rank[self.index])
+
+    @pareto_rank.setter
+    def pareto_rank(self, value):
+        self.population.pareto_rank[self.index] = value
+
+    @property
+    def crowding_distance(self):
+        return float(self.population.crowding_distance[self.index])
+
+    @crowding_distance.setter
+    def crowding_distance(self, value):
+        self.population.crowding_distance[self.index] = value
+
+    # SPEA2 metadata
+    @property
+    def spea2_fitness(self):
+        return float(self.population.spea2_fitness[self.index])
+
+    @spea2_fitness.setter
+    def spea2_fitness(self, value):
+        self.population.spea2_fitness[self.index] = value
+
+    @property
+    def kth_distance(self):
+        return float(self.population.kth_distance[self.index])
+
+    @kth_distance.setter
+    def kth_distance(self, value):
+        self.population.kth_distance[self.index] = value
+
+    # Split DP labels (C, L, P) from the last evaluation, and how many leading
+    # chromosome positions are unchanged since then (used for incremental splits)
+    @property
+    def split_state(self):
+        return self.population.split_state[self.index]
+
+    @split_state.setter
+    def split_state(self, value):
+        self.population.split_state[self.index] = value
+
+    @property
+    def split_valid_prefix(self):
+        return int(self.population.split_valid_prefix[self.index])
+
+    @split_valid_prefix.setter
+    def split_valid_prefix(self, value):
+        self.population.split_valid_prefix[self.index] = value
+
+    def set_evaluation(self, fitness_values, routes, split_state=None):
         # fitness_values is a tuple[float, float] from FitnessEvaluator
-        self.objectives[0] = fitness_values[0]
-        self.objectives[1] = fitness_values[1]
+        objectives = self.population.objectives[self.index]
+        objectives[0] = fitness_values[0]
+        objectives[1] = fitness_values[1]
         self.routes = routes
+        self.split_state = split_state
+        self.split_valid_prefix = self.population.chromosomes.shape[1] if split_state is not None else 0
+
+    def inherit_split_state(self, parent):
+        # The chromosome is an unchanged copy of the parent's: its split labels still apply
+        self.split_state = parent.split_state
+        self.split_valid_prefix = parent.split_valid_prefix
+
+    def swap_genes(self, idx1, idx2):
+        # Swaps two chromosome positions in place
+        row = self.population.chromosomes[self.index]
+        row[idx1], row[idx2] = row[idx2], row[idx1]
+        self.mark_modified(min(idx1, idx2))
 
+    def mark_modified(self, position):
+        # Positions from `position` onwards changed; later split labels are stale
+        self.split_valid_prefix = min(self.split_valid_prefix, position)
@@ -0,0 +1,453 @@
+"""Optional Numba-compiled kernels for the hot numeric loops.
+
+When numba is installed the split DP and the deque split, the Pareto ranking used by
+fast_non_dominated_sort, the SPEA2 strength/raw-fitness pass and the granular
+local search descent are compiled to machine code. FitnessEvaluator,
+fast_non_dominated_sort and calculate_spea2_fitness check is_enabled() and
+fall back to their pure-Python implementations otherwise; LocalSearch runs
+granular_descent itself through the interpreter. Set CVRP_NUMBA=0 to force
+the Python path.
+
+The kernels perform the same floating-point operations in the same order as
+the Python code, so both paths produce identical objectives. The split DP is
+also compiled for int64 costs, used when an instance has integer (TSPLIB
+rounded) distances.
+"""
+import os
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Without numba the kernels stay importable as plain Python functions
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+_enabled = NUMBA_AVAILABLE and os.environ.get("CVRP_NUMBA", "1") != "0"
+_warmed_up = False
+
+# Split modes understood by split_dp (mirrors FitnessEvaluator.split_mode)
+SPLIT_PENALTY = 0
+SPLIT_BOUNDED = 1
+
+
+def is_enabled() -> bool:
+    """True when the compiled kernels should be used."""
+    return _enabled
+
+
+def set_enabled(flag: bool) -> None:
+    """Switches the compiled kernels on or off (no-op 'on' without numba)."""
+    global _enabled
+    _enabled = bool(flag) and NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def split_dp_from(depot_out, depot_in, edge, prefix_demand, capacity, mode, C, L, P, start):
+    # Same DP as FitnessEvaluator._optimal_split (mode 0) / _bounded_split (mode 1),
+    # filling the labels C (cost), L (longest route) and P (predecessor) in-place.
+    # Labels 0..start must already be valid; only positions after start are computed.
+    # The labels may be float64 or int64 (integer distances): the first candidate,
+    # j = i - 1, is always taken rather than compared against an infinite C[i].
+    n = depot_out.shape[0]
+    for i in range(start + 1, n + 1):
+        current_tail_cost = depot_in[i - 1]
+        for j in range(i - 1, -1, -1):
+            route_demand = prefix_demand[i] - prefix_demand[j]
+            if j < i - 1:
+                if mode == 1 and route_demand > capacity:
+                    break
+                current_tail_cost = edge[j] + current_tail_cost
+            route_cost = depot_out[j] + current_tail_cost
+            if mode == 0 and route_demand > capacity:
+                route_cost *= 10
+            if j == i - 1 or C[j] + route_cost < C[i]:
+                C[i] = C[j] + route_cost
+                L[i] = max(L[j], route_cost)
+                P[i] = j
+
+
+@njit(cache=True)
+def split_linear(depot_out, depot_in, edge, prefix_demand, capacity, C, L, P):
+    # Same deque split as FitnessEvaluator._linear_split, filling C, L and P from
+    # scratch. The deque is an array of candidate positions, live in [head, tail),
+    # with the key of each candidate stored when it is pushed.
+    n = depot_out.shape[0]
+    D = np.zeros(n + 1, dtype=depot_out.dtype)
+    for k in range(1, n):
+        D[k] = D[k - 1] + edge[k - 1]
+    key = np.zeros(n + 1, dtype=depot_out.dtype)
+    deque = np.zeros(n + 1, dtype=np.int64)
+    key[0] = C[0] + depot_out[0] - D[0]
+    head = 0
+    tail = 1
+    for i in range(1, n + 1):
+        j = deque[head]
+        route_cost = depot_out[j] + D[i - 1] - D[j] + depot_in[i - 1]
+        C[i] = C[j] + route_cost
+        L[i] = max(L[j], route_cost)
+        P[i] = j
+        if i < n:
+            key_i = C[i] + depot_out[i] - D[i]
+            back = deque[tail - 1]
+            if not (prefix_demand[back] == prefix_demand[i] and key[back] < key_i):
+                while tail > head and key_i <= key[deque[tail - 1]]:
+                    tail -= 1
+                deque[tail] = i
+                key[i] = key_i
+                tail += 1
+            while prefix_demand[i + 1] - prefix_demand[deque[head]] > capacity:
+                head += 1
+
+
+@njit(cache=True)
+def split_linear_batch(depot_out, depot_in, edge, prefix_demand, capacity, C, L, P):
+    # split_linear applied to every row of (P, n) input and (P, n+1) label arrays
+    for r in range(depot_out.shape[0]):
+        split_linear(depot_out[r], depot_in[r], edge[r], prefix_demand[r], capacity, C[r], L[r], P[r])
+
+
+@njit(cache=True)
+def split_dp(depot_out, depot_in, edge, prefix_demand, capacity, mode):
+    # Full split from scratch; returns (best_distance, longest_route, predecessor labels)
+    n = depot_out.shape[0]
+    C = np.zeros(n + 1, dtype=depot_out.dtype)
+    L = np.zeros(n + 1, dtype=depot_out.dtype)
+    P = np.zeros(n + 1, dtype=np.int64)
+    split_dp_from(depot_out, depot_in, edge, prefix_demand, capacity, mode, C, L, P, 0)
+    return C[n], L[n], P
+
+
+@njit(cache=True)
+def split_dp_batch(depot_out, depot_in, edge, prefix_demand, capacity, mode, C, L, P, starts):
+    # split_dp_from applied to every row of (P, n) input and (P, n+1) label arrays
+    for r in range(depot_out.shape[0]):
+        split_dp_from(depot_out[r], depot_in[r], edge[r], prefix_demand[r], capacity, mode, C[r], L[r], P[r], starts[r])
+
+
+@njit(cache=True)
+def _dominates(objectives, p, q):
+    return (objectives[p, 0] <= objectives[q, 0] and objectives[p, 1] <= objectives[q, 1]) and (
+        objectives[p, 0] < objectives[q, 0] or objectives[p, 1] < objectives[q, 1]
+    )
+
+
+@njit(cache=True)
+def pareto_ranks(objectives):
+    # 1-based non-domination rank of every row of an (N, 2) objective array
+    n = objectives.shape[0]
+    dominated_by = np.zeros((n, n), dtype=np.bool_)  # dominated_by[p, q]: p dominates q
+    counts = np.zeros(n, dtype=np.int64)
+    for p in range(n):
+        for q in range(n):
+            if p != q and _dominates(objectives, p, q):
+                dominated_by[p, q] = True
+                counts[q] += 1
+    ranks = np.zeros(n, dtype=np.int64)
+    current = np.empty(n, dtype=np.int64)
+    size = 0
+    for p in range(n):
+        if counts[p] == 0:
+            current[size] = p
+            size += 1
+    rank = 1
+    nxt = np.empty(n, dtype=np.int64)
+    while size > 0:
+        next_size = 0
+        for k in range(size):
+            p = current[k]
+            ranks[p] = rank
+            for q in range(n):
+                if dominated_by[p, q]:
+                    counts[q] -= 1
+                    if counts[q] == 0:
+                        nxt[next_size] = q
+                        next_size += 1
+        current, nxt = nxt, current
+        size = next_size
+        rank += 1
+    return ranks
+
+
+@njit(cache=True)
+def strength_and_raw_fitness(objectives):
+    # SPEA2 S(i) (number dominated) and R(i) (sum of dominators' strengths)
+    n = objectives.shape[0]
+    strengths = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        for j in range(n):
+            if i != j and _dominates(objectives, i, j):
+                strengths[i] += 1
+    raw = np.zeros(n)
+    for i in range(n):
+        total = 0
+        for j in range(n):
+            if i != j and _dominates(objectives, j, i):
+                total += strengths[j]
+        raw[i] = total
+    return strengths, raw
+
+
+# Granular local search (see src/ga/local_search.py). Routes are doubly linked
+# lists over customer ids: pred/succ give the neighbours within the route
+# (0 is the depot), head the first customer of each route (0 once it is empty)
+# and pos the position of every customer in its route.
+
+@njit(cache=True)
+def _renumber(route_id, head, succ, pos):
+    # Recomputes the positions of one route's customers
+    c = head[route_id]
+    k = 0
+    while c != 0:
+        pos[c] = k
+        k += 1
+        c = succ[c]
+
+
+@njit(cache=True)
+def _unlink(c, route_id, head, pred, succ):
+    # Removes customer c from its route
+    p = pred[c]
+    s = succ[c]
+    if p == 0:
+        head[route_id] = s
+    else:
+        succ[p] = s
+    if s != 0:
+        pred[s] = p
+
+
+@njit(cache=True)
+def _link(c, before, after, route_id, head, pred, succ, route):
+    # Inserts customer c between `before` and `after` (either may be the depot)
+    pred[c] = before
+    succ[c] = after
+    if before == 0:
+        head[route_id] = c
+    else:
+        succ[before] = c
+    if after != 0:
+        pred[after] = c
+    route[c] = route_id
+
+
+@njit(cache=True)
+def _reverse(first, last, route_id, head, pred, succ, buffer):
+    # Reverses the segment first..last of one route (first comes before last)
+    p = pred[first]
+    s = succ[last]
+    size = 0
+    c = first
+    while True:
+        buffer[size] = c
+        size += 1
+        if c == last:
+            break
+        c = succ[c]
+    previous = p
+    for k in range(size - 1, -1, -1):
+        c = buffer[k]
+        pred[c] = previous
+        if previous == 0:
+            head[route_id] = c
+        else:
+            succ[previous] = c
+        previous = c
+    succ[previous] = s
+    if s != 0:
+        pred[s] = previous
+
+
+@njit(cache=True)
+def _distance(dist, coordinates, rounded, i, j):
+    # dist[i, j], or the Euclidean distance of the coordinates when there is no
+    # matrix (TSPLIB-rounded to an integer if `rounded`)
+    if dist.shape[0] == 0:
+        dx = coordinates[i, 0] - coordinates[j, 0]
+        dy = coordinates[i, 1] - coordinates[j, 1]
+        if rounded:
+            return np.floor(np.sqrt(dx * dx + dy * dy) + 0.5)
+        return np.sqrt(dx * dx + dy * dy)
+    return np.float64(dist[i, j])
+
+
+@njit(cache=True)
+def granular_descent(dist, coordinates, rounded, demand, capacity, neighbours, tour, route_sizes, max_passes):
+    # First-improvement descent over 2-opt (within a route) and relocate/swap
+    # (between routes), only trying moves that create an edge (u, v) with v
+    # among u's nearest neighbours. Each move is priced in O(1) from the cached
+    # route loads and costs; it is taken if it shortens the total distance,
+    # keeps every route it adds demand to within capacity and lets no route
+    # grow past the current longest one. An empty (0, 0) dist computes every
+    # distance from the coordinates instead, rounded to TSPLIB integers if
+    # `rounded`. Returns (tour, route sizes, improved).
+    n = tour.shape[0]
+    num_routes = route_sizes.shape[0]
+    pred = np.zeros(n + 1, dtype=np.int64)
+    succ = np.zeros(n + 1, dtype=np.int64)
+    route = np.zeros(n + 1, dtype=np.int64)
+    pos = np.zeros(n + 1, dtype=np.int64)
+    head = np.zeros(num_routes, dtype=np.int64)
+    load = np.zeros(num_routes, dtype=np.int64)
+    cost = np.zeros(num_routes)
+    buffer = np.empty(n, dtype=np.int64)
+
+    start = 0
+    for r in range(num_routes):
+        previous = 0
+        for k in range(start, start + route_sizes[r]):
+            c = tour[k]
+            _link(c, previous, 0, r, head, pred, succ, route)
+            pos[c] = k - start
+            load[r] += demand[c]
+            cost[r] += _distance(dist, coordinates, rounded, previous, c)
+            previous = c
+        cost[r] += _distance(dist, coordinates, rounded, previous, 0)
+        start += route_sizes[r]
+    longest = 0.0
+    for r in range(num_routes):
+        longest = max(longest, cost[r])
+
+    eps = 1e-9
+    improved = False
+    for _ in range(max_passes):
+        moved = False
+        for u in range(1, n + 1):
+            for t in range(neighbours.shape[1]):
+                v = neighbours[u, t]
+                ru = route[u]
+                rv = route[v]
+                pu = pred[u]
+                su = succ[u]
+                pv = pred[v]
+                sv = succ[v]
+                applied = False
+                if ru != rv:
+                    removal = _distance(dist, coordinates, rounded, pu, u) + _distance(dist, coordinates, rounded, u, su) - _distance(dist, coordinates, rounded, pu, su)
+                    if load[rv] + demand[u] <= capacity:
+                        # Relocate u next to v: after it, then before it
+                        for side in range(2):
+                            before = v if side == 0 else pv
+                            after = sv if side == 0 else v
+                            insertion = _distance(dist, coordinates, rounded, before, u) + _distance(dist, coordinates, rounded, u, after) - _distance(dist, coordinates, rounded, before, after)
+                            new_u = cost[ru] - removal
+                            new_v = cost[rv] + insertion
+                            if insertion - removal < -eps and new_u <= longest and new_v <= longest:
+                                _unlink(u, ru, head, pred, succ)
+                                _link(u, before, after, rv, head, pred, succ, route)
+                                load[ru] -= demand[u]
+                                load[rv] += demand[u]
+                                cost[ru] = new_u
+                                cost[rv] = new_v
+                                applied = True
+                                break
+                    if not applied:
+                        # Swap u and v
+                        new_load_u = load[ru] - demand[u] + demand[v]
+                        new_load_v = load[rv] - demand[v] + demand[u]
+                        if (new_load_u <= capacity or demand[v] <= demand[u]) and (
+                            new_load_v <= capacity or demand[u] <= demand[v]
+                        ):
+                            delta_u = _distance(dist, coordinates, rounded, pu, v) + _distance(dist, coordinates, rounded, v, su) - _distance(dist, coordinates, rounded, pu, u) - _distance(dist, coordinates, rounded, u, su)
+                            delta_v = _distance(dist, coordinates, rounded, pv, u) + _distance(dist, coordinates, rounded, u, sv) - _distance(dist, coordinates, rounded, pv, v) - _distance(dist, coordinates, rounded, v, sv)
+                            new_u = cost[ru] + delta_u
+                            new_v = cost[rv] + delta_v
+                            if delta_u + delta_v < -eps and new_u <= longest and new_v <= longest:
+                                _unlink(u, ru, head, pred, succ)
+                                _link(v, pu, su, ru, head, pred, succ, route)
+                                _link(u, pv, sv, rv, head, pred, succ, route)
+                                load[ru] = new_load_u
+                                load[rv] = new_load_v
+                                cost[ru] = new_u
+                                cost[rv] = new_v
+                                applied = True
+                else:
+                    # 2-opt creating the edge (a, b), a before b in the route
+                    a = u if pos[u] < pos[v] else v
+                    b = v if pos[u] < pos[v] else u
+                    sa = succ[a]
+                    sb = succ[b]
+                    pa = pred[a]
+                    pb = pred[b]
+                    if sa != b:
+                        # Replace (a, sa), (b, sb) by (a, b), (sa, sb): reverse sa..b
+                        delta = _distance(dist, coordinates, rounded, a, b) + _distance(dist, coordinates, rounded, sa, sb) - _distance(dist, coordinates, rounded, a, sa) - _distance(dist, coordinates, rounded, b, sb)
+                        if delta < -eps:
+                            _reverse(sa, b, ru, head, pred, succ, buffer)
+                            cost[ru] += delta
+                            applied = True
+                    if not applied and pb != a:
+                        # Replace (pa, a), (pb, b) by (pa, pb), (a, b): reverse a..pb
+                        delta = _distance(dist, coordinates, rounded, pa, pb) + _distance(dist, coordinates, rounded, a, b) - _distance(dist, coordinates, rounded, pa, a) - _distance(dist, coordinates, rounded, pb, b)
+                        if delta < -eps:
+                            _reverse(a, pb, ru, head, pred, succ, buffer)
+                            cost[ru] += delta
+                            applied = True
+                if applied:
+                    _renumber(ru, head, succ, pos)
+                    if rv != ru:
+                        _renumber(rv, head, succ, pos)
+                    longest = 0.0
+                    for r in range(num_routes):
+                        longest = max(longest, cost[r])
+                    moved = True
+                    improved = True
+                    break
+        if not moved:
+            break
+
+    new_tour = np.empty(n, dtype=tour.dtype)
+    new_sizes = np.zeros(num_routes, dtype=np.int64)
+    k = 0
+    used = 0
+    for r in range(num_routes):
+        c = head[r]
+        if c == 0:
+            continue
+        while c != 0:
+            new_tour[k] = c
+            k += 1
+            new_sizes[used] += 1
+            c = succ[c]
+        used += 1
+    return new_tour, new_sizes[:used], improved
+
+
+def warm_up() -> None:
+    """Compiles (or loads from the on-disk cache) every kernel on tiny inputs.
+
+    Called before the timed part of a run so JIT compilation is never charged
+    to the first generation. Cheap after the first call.
+    """
+    global _warmed_up
+    if _warmed_up or not _enabled:
+        return
+    demand = np.array([0, 1, 2, 3], dtype=np.int64)
+    # float64 distances, and int64 ones for TSPLIB-rounded instances
+    for dtype in (np.float64, np.int64):
+        dist = np.ones(3, dtype=dtype)
+        for mode in (SPLIT_PENALTY, SPLIT_BOUNDED):
+            split_dp(dist, dist, dist[:2], demand, 2, mode)
+            C = np.zeros((1, 4), dtype=dtype)
+            L = np.zeros((1, 4), dtype=dtype)
+            P = np.zeros((1, 4), dtype=np.int64)
+            starts = np.zeros(1, dtype=np.int64)
+            split_dp_batch(dist[np.newaxis], dist[np.newaxis], dist[np.newaxis, :2], demand[np.newaxis], 2, mode, C, L, P, starts)
+        split_linear(dist, dist, dist[:2], demand, 3, C[0], L[0], P[0])
+        split_linear_batch(dist[np.newaxis], dist[np.newaxis], dist[np.newaxis, :2], demand[np.newaxis], 3, C, L, P)
+    objectives = np.array([[1.0, 2.0], [2.0, 1.0], [3.0, 3.0]])
+    pareto_ranks(objectives)
+    strength_and_raw_fitness(objectives)
+    # LocalSearch passes its matrix read-only: float64 (exact distances, or the
+    # empty on-demand one) or int32 (TSPLIB-rounded distances)
+    for dtype in (np.float64, np.int32):
+        matrix = np.ones((4, 4), dtype=dtype)
+        matrix.flags.writeable = False
+        granular_descent(matrix, np.zeros((4, 2)), False, demand, 2, np.array([[1], [2], [3], [1]], dtype=np.int32), np.array([1, 2, 3]), np.array([2, 1]), 1)
+    _warmed_up = True
@@ -0,0 +1,111 @@
+"""Granular local search used to educate offspring (memetic mode).
+
+After an offspring is evaluated, the routes its split produced are improved
+by a first-improvement descent over three neighbourhoods:
+  - 2-opt within a route,
+  - relocating a customer into another route,
+  - swapping two customers of different routes.
+Only moves that put a customer next to one of its k nearest neighbours
+(ProblemInstance.nearest_neighbours) are tried (granular neighbourhoods), and
+each is priced in O(1) from cached route loads and costs, so one pass costs
+O(n k) rather than O(n^2). A move is taken
+when it shortens the total distance without overloading a route or making
+the longest route longer, so education never worsens either objective of the
+routes it starts from. The descent itself is kernels.granular_descent
+(compiled when numba is available).
+
+The improved routes are concatenated back into the chromosome, which is then
+re-evaluated by the FitnessEvaluator, so objectives, routes and split labels
+stay exactly what the split gives for the chromosome. Each re-evaluation
+counts as an evaluation of the run's budget.
+
+Enabled per parameter set with a `local_search` entry, e.g.
+    "local_search": {"neighbours": 10, "rate": 0.2}
+where `rate` is the fraction of offspring educated each generation.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from src.ga import kernels
+from src.ga.population import Population
+
+
+class LocalSearch:
+    """Granular local search over the split routes of a problem's solutions.
+
+    `neighbours` is the size of each customer's candidate list, `rate` the
+    probability that an offspring is educated and `max_passes` caps the number
+    of sweeps over all customers per solution.
+    """
+
+    def __init__(self, problem_instance, neighbours: int = 10, rate: float = 1.0, max_passes: int = 50):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"local_search rate must be in [0, 1], got {rate}.")
+        self.problem = problem_instance
+        self.rate = rate
+        self.max_passes = max_passes
+        # The instance's own matrix is used in place (int32 or float, often a view
+        # of shared memory), never copied. Instances without one have their
+        # distances computed from the coordinates, rounded like the instance's own
+        # when they are integers. The descent always gets a read-only matrix and a
+        # writable copy of the (small) coordinates, the argument types warm_up
+        # compiles, so no run pays for JIT compilation whatever the arrays' origin
+        matrix = problem_instance.distance_matrix
+        self._rounded = problem_instance.integer_distances
+        self._dist = (np.empty((0, 0)) if matrix is None else matrix).view(np.ndarray)
+        self._dist.flags.writeable = False
+        self._coordinates = np.array(problem_instance.coordinates, dtype=np.float64)
+        self._demand = np.concatenate([[0], np.asarray(problem_instance.customer_demands, dtype=np.int64)])
+        self.neighbours = np.ascontiguousarray(problem_instance.nearest_neighbours(neighbours))
+        self._descent = kernels.granular_descent
+        if not kernels.is_enabled():
+            # The same algorithm run by the interpreter
+            self._descent = getattr(kernels.granular_descent, "py_func", kernels.granular_descent)
+
+    @classmethod
+    def from_config(cls, problem_instance, options: dict | None) -> LocalSearch | None:
+        """The LocalSearch a parameter set's `local_search` entry asks for (None when absent or falsy)."""
+        if not options:
+            return None
+        if options is True:
+            return cls(problem_instance)
+        return cls(problem_instance, **options)
+
+    def improve(self, chromosome: np.ndarray, routes: list[list[int]]) -> np.ndarray | None:
+        """The chromosome of the improved routes, or None if no move improved them."""
+        tour = np.asarray(chromosome, dtype=np.int64)
+        route_sizes = np.array([len(route) for route in routes], dtype=np.int64)
+        if len(tour) == 0 or route_sizes.sum() != len(tour):
+            return None
+        new_tour, _, improved = self._descent(
+            self._dist, self._coordinates, self._rounded, self._demand, self.problem.vehicle_capacity,
+            self.neighbours, tour, route_sizes, self.max_passes
+        )
+        if not improved or np.array_equal(new_tour, tour):
+            return None
+        return new_tour
+
+    def educate(self, population: Population, evaluator, rng: np.random.Generator) -> int:
+        """Improves a `rate` fraction of an evaluated population in place.
+
+        Changed chromosomes are re-evaluated (their split labels stay valid up
+        to the first changed position). Returns the number of re-evaluations.
+        """
+        if self.rate >= 1.0:
+            rows = np.arange(len(population))
+        else:
+            rows = np.flatnonzero(rng.random(len(population)) < self.rate)
+        changed = []
+        for row in rows:
+            old = population.chromosomes[row]
+            new = self.improve(old, population.routes[row])
+            if new is None:
+                continue
+            first_change = int(np.argmax(old != new))
+            population.chromosomes[row] = new
+            individual = population[row]
+            individual.mark_modified(first_change)
+            changed.append(individual)
+        evaluator.evaluate_batch(changed)
+        return len(changed)
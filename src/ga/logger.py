@@ -1,36 +1,41 @@
 import os
-import csv
-import json
 from typing import List, Dict, Any
 
 from src.vrp.problem import ProblemInstance
 from src.ga.individual import Individual
+from src.ga.population import Population
+from src.ga.result_store import ResultStore
 
 
-def _ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
+def run_directory(output_base_dir: str, problem_name: str, param_set_name: str, run_id: int) -> str:
+    """Per-run scratch directory (e.g. for the run's checkpoint)."""
+    return os.path.join(output_base_dir, problem_name, param_set_name, f"run_{run_id}")
 
 
 def log_run_results(
-    output_base_dir: str,
+    results_path: str,
+    algorithm: str,
     problem: ProblemInstance,
     params: Dict[str, Any],
     run_id: int,
     runtime: float,
     evaluations: int,
-    final_front: List[Individual]
+    final_front: Population | List[Individual],
+    evaluator_stats: Dict[str, Any] | None = None,
+    run_info: Dict[str, Any] | None = None
 ) -> None:
-    """Persist results of a NSGA-II run in a structured directory.
+    """Append the results of one run to the campaign's result store.
 
-    Directory layout:
-      {output_base_dir}/{problem.name}/{params['name']}/run_{run_id}/
-        - summary.json
-        - final_pareto_front.csv
-    """
-    run_dir = os.path.join(output_base_dir, problem.name, params.get('name', 'default'), f"run_{run_id}")
-    _ensure_dir(run_dir)
+    `results_path` is the store file (see result_store.store_path); the run is
+    keyed by (algorithm, problem.name, params['name'], run_id) and re-logging a
+    run replaces it.
 
-    # summary.json
+    `evaluations` is the number of requested fitness evaluations (the budget);
+    `evaluator_stats` (FitnessEvaluator.cache_stats()) adds how many of them
+    actually ran the split vs. were served from the evaluation cache.
+    `run_info` holds extra run metadata (e.g. the run's seed) to record in the
+    summary.
+    """
     summary = {
         "problem_name": problem.name,
         "parameter_set_name": params.get('name', 'default'),
@@ -41,15 +46,11 @@ def log_run_results(
         "num_customers": problem.num_customers,
         "vehicle_capacity": problem.vehicle_capacity,
     }
-    with open(os.path.join(run_dir, 'summary.json'), 'w') as f:
-        json.dump(summary, f, indent=2)
-
-    # final_pareto_front.csv
-    with open(os.path.join(run_dir, 'final_pareto_front.csv'), 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["total_distance", "max_route_length", "chromosome", "routes"]) 
-        for ind in final_front:
-            td, mr = ind.objectives
-            chromosome_str = "-".join(map(str, ind.chromosome))
-            routes_str = ";".join(["-".join(map(str, r)) for r in ind.routes])
-            writer.writerow([td, mr, chromosome_str, routes_str])
\ No newline at end of file
+    if evaluator_stats is not None:
+        summary.update(evaluator_stats)
+    if run_info is not None:
+        summary.update(run_info)
+    if not isinstance(final_front, Population):
+        final_front = Population.from_individuals(problem, final_front)
+    with ResultStore(results_path) as store:
+        store.append_run(algorithm, summary, final_front)
@@ -1,20 +1,42 @@
 import random
+
+import numpy as np
+
 from src.ga.individual import Individual
+from src.ga.population import Population
+from src.ga.profiling import PhaseProfiler
 
-# PMX crossover: mixes two parents to make two new routes
+# PMX crossover: mixes two parents to make two new routes. The scalar operators
+# draw from rng, a random.Random (the global `random` module by default).
 def pmx_crossover(
     p1: Individual,
     p2: Individual,
-    Pc: float
+    Pc: float,
+    rng: random.Random = random
 ) -> tuple[Individual, Individual]:
-    chr1 = p1.chromosome[:]
-    chr2 = p2.chromosome[:]
+    o1_chr, o2_chr, crossed = pmx_chromosomes(p1.chromosome, p2.chromosome, Pc, rng)
+    c1, c2 = Individual(p1.problem, o1_chr), Individual(p2.problem, o2_chr)
+    if not crossed:
+        # Unchanged copies keep the parents' split labels for incremental evaluation
+        c1.inherit_split_state(p1)
+        c2.inherit_split_state(p2)
+    return c1, c2
+
+# PMX on plain chromosome lists; also reports whether crossover happened
+def pmx_chromosomes(
+    chr1: list[int],
+    chr2: list[int],
+    Pc: float,
+    rng: random.Random = random
+) -> tuple[list[int], list[int], bool]:
+    chr1 = chr1[:]
+    chr2 = chr2[:]
     size = len(chr1)
     o1_chr = [0] * size
     o2_chr = [0] * size
-    if random.random() > Pc:
-        return Individual(p1.problem, chr1), Individual(p2.problem, chr2)
-    cx_p1, cx_p2 = sorted(random.sample(range(size), 2))
+    if rng.random() > Pc:
+        return chr1, chr2, False
+    cx_p1, cx_p2 = sorted(rng.sample(range(size), 2))
     # Copy the crossover section directly
     o1_chr[cx_p1:cx_p2] = chr1[cx_p1:cx_p2]
     o2_chr[cx_p1:cx_p2] = chr2[cx_p1:cx_p2]
@@ -31,11 +53,133 @@ def pmx_crossover(
         while val_from_p1 in mapping2:
             val_from_p1 = mapping2[val_from_p1]
         o2_chr[i] = val_from_p1
-    return Individual(p1.problem, o1_chr), Individual(p2.problem, o2_chr)
+    return o1_chr, o2_chr, True
 
 # Randomly swap two locations in the route
-def swap_mutation(indiv: Individual, Pm: float):
-    if random.random() < Pm:
-        chr = indiv.chromosome
-        idx1, idx2 = random.sample(range(len(chr)),2)
-        chr[idx1], chr[idx2] = chr[idx2], chr[idx1]
\ No newline at end of file
+def swap_mutation(indiv: Individual, Pm: float, rng: random.Random = random):
+    if rng.random() < Pm:
+        idx1, idx2 = rng.sample(range(len(indiv.chromosome)),2)
+        indiv.swap_genes(idx1, idx2)
+
+# Batched PMX on (M, n) parent arrays: pair k crosses first[k] with second[k].
+# Rows with crossed[k] False are returned as unchanged copies. cuts holds the
+# sorted (start, end) positions of each pair's mapping section.
+def batch_pmx_crossover(
+    first: np.ndarray,
+    second: np.ndarray,
+    crossed: np.ndarray,
+    cuts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    num_pairs, size = first.shape
+    positions = np.arange(size, dtype=np.int32)[np.newaxis, :]
+    in_section = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:]) & crossed[:, np.newaxis]
+
+    # Everything below indexes raveled arrays with flat indices: 1-D takes are
+    # much cheaper than 2-D fancy indexing. Row k of an (M, n) array starts at
+    # k * n, row k of an (M, n+1) per-gene table at k * (n + 1).
+    index_dtype = np.int32 if num_pairs * (size + 1) < 2**31 else np.intp
+    position_offsets = np.arange(num_pairs, dtype=index_dtype)[:, np.newaxis] * size
+    gene_offsets = np.arange(num_pairs, dtype=index_dtype)[:, np.newaxis] * (size + 1)
+    flat_positions = (positions + position_offsets).ravel()
+
+    # Flat position of every gene value in each parent (genes are 1..n; gene 0
+    # is pointed at the row's first position and never used)
+    position_in_first = np.repeat(position_offsets, size + 1, axis=1).ravel()
+    position_in_second = position_in_first.copy()
+    position_in_first[(first + gene_offsets).ravel()] = flat_positions
+    position_in_second[(second + gene_offsets).ravel()] = flat_positions
+
+    def fill(section_parent, other_parent, position_in_section_parent):
+        # Genes outside the section come from the other parent; a gene already
+        # placed by the section is replaced by its mapped counterpart, following
+        # the chain (gene -> its position in the section -> other parent's gene
+        # there) until it leaves the section. resolve[v] is one chain step for
+        # gene v; squaring it (pointer jumping) resolves chains of length < 2^k
+        # after k vectorised passes. Chains are shorter than the section, so
+        # log2(n) passes suffice (genes shared by both sections can form cycles,
+        # but no chain starting outside the other parent's section reaches one).
+        mapped = np.take(in_section, position_in_section_parent)
+        mapped[::size + 1] = False  # gene 0 (the depot) never occurs in a chromosome
+        genes = np.arange(num_pairs * (size + 1), dtype=index_dtype)
+        resolve = np.where(mapped, np.take(other_parent, position_in_section_parent) + gene_offsets.repeat(size + 1), genes)
+        for _ in range(size.bit_length()):
+            resolve = np.take(resolve, resolve)
+        repaired = np.take(resolve, other_parent + gene_offsets) - gene_offsets
+        return np.where(in_section | ~crossed[:, np.newaxis], section_parent, repaired)
+
+    return fill(first, second, position_in_first), fill(second, first, position_in_second)
+
+_NO_PROFILER = PhaseProfiler(enabled=False)
+
+# Batched swap mutation: each row is mutated with probability Pm by swapping
+# two distinct random positions in place. Returns the first changed position
+# of every row (n for rows left untouched).
+def batch_swap_mutation(
+    chromosomes: np.ndarray,
+    Pm: float,
+    rng: np.random.Generator
+) -> np.ndarray:
+    num_rows, size = chromosomes.shape
+    first_changed = np.full(num_rows, size, dtype=np.int64)
+    mutated = np.flatnonzero(rng.random(num_rows) < Pm)
+    if size < 2 or len(mutated) == 0:
+        return first_changed
+    idx1 = rng.integers(0, size, len(mutated))
+    # Drawing from n - 1 positions and skipping idx1 keeps the pair distinct
+    idx2 = rng.integers(0, size - 1, len(mutated))
+    idx2 += idx2 >= idx1
+    genes1 = chromosomes[mutated, idx1]
+    chromosomes[mutated, idx1] = chromosomes[mutated, idx2]
+    chromosomes[mutated, idx2] = genes1
+    first_changed[mutated] = np.minimum(idx1, idx2)
+    return first_changed
+
+# Variation step of both GAs on a Population: consecutive rows of the mating
+# pool are paired, crossed over with PMX and each child swap-mutated, all pairs
+# at once. rng is the run's generator, so a seeded run is reproducible. An
+# enabled profiler times the "crossover" and "mutation" phases.
+def create_offspring(
+    mating_pool: Population,
+    Pc: float,
+    Pm: float,
+    offspring_size: int,
+    rng: np.random.Generator,
+    profiler: PhaseProfiler | None = None
+) -> Population:
+    if profiler is None:
+        profiler = _NO_PROFILER
+    pool_size = len(mating_pool)
+    size = mating_pool.chromosomes.shape[1]
+    num_pairs = (offspring_size + 1) // 2
+    first_rows = np.arange(0, 2 * num_pairs, 2) % pool_size
+    second_rows = (first_rows + 1) % pool_size
+
+    with profiler.phase("crossover"):
+        crossed = rng.random(num_pairs) <= Pc
+        if size >= 2:
+            cuts = np.stack([rng.integers(0, size, num_pairs), rng.integers(0, size - 1, num_pairs)], axis=1)
+            # Second cut drawn from n - 1 positions and shifted past the first: distinct cuts
+            cuts[:, 1] += cuts[:, 1] >= cuts[:, 0]
+            cuts.sort(axis=1)
+        else:
+            crossed[:] = False
+            cuts = np.zeros((num_pairs, 2), dtype=np.int64)
+        children1, children2 = batch_pmx_crossover(
+            mating_pool.chromosomes[first_rows], mating_pool.chromosomes[second_rows], crossed, cuts
+        )
+
+        # Interleave c1, c2 per pair and drop the surplus child of an odd offspring_size
+        chromosomes = np.stack([children1, children2], axis=1).reshape(-1, size)[:offspring_size]
+        sources = np.stack([first_rows, second_rows], axis=1).reshape(-1)[:offspring_size]
+        copied = np.repeat(~crossed, 2)[:offspring_size]
+    with profiler.phase("mutation"):
+        first_changed = batch_swap_mutation(chromosomes, Pm, rng)
+
+    offspring = Population(mating_pool.problem, chromosomes)
+    # Unchanged copies keep the parents' split labels for incremental evaluation
+    for child in np.flatnonzero(copied).tolist():
+        offspring.split_state[child] = mating_pool.split_state[sources[child]]
+    offspring.split_valid_prefix[:] = np.where(
+        copied, np.minimum(mating_pool.split_valid_prefix[sources], first_changed), 0
+    )
+    return offspring
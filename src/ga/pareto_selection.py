@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from typing import List
 
+import numpy as np
+
+from src.ga import kernels
 from src.ga.individual import Individual
+from src.ga.population import Population
 
 
 def fast_non_dominated_sort(population: List[Individual]) -> List[List[Individual]]:
@@ -15,6 +19,9 @@ def fast_non_dominated_sort(population: List[Individual]) -> List[List[Individua
     if not population:
         return []
 
+    if kernels.is_enabled():
+        return _compiled_non_dominated_sort(population)
+
     # Initialize dominance structures
     domination_sets: List[set[int]] = [set() for _ in range(len(population))]
     domination_counts: List[int] = [0 for _ in range(len(population))]
@@ -63,50 +70,155 @@ def fast_non_dominated_sort(population: List[Individual]) -> List[List[Individua
     return fronts_as_inds
 
 
-def calculate_crowding_distance(front: list[Individual]) -> None:
-    """Compute crowding distance for a single front in-place.
+def _compiled_non_dominated_sort(population: List[Individual]) -> List[List[Individual]]:
+    """fast_non_dominated_sort through kernels.pareto_ranks.
 
-    - Sets individual.crowding_distance.
-    - Boundary solutions for each objective receive infinite distance.
+    Ranks are identical to the Python path; within a front, individuals keep
+    their population order.
+    """
+    kernels.warm_up()
+    objectives = np.array([ind.objectives for ind in population], dtype=np.float64)
+    ranks = kernels.pareto_ranks(objectives).tolist()
+    fronts_as_inds: List[List[Individual]] = [[] for _ in range(max(ranks))]
+    for ind, rank in zip(population, ranks):
+        ind.pareto_rank = rank
+        fronts_as_inds[rank - 1].append(ind)
+    return fronts_as_inds
+
+
+def bi_objective_non_dominated_sort(population: List[Individual]) -> List[List[Individual]]:
+    """Non-dominated sorting specialised for two objectives in O(N log N).
+
+    - Individuals are visited in lexicographic (objective 0, objective 1) order,
+      so nobody visited later can dominate an earlier one.
+    - Each front is summarised by its last visited member, which has the
+      smallest objective 1 in that front. An individual is dominated by a front
+      iff it is dominated by that member, and this holds for a prefix of the
+      fronts, so the right front is found by binary search.
+    - Produces the same fronts and pareto_rank values as fast_non_dominated_sort;
+      within a front, individuals keep their population order.
+    """
+    if not population:
+        return []
+
+    objectives = np.array([ind.objectives for ind in population], dtype=np.float64)
+    ranks = _bi_objective_ranks(objectives)
+    fronts_as_inds: List[List[Individual]] = [[] for _ in range(max(ranks))]
+    for ind, rank in zip(population, ranks):
+        ind.pareto_rank = rank
+        fronts_as_inds[rank - 1].append(ind)
+    return fronts_as_inds
+
+
+def _bi_objective_ranks(objectives: np.ndarray) -> List[int]:
+    """1-based ranks of the rows of an (N, 2) objective array (see bi_objective_non_dominated_sort)."""
+    order = np.lexsort((objectives[:, 1], objectives[:, 0]))
+    f0 = objectives[:, 0].tolist()
+    f1 = objectives[:, 1].tolist()
+
+    # last_f0[k], last_f1[k]: objectives of the last individual placed in front k
+    last_f0: List[float] = []
+    last_f1: List[float] = []
+    ranks = [0] * len(objectives)
+    for idx in order.tolist():
+        q0, q1 = f0[idx], f1[idx]
+        lo, hi = 0, len(last_f1)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            # Does the last member of front `mid` dominate q? (it has p0 <= q0)
+            if last_f1[mid] < q1 or (last_f1[mid] == q1 and last_f0[mid] < q0):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(last_f1):
+            last_f0.append(q0)
+            last_f1.append(q1)
+        else:
+            last_f0[lo] = q0
+            last_f1[lo] = q1
+        ranks[idx] = lo + 1
+    return ranks
+
+
+# Sorters selectable via run_nsga2(sorter=...)
+NON_DOMINATED_SORTERS = {
+    "fast": fast_non_dominated_sort,
+    "bi_objective": bi_objective_non_dominated_sort,
+}
+
+
+def non_dominated_fronts(population: Population, sorter: str = "fast") -> List[np.ndarray]:
+    """Non-dominated sorting directly on a Population's objective array.
+
+    - Sets population.pareto_rank (1-based) for every row.
+    - Returns the fronts as arrays of row indices, in population order.
+    - `sorter` is a key of NON_DOMINATED_SORTERS; all sorters give the same result.
     """
-    n = len(front)
+    if sorter not in NON_DOMINATED_SORTERS:
+        raise ValueError(f"Unknown sorter '{sorter}', expected one of {list(NON_DOMINATED_SORTERS)}.")
+    if len(population) == 0:
+        return []
+
+    if sorter == "bi_objective":
+        population.pareto_rank[:] = _bi_objective_ranks(population.objectives)
+    elif kernels.is_enabled():
+        kernels.warm_up()
+        population.pareto_rank[:] = kernels.pareto_ranks(population.objectives)
+    else:
+        # Ranks are written through the Individual views
+        fast_non_dominated_sort(population.individuals())
+
+    ranks = population.pareto_rank
+    # A stable argsort groups rows by rank while keeping population order
+    order = np.argsort(ranks, kind="stable")
+    boundaries = np.flatnonzero(np.diff(ranks[order])) + 1
+    return np.split(order, boundaries)
+
+
+def crowding_distances(objectives: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Crowding distance of every row of a front's (N, 2) objective array.
+
+    Returns (distances, order): distances[i] belongs to row i, and order is the
+    permutation calculate_crowding_distance leaves the front in (it sorts the
+    front by each objective in turn, twice, with stable sorts).
+    """
+    n = len(objectives)
+    order = np.arange(n)
     if n <= 2:
         # For fronts with 0, 1, or 2 solutions, all get infinite distance
-        for ind in front:
-            ind.crowding_distance = float('inf')
-        return
-
-    # Initialize all distances to zero
-    for ind in front:
-        ind.crowding_distance = 0.0
+        return np.full(n, np.inf), order
 
+    distances = np.zeros(n)
     num_objectives = 2  # total_distance, longest_route
 
-    # --- STAGE 1: Calculate and sum the distances for interior points ---
-    # This must be done for all objectives before assigning infinite distance
-    # to boundaries to prevent summed distances from being overwritten.
+    # STAGE 1: sum the normalised neighbour gaps of interior points per objective
     for m in range(num_objectives):
-        # Sort by the current objective to find neighbors
-        front.sort(key=lambda ind: ind.objectives[m])
-        min_val = front[0].objectives[m]
-        max_val = front[-1].objectives[m]
-
+        order = order[np.argsort(objectives[order, m], kind="stable")]
+        values = objectives[order, m]
+        min_val, max_val = values[0], values[-1]
         # Avoid division by zero if all values are the same
         if max_val == min_val:
             continue
+        distances[order[1:-1]] += (values[2:] - values[:-2]) / (max_val - min_val)
 
-        # Add the normalized distance for all interior points
-        for i in range(1, n - 1):
-            prev_val = front[i - 1].objectives[m]
-            next_val = front[i + 1].objectives[m]
-            front[i].crowding_distance += (next_val - prev_val) / (max_val - min_val)
-
-    # --- STAGE 2: Assign infinite distance to all boundary points ---
-    # An individual gets infinite distance if it's a boundary for *any* objective.
+    # STAGE 2: boundary points for any objective get infinite distance
     for m in range(num_objectives):
-        # Sort again to be sure we identify the correct boundaries
-        front.sort(key=lambda ind: ind.objectives[m])
-        front[0].crowding_distance = float('inf')
-        front[-1].crowding_distance = float('inf')
+        order = order[np.argsort(objectives[order, m], kind="stable")]
+        distances[order[0]] = np.inf
+        distances[order[-1]] = np.inf
+
+    return distances, order
 
 
+def calculate_crowding_distance(front: list[Individual]) -> None:
+    """Compute crowding distance for a single front in-place.
+
+    - Sets individual.crowding_distance.
+    - Boundary solutions for each objective receive infinite distance.
+    - Leaves the front sorted as described in crowding_distances.
+    """
+    objectives = np.array([ind.objectives for ind in front], dtype=np.float64).reshape(-1, 2)
+    distances, order = crowding_distances(objectives)
+    for ind, distance in zip(front, distances.tolist()):
+        ind.crowding_distance = distance
+    front[:] = [front[i] for i in order.tolist()]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from src.ga.individual import Individual
+
+
+# Structure-of-arrays container for a whole population
+class Population:
+    """A population stored as parallel NumPy arrays, one row per individual.
+
+    - chromosomes: (P, n) int32 giant tours (customers are 1-indexed, 0 is depot)
+    - objectives: (P, 2) float64, [total_distance, longest_route_distance]
+    - pareto_rank, crowding_distance: NSGA-II metadata
+    - spea2_fitness, kth_distance: SPEA2 metadata
+    - routes, split_state: per-row Python objects (ragged) set by the evaluator
+    - split_valid_prefix: leading positions unchanged since split_state was computed
+
+    Indexing or iterating yields Individual views onto a row, so code written
+    against lists of Individuals keeps working on a Population.
+    """
+
+    def __init__(self, problem_instance, chromosomes):
+        self.problem = problem_instance
+        chromosomes = np.asarray(chromosomes, dtype=np.int32)
+        if chromosomes.ndim == 1:  # empty population
+            chromosomes = chromosomes.reshape(0, problem_instance.num_customers)
+        self.chromosomes = np.ascontiguousarray(chromosomes)
+        size = len(self.chromosomes)
+        self.objectives = np.full((size, 2), np.inf)
+        self.pareto_rank = np.full(size, -1, dtype=np.int64)
+        self.crowding_distance = np.zeros(size)
+        self.spea2_fitness = np.full(size, np.inf)
+        self.kth_distance = np.full(size, np.inf)
+        self.routes: list[list[list[int]]] = [[] for _ in range(size)]
+        self.split_state: list = [None] * size
+        self.split_valid_prefix = np.zeros(size, dtype=np.int64)
+
+    @classmethod
+    def from_individuals(cls, problem_instance, individuals: Iterable[Individual]) -> Population:
+        """Copies Individuals (standalone or views) into a new Population."""
+        individuals = list(individuals)
+        pop = cls(problem_instance, [ind.chromosome for ind in individuals])
+        for row, ind in enumerate(individuals):
+            pop.objectives[row] = ind.objectives
+            pop.pareto_rank[row] = ind.pareto_rank
+            pop.crowding_distance[row] = ind.crowding_distance
+            pop.spea2_fitness[row] = ind.spea2_fitness
+            pop.kth_distance[row] = ind.kth_distance
+            pop.routes[row] = ind.routes
+            pop.split_state[row] = ind.split_state
+            pop.split_valid_prefix[row] = ind.split_valid_prefix
+        return pop
+
+    @classmethod
+    def concat(cls, first: Population, second: Population) -> Population:
+        """Rows of `first` followed by rows of `second` (copied)."""
+        pop = cls.__new__(cls)
+        pop.problem = first.problem
+        for name in ("chromosomes", "objectives", "pareto_rank", "crowding_distance",
+                     "spea2_fitness", "kth_distance", "split_valid_prefix"):
+            setattr(pop, name, np.concatenate([getattr(first, name), getattr(second, name)]))
+        pop.routes = first.routes + second.routes
+        pop.split_state = first.split_state + second.split_state
+        return pop
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> Population:
+        """New Population holding copies of the given rows, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        pop = Population.__new__(Population)
+        pop.problem = self.problem
+        for name in ("chromosomes", "objectives", "pareto_rank", "crowding_distance",
+                     "spea2_fitness", "kth_distance", "split_valid_prefix"):
+            setattr(pop, name, getattr(self, name)[indices])
+        index_list = indices.tolist()
+        pop.routes = [self.routes[i] for i in index_list]
+        pop.split_state = [self.split_state[i] for i in index_list]
+        return pop
+
+    def individuals(self) -> list[Individual]:
+        """Individual views onto every row."""
+        return [Individual.view(self, row) for row in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.chromosomes)
+
+    def __getitem__(self, row: int) -> Individual:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("Population index out of range")
+        return Individual.view(self, row)
+
+    def __iter__(self) -> Iterator[Individual]:
+        for row in range(len(self)):
+            yield Individual.view(self, row)
+
+
+def flatten_routes(routes: Sequence[list[list[int]]]) -> tuple[np.ndarray, np.ndarray]:
+    """(route count per individual, length of every route) as int32 arrays.
+
+    Every route is a contiguous slice of its chromosome, so these two arrays
+    and the chromosomes are enough to rebuild the routes.
+    """
+    route_counts = np.array([len(individual_routes) for individual_routes in routes], dtype=np.int32)
+    route_lengths = np.array([len(route) for individual_routes in routes for route in individual_routes], dtype=np.int32)
+    return route_counts, route_lengths
+
+
+def unflatten_routes(chromosomes: np.ndarray, route_counts: np.ndarray, route_lengths: np.ndarray) -> list[list[list[int]]]:
+    """Inverse of flatten_routes: cuts each chromosome into consecutive routes."""
+    lengths = route_lengths.tolist()
+    routes = []
+    k = 0
+    for chromosome, count in zip(chromosomes.tolist(), route_counts.tolist()):
+        start = 0
+        individual_routes = []
+        for length in lengths[k:k + count]:
+            individual_routes.append(chromosome[start:start + length])
+            start += length
+        routes.append(individual_routes)
+        k += count
+    return routes
@@ -0,0 +1,132 @@
+"""Opt-in per-phase profiling of the GA loops.
+
+run_nsga2/run_spea2 wrap each phase of a generation (non-dominated sorting,
+crowding distance, tournament selection, crossover, mutation, evaluation,
+SPEA2 fitness, archive truncation, ...) in `profiler.phase(name)`. An enabled
+PhaseProfiler times every phase with perf_counter_ns and aggregates the
+durations into per-phase log2 histograms; summary() turns them into a JSON
+friendly dict (count, total, mean, min/max and percentiles) for the run's
+summary. A disabled profiler hands out one shared no-op context manager, so
+instrumented code costs a method call per phase when profiling is off.
+
+Profiling is enabled with the CVRP_PROFILE environment variable (or
+`main.py --profile`, which sets it for the worker processes):
+  CVRP_PROFILE=phases    phase histograms only (CVRP_PROFILE=1 is the same)
+  CVRP_PROFILE=cprofile  phase histograms plus a cProfile/pstats dump per run
+Unset, empty or "0" leaves profiling off.
+"""
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import os
+import time
+
+PROFILE_MODES = ("phases", "cprofile")
+# Bucket k of a histogram counts durations in [2^k, 2^(k+1)) nanoseconds
+_NUM_BUCKETS = 64
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: PhaseProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+
+
+class PhaseProfiler:
+    """Per-run phase timer; PhaseProfiler() is enabled, PhaseProfiler(enabled=False) is a no-op."""
+
+    def __init__(self, enabled: bool = True, cprofile: bool = False):
+        self.enabled = enabled
+        self.cprofile_enabled = enabled and cprofile
+        self.histograms: dict[str, list[int]] = {}
+        self.totals: dict[str, int] = {}
+        self.minimums: dict[str, int] = {}
+        self.maximums: dict[str, int] = {}
+
+    @classmethod
+    def from_environment(cls) -> PhaseProfiler:
+        """Profiler configured by CVRP_PROFILE (disabled when it is unset)."""
+        mode = os.environ.get("CVRP_PROFILE", "")
+        if mode in ("", "0"):
+            return cls(enabled=False)
+        if mode not in PROFILE_MODES and mode != "1":
+            raise ValueError(f"Unknown CVRP_PROFILE '{mode}', expected one of {list(PROFILE_MODES)}.")
+        return cls(cprofile=mode == "cprofile")
+
+    def phase(self, name: str):
+        """Context manager timing one occurrence of phase `name`."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name: str, elapsed_ns: int) -> None:
+        """Records one occurrence of phase `name` that took `elapsed_ns`."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = [0] * _NUM_BUCKETS
+            self.totals[name] = 0
+            self.minimums[name] = elapsed_ns
+            self.maximums[name] = elapsed_ns
+        histogram[min(max(elapsed_ns, 1).bit_length() - 1, _NUM_BUCKETS - 1)] += 1
+        self.totals[name] += elapsed_ns
+        self.minimums[name] = min(self.minimums[name], elapsed_ns)
+        self.maximums[name] = max(self.maximums[name], elapsed_ns)
+
+    @contextlib.contextmanager
+    def cprofile(self, path: str):
+        """Runs the body under cProfile and dumps pstats to `path`, if cProfile is enabled."""
+        if not self.cprofile_enabled:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            profile.dump_stats(path)
+
+    def summary(self) -> dict[str, dict]:
+        """Per-phase statistics in microseconds, phases ordered by total time.
+
+        Percentiles are read off the log2 histogram (upper edge of the bucket
+        holding the percentile, capped by the maximum), so they are within a
+        factor of two. `share` is the phase's fraction of all profiled time.
+        """
+        grand_total = sum(self.totals.values()) or 1
+        phases = {}
+        for name in sorted(self.totals, key=self.totals.get, reverse=True):
+            histogram = self.histograms[name]
+            count = sum(histogram)
+            phases[name] = {
+                "count": count,
+                "total_ms": self.totals[name] / 1e6,
+                "share": self.totals[name] / grand_total,
+                "mean_us": self.totals[name] / count / 1e3,
+                "min_us": self.minimums[name] / 1e3,
+                "max_us": self.maximums[name] / 1e3,
+                **{f"p{q}_us": self._percentile(name, q / 100) / 1e3 for q in (50, 90, 99)},
+                "histogram_log2_ns": {str(k): n for k, n in enumerate(histogram) if n},
+            }
+        return phases
+
+    def _percentile(self, name: str, fraction: float) -> float:
+        histogram = self.histograms[name]
+        threshold = fraction * sum(histogram)
+        seen = 0
+        for k, n in enumerate(histogram):
+            seen += n
+            if n and seen >= threshold:
+                return min(2 ** (k + 1), self.maximums[name])
+        return self.maximums[name]
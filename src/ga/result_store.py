@@ -0,0 +1,163 @@
+"""Single-file result store for a whole campaign.
+
+Every finished run is appended as one row of an SQLite database
+({output_base_dir}/results.sqlite) instead of a directory of small JSON/CSV
+files. Problem, parameter set, algorithm and run id are indexed columns, the
+numbers analysis needs most (runtime, evaluations, front size) are plain
+columns, and the final front is stored column-wise as binary blobs: float64
+objectives, int32 chromosomes and int32 route lengths (see
+population.flatten_routes). The full summary dict is kept as JSON alongside.
+
+Worker processes append concurrently; SQLite's write-ahead log serialises
+the (tiny) insert transactions, so readers never see a half-written run.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from src.ga.population import Population, flatten_routes, unflatten_routes
+
+STORE_FILENAME = "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    algorithm TEXT NOT NULL,
+    problem_name TEXT NOT NULL,
+    parameter_set_name TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    wall_clock_time_sec REAL NOT NULL,
+    total_evaluations INTEGER NOT NULL,
+    num_customers INTEGER NOT NULL,
+    front_size INTEGER NOT NULL,
+    objectives BLOB NOT NULL,
+    chromosomes BLOB NOT NULL,
+    route_counts BLOB NOT NULL,
+    route_lengths BLOB NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (algorithm, problem_name, parameter_set_name, run_id)
+);
+CREATE INDEX IF NOT EXISTS runs_by_problem ON runs (problem_name, parameter_set_name, algorithm);
+"""
+
+RunKey = Tuple[str, str, str, int]
+
+
+def store_path(output_base_dir: str) -> str:
+    """The campaign's result store under `output_base_dir`."""
+    return os.path.join(output_base_dir, STORE_FILENAME)
+
+
+class ResultStore:
+    """Connection to one campaign's results.sqlite (created on first use)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Concurrent workers wait for each other's insert instead of failing
+        self.connection = sqlite3.connect(path, timeout=60.0)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+
+    def append_run(
+        self,
+        algorithm: str,
+        summary: Dict[str, Any],
+        front: Population
+    ) -> None:
+        """Stores one finished run (replacing an earlier row for the same run).
+
+        `summary` must hold problem_name, parameter_set_name, run_id,
+        wall_clock_time_sec and total_evaluations; all of it is also kept as JSON.
+        """
+        route_counts, route_lengths = flatten_routes(front.routes)
+        row = (
+            algorithm,
+            summary["problem_name"],
+            summary["parameter_set_name"],
+            summary["run_id"],
+            summary["wall_clock_time_sec"],
+            summary["total_evaluations"],
+            front.chromosomes.shape[1],
+            len(front),
+            np.ascontiguousarray(front.objectives, dtype=np.float64).tobytes(),
+            np.ascontiguousarray(front.chromosomes, dtype=np.int32).tobytes(),
+            route_counts.tobytes(),
+            route_lengths.tobytes(),
+            json.dumps(summary),
+        )
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+
+    def completed_runs(self) -> set[RunKey]:
+        """(algorithm, problem, parameter set, run id) of every stored run."""
+        rows = self.connection.execute(
+            "SELECT algorithm, problem_name, parameter_set_name, run_id FROM runs"
+        )
+        return {tuple(row) for row in rows}
+
+    def summary(self, algorithm: str, problem_name: str, parameter_set_name: str, run_id: int) -> Dict[str, Any] | None:
+        """The summary dict of one run, or None if it is not stored."""
+        row = self.connection.execute(
+            "SELECT summary FROM runs WHERE algorithm = ? AND problem_name = ? AND parameter_set_name = ? AND run_id = ?",
+            (algorithm, problem_name, parameter_set_name, run_id),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def run_objectives(self, algorithm: str, problem_name: str, parameter_set_name: str, run_id: int) -> np.ndarray | None:
+        """The (front_size, 2) float64 objectives of one run's final front, or None if it is not stored."""
+        row = self.connection.execute(
+            "SELECT objectives FROM runs WHERE algorithm = ? AND problem_name = ? AND parameter_set_name = ? AND run_id = ?",
+            (algorithm, problem_name, parameter_set_name, run_id),
+        ).fetchone()
+        return np.frombuffer(row[0], dtype=np.float64).reshape(-1, 2) if row else None
+
+    def front(self, problem_instance, algorithm: str, parameter_set_name: str, run_id: int) -> Population | None:
+        """The final front of one run as a Population (objectives, chromosomes, routes)."""
+        row = self.connection.execute(
+            "SELECT num_customers, objectives, chromosomes, route_counts, route_lengths FROM runs "
+            "WHERE algorithm = ? AND problem_name = ? AND parameter_set_name = ? AND run_id = ?",
+            (algorithm, problem_instance.name, parameter_set_name, run_id),
+        ).fetchone()
+        if row is None:
+            return None
+        num_customers, objectives, chromosomes, route_counts, route_lengths = row
+        pop = Population(problem_instance, np.frombuffer(chromosomes, dtype=np.int32).reshape(-1, num_customers))
+        pop.objectives[:] = np.frombuffer(objectives, dtype=np.float64).reshape(-1, 2)
+        pop.routes = unflatten_routes(
+            pop.chromosomes, np.frombuffer(route_counts, dtype=np.int32), np.frombuffer(route_lengths, dtype=np.int32)
+        )
+        return pop
+
+    def objectives(self) -> Iterator[Tuple[str, str, str, int, float, np.ndarray]]:
+        """Every run's (algorithm, problem, parameter set, run id, runtime, objectives) in one query.
+
+        objectives is the (front_size, 2) float64 array of the final front.
+        """
+        rows = self.connection.execute(
+            "SELECT algorithm, problem_name, parameter_set_name, run_id, wall_clock_time_sec, objectives "
+            "FROM runs ORDER BY problem_name, parameter_set_name, algorithm, run_id"
+        )
+        for algorithm, problem_name, parameter_set_name, run_id, runtime, objectives in rows:
+            yield algorithm, problem_name, parameter_set_name, run_id, runtime, np.frombuffer(objectives, dtype=np.float64).reshape(-1, 2)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def load_runs(path: str) -> List[Tuple[str, str, str, int, float, np.ndarray]]:
+    """All rows of ResultStore.objectives() for the store at `path`."""
+    with ResultStore(path) as store:
+        return list(store.objectives())
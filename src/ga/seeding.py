@@ -0,0 +1,49 @@
+"""Per-run random generators derived from one seed.
+
+Every GA entry point takes a `seed` (an int or a numpy SeedSequence). From it
+run_generators derives two independent streams: a random.Random that drives
+the scalar operators (initial chromosomes, tournaments, the mating-pool
+shuffle, scalar PMX/swap), and a numpy Generator that drives the batched
+crossover and mutation. A run given the same seed replays bit-for-bit,
+whichever process it runs in.
+
+Scalar operators take an `rng` argument that defaults to the `random` module
+itself (which has the same methods as random.Random), so existing callers
+keep using the global stream.
+"""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+Seed = int | np.random.SeedSequence
+
+
+def seed_sequence(seed: Seed) -> np.random.SeedSequence:
+    """A fresh SeedSequence for `seed` (ints become its entropy).
+
+    SeedSequence.spawn() advances the sequence it is called on, so spawning
+    from a fresh copy keeps the children a pure function of the seed.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key, pool_size=seed.pool_size)
+    return np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed: Seed, count: int) -> list[np.random.SeedSequence]:
+    """`count` independent child seeds of `seed`, the same every time."""
+    return seed_sequence(seed).spawn(count)
+
+
+def run_generators(seed: Seed) -> tuple[random.Random, np.random.Generator]:
+    """Independent (random.Random, numpy Generator) pair for one run."""
+    scalar_seq, batch_seq = spawn_seeds(seed, 2)
+    scalar_seed = int.from_bytes(scalar_seq.generate_state(4, np.uint32).tobytes(), "little")
+    return random.Random(scalar_seed), np.random.default_rng(batch_seq)
+
+
+def describe_seed(seed: Seed) -> dict:
+    """JSON-friendly record of a seed; SeedSequence(**describe_seed(s)) rebuilds it."""
+    seq = seed_sequence(seed)
+    return {"entropy": seq.entropy, "spawn_key": list(seq.spawn_key)}
@@ -3,10 +3,14 @@ from __future__ import annotations
 import random
 from typing import List
 
+import numpy as np
+
 from src.ga.individual import Individual
 
+# Every selection draws from rng, a random.Random (the global `random` module by default)
+
 
-def tournament_selection(population: List[Individual]) -> Individual:
+def tournament_selection(population: List[Individual], rng: random.Random = random) -> Individual:
     """Binary tournament selection based on (pareto_rank, crowding_distance).
 
     - Lower pareto_rank is better (rank 1 is best)
@@ -15,7 +19,7 @@ def tournament_selection(population: List[Individual]) -> Individual:
     if len(population) == 1:
         return population[0]
 
-    i1, i2 = random.sample(range(len(population)), k=2)
+    i1, i2 = rng.sample(range(len(population)), k=2)
     a = population[i1]
     b = population[i2]
 
@@ -27,7 +31,7 @@ def tournament_selection(population: List[Individual]) -> Individual:
     return a if a.crowding_distance >= b.crowding_distance else b
 
 
-def spea2_tournament_selection(archive: List[Individual]) -> Individual:
+def spea2_tournament_selection(archive: List[Individual], rng: random.Random = random) -> Individual:
     """
     Binary tournament selection for SPEA2.
     The winner is the individual with the lower spea2_fitness score.
@@ -39,10 +43,48 @@ def spea2_tournament_selection(archive: List[Individual]) -> Individual:
     if len(archive) < 2:
         return archive[0]
 
-    i1, i2 = random.sample(range(len(archive)), k=2)
+    i1, i2 = rng.sample(range(len(archive)), k=2)
     a = archive[i1]
     b = archive[i2]
 
     return a if a.spea2_fitness <= b.spea2_fitness else b
 
 
+
+def tournament_selection_indices(pareto_rank: np.ndarray, crowding_distance: np.ndarray, count: int,
+                                 rng: random.Random = random) -> List[int]:
+    """tournament_selection on a Population's rank and crowding arrays.
+
+    Runs `count` tournaments (same random draws as calling tournament_selection
+    `count` times) and returns the winning row indices.
+    """
+    size = len(pareto_rank)
+    if size == 1:
+        return [0] * count
+    ranks = pareto_rank.tolist()
+    crowding = crowding_distance.tolist()
+    winners: List[int] = []
+    for _ in range(count):
+        i1, i2 = rng.sample(range(size), k=2)
+        if ranks[i1] < ranks[i2]:
+            winners.append(i1)
+        elif ranks[i2] < ranks[i1]:
+            winners.append(i2)
+        else:
+            winners.append(i1 if crowding[i1] >= crowding[i2] else i2)
+    return winners
+
+
+def spea2_tournament_selection_indices(spea2_fitness: np.ndarray, count: int, rng: random.Random = random) -> List[int]:
+    """spea2_tournament_selection on an archive's fitness array; returns winning row indices."""
+    size = len(spea2_fitness)
+    if size == 0:
+        raise ValueError("Cannot perform tournament selection on an empty archive.")
+    if size < 2:
+        return [0] * count
+    fitness = spea2_fitness.tolist()
+    winners: List[int] = []
+    for _ in range(count):
+        i1, i2 = rng.sample(range(size), k=2)
+        winners.append(i1 if fitness[i1] <= fitness[i2] else i2)
+    return winners
@@ -1,88 +1,75 @@
 import math
 from typing import List
 import numpy as np
+from src.ga import kernels
 from src.ga.individual import Individual
 
-def _calculate_strength(combined_pop: List[Individual]) -> List[int]:
+def _dominance_matrix(objectives: np.ndarray) -> np.ndarray:
+    """
+    Boolean (N, N) matrix with [i, j] True when individual i dominates individual j:
+    at least as good on all objectives and strictly better on at least one.
+    """
+    left = objectives[:, np.newaxis, :]
+    right = objectives[np.newaxis, :, :]
+    return np.all(left <= right, axis=-1) & np.any(left < right, axis=-1)
+
+def _calculate_strength(dominance: np.ndarray) -> np.ndarray:
     """
     Calculates the S(i) value (strength) for each individual.
     Strength is the number of individuals an individual dominates.
     """
-    strengths = [0] * len(combined_pop)
-    for i, ind_i in enumerate(combined_pop):
-        for j, ind_j in enumerate(combined_pop):
-            if i == j:
-                continue
-            
-            # Check for dominance: ind_i dominates ind_j if it's at least as good on all objectives
-            # and strictly better on at least one.
-            obj_i = np.array(ind_i.objectives)
-            obj_j = np.array(ind_j.objectives)
-            
-            if np.all(obj_i <= obj_j) and np.any(obj_i < obj_j):
-                strengths[i] += 1
-    return strengths
-
-def _calculate_raw_fitness(combined_pop: List[Individual], strengths: List[int]) -> List[float]:
+    return dominance.sum(axis=1)
+
+def _calculate_raw_fitness(dominance: np.ndarray, strengths: np.ndarray) -> np.ndarray:
     """
     Calculates the R(i) value (raw fitness) for each individual.
     Raw fitness is the sum of the strengths of an individual's dominators.
     """
-    raw_fitness_values = [0.0] * len(combined_pop)
-    for i, ind_i in enumerate(combined_pop):
-        dominators_strength_sum = 0
-        for j, ind_j in enumerate(combined_pop):
-            if i == j:
-                continue
+    # Column i of the dominance matrix marks the dominators of i
+    return strengths @ dominance
 
-            obj_i = np.array(ind_i.objectives)
-            obj_j = np.array(ind_j.objectives)
-
-            # ind_j dominates ind_i
-            if np.all(obj_j <= obj_i) and np.any(obj_j < obj_i):
-                dominators_strength_sum += strengths[j]
-        
-        raw_fitness_values[i] = dominators_strength_sum
-    return raw_fitness_values
-
-def _calculate_density(combined_pop: List[Individual]) -> List[float]:
+def _calculate_density(objectives: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
     Calculates the D(i) value (density) for each individual.
-    Density is based on the k-th nearest neighbor distance.
+    Density is based on the k-th nearest neighbor distance; returns
+    (densities, kth_distances).
     """
-    num_individuals = len(combined_pop)
+    num_individuals = len(objectives)
     if num_individuals <= 1:
-        if num_individuals == 1:
-             combined_pop[0].kth_distance = float('inf')
-        return [0.0] * num_individuals
+        return np.zeros(num_individuals), np.full(num_individuals, np.inf)
 
     k = int(math.sqrt(num_individuals))
     # k must be less than the number of individuals to find a k-th neighbor
     k = min(k, num_individuals - 1)
 
-    objectives = np.array([ind.objectives for ind in combined_pop])
-    
     # --- OPTIMIZED DISTANCE CALCULATION ---
     # Use broadcasting to compute all-pairs Euclidean distances in a vectorized manner
     diff = objectives[:, np.newaxis, :] - objectives[np.newaxis, :, :]
     distances = np.sqrt(np.sum(diff**2, axis=-1))
 
-    densities = []
-    for i in range(num_individuals):
-        # Sort distances to find the k-th nearest neighbor
-        sorted_distances = np.sort(distances[i])
-        
-        # The k-th neighbor is at index k since the list includes the distance to self (0)
-        kth_distance = sorted_distances[k]
-        
-        # Density D(i) = 1 / (sigma_k + 2)
-        density = 1.0 / (kth_distance + 2.0)
-        densities.append(density)
-        
-        # Store for potential use in archive truncation
-        combined_pop[i].kth_distance = kth_distance
-        
-    return densities
+    # The k-th neighbour is at index k since each row includes the distance to self (0);
+    # np.partition places it there without fully sorting the row
+    kth_distances = np.partition(distances, k, axis=1)[:, k]
+
+    # Density D(i) = 1 / (sigma_k + 2)
+    densities = 1.0 / (kth_distances + 2.0)
+    return densities, kth_distances
+
+def spea2_fitness_values(objectives: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    SPEA2 fitness R(i) + D(i) for every row of an (N, 2) objective array.
+    Returns (fitness, kth_distances); the k-th neighbour distances are kept
+    for archive truncation.
+    """
+    if kernels.is_enabled():
+        kernels.warm_up()
+        _, raw_fitness = kernels.strength_and_raw_fitness(objectives)
+    else:
+        dominance = _dominance_matrix(objectives)
+        strengths = _calculate_strength(dominance)
+        raw_fitness = _calculate_raw_fitness(dominance, strengths)
+    densities, kth_distances = _calculate_density(objectives)
+    return raw_fitness + densities, kth_distances
 
 def calculate_spea2_fitness(population: List[Individual], archive: List[Individual]):
     """
@@ -98,11 +85,84 @@ def calculate_spea2_fitness(population: List[Individual], archive: List[Individu
     if not population and not archive:
         return
 
-    combined_pop = population + archive
-    
-    strengths = _calculate_strength(combined_pop)
-    raw_fitness_values = _calculate_raw_fitness(combined_pop, strengths)
-    densities = _calculate_density(combined_pop)
-    
-    for i, individual in enumerate(combined_pop):
-        individual.spea2_fitness = raw_fitness_values[i] + densities[i]
+    combined_pop = list(population) + list(archive)
+    objectives = np.array([ind.objectives for ind in combined_pop], dtype=np.float64)
+    fitness, kth_distances = spea2_fitness_values(objectives)
+
+    for individual, value, kth_distance in zip(combined_pop, fitness.tolist(), kth_distances.tolist()):
+        individual.spea2_fitness = value
+        individual.kth_distance = kth_distance
+
+def truncate_archive(archive: List[Individual], archive_size: int) -> List[Individual]:
+    """
+    SPEA2 archive truncation operator on a list of Individuals (see truncation_survivors).
+    """
+    if len(archive) <= archive_size:
+        return list(archive)
+    objectives = np.array([ind.objectives for ind in archive], dtype=np.float64)
+    survivors = truncation_survivors(objectives, archive_size)
+    return [ind for ind, keep in zip(archive, survivors.tolist()) if keep]
+
+def truncation_survivors(objectives: np.ndarray, archive_size: int) -> np.ndarray:
+    """
+    SPEA2 archive truncation on an (N, 2) objective array; returns a boolean
+    mask of the rows that stay in the archive.
+
+    Repeatedly removes the individual with the smallest distance (in objective
+    space) to its nearest remaining neighbour; ties are broken by the second
+    nearest, third nearest, and so on. Every row of the distance matrix is
+    argsorted once and each individual keeps a pointer to its nearest alive
+    neighbour, so a removal only advances the pointers of the rows that were
+    pointing at the removed individual instead of recomputing all pairs.
+    """
+    num_individuals = len(objectives)
+    if num_individuals <= archive_size:
+        return np.ones(num_individuals, dtype=bool)
+    if archive_size <= 0:
+        return np.zeros(num_individuals, dtype=bool)
+
+    diff = objectives[:, np.newaxis, :] - objectives[np.newaxis, :, :]
+    distances = np.nan_to_num(np.sqrt(np.sum(diff**2, axis=-1)), nan=np.inf)
+    # Self sorts first (-1 < any distance) and is dropped; neighbours[i] lists the
+    # others by increasing distance to i
+    np.fill_diagonal(distances, -1.0)
+    neighbours = np.argsort(distances, axis=1, kind="stable")[:, 1:]
+    last = num_individuals - 2  # last valid column of neighbours
+
+    rows = np.arange(num_individuals)
+    alive = np.ones(num_individuals, dtype=bool)
+    pointer = np.zeros(num_individuals, dtype=np.int64)
+    nearest = distances[rows, neighbours[:, 0]]
+
+    for _ in range(num_individuals - archive_size):
+        tied = np.flatnonzero(alive & (nearest == nearest[alive].min()))
+        victim = int(tied[0]) if len(tied) == 1 else _lexicographic_nearest(tied, distances, neighbours, alive)
+        alive[victim] = False
+
+        # Only rows whose nearest alive neighbour was the victim need to move on
+        stale = np.flatnonzero(alive & (neighbours[rows, pointer] == victim))
+        for i in stale.tolist():
+            row = neighbours[i]
+            p = pointer[i] + 1
+            while p <= last and not alive[row[p]]:
+                p += 1
+            if p <= last:
+                pointer[i] = p
+                nearest[i] = distances[i, row[p]]
+            else:
+                nearest[i] = np.inf
+
+    return alive
+
+def _lexicographic_nearest(tied: np.ndarray, distances: np.ndarray, neighbours: np.ndarray, alive: np.ndarray) -> int:
+    """Among tied individuals, the one whose sorted alive-neighbour distances are lexicographically smallest."""
+    sorted_alive = np.stack([distances[i, neighbours[i][alive[neighbours[i]]]] for i in tied])
+    candidates = tied
+    for col in range(sorted_alive.shape[1]):
+        column = sorted_alive[:, col]
+        keep = column == column.min()
+        candidates = candidates[keep]
+        sorted_alive = sorted_alive[keep]
+        if len(candidates) == 1:
+            break
+    return int(candidates[0])
@@ -0,0 +1,147 @@
+"""Per-generation convergence telemetry of a GA run.
+
+A run's telemetry file starts with one JSON header line (format version,
+record layout, problem name and the fixed hypervolume reference point) and is
+followed by fixed-size binary records, one per generation, laid out as
+TELEMETRY_DTYPE. Records are buffered in memory and appended in batches, so
+recording costs a few array writes per generation.
+
+Each record holds the generation, evaluations so far, wall time since the
+start of the run, best and mean of both objectives over the population, the
+first front's size and hypervolume, the number of distinct chromosomes and the
+wall time spent in each phase of that generation (selection, variation,
+evaluation, survival).
+
+The hypervolume reference point is taken from the first recorded population
+(1.1 x its worst objectives) and kept for the whole run, including after a
+resume, so values are comparable across generations.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+
+from src.ga.indicators import hypervolume
+
+TELEMETRY_VERSION = 1
+PHASES = ("selection", "variation", "evaluation", "survival")
+TELEMETRY_DTYPE = np.dtype([
+    ("generation", "<i4"),
+    ("front_size", "<i4"),
+    ("unique_chromosomes", "<i4"),
+    ("evaluations", "<i8"),
+    ("elapsed", "<f8"),
+    ("best_total_distance", "<f8"),
+    ("best_longest_route", "<f8"),
+    ("mean_total_distance", "<f8"),
+    ("mean_longest_route", "<f8"),
+    ("hypervolume", "<f8"),
+] + [(f"time_{phase}", "<f8") for phase in PHASES])
+
+
+def count_distinct_rows(chromosomes: np.ndarray) -> int:
+    """Number of distinct rows of a (P, n) chromosome array."""
+    # Each row viewed as one opaque value: a 1-D unique, far cheaper than np.unique(axis=0)
+    rows = np.ascontiguousarray(chromosomes)
+    return len(np.unique(rows.view(np.dtype((np.void, rows.shape[1] * rows.itemsize))).ravel()))
+
+
+def _read_header(f) -> tuple[dict, int]:
+    # The header line and the byte offset where the records start
+    line = f.readline()
+    return json.loads(line), len(line)
+
+
+def load_telemetry(path: str) -> tuple[np.ndarray, dict]:
+    """(records, header) of a telemetry file; records is a TELEMETRY_DTYPE array.
+
+    A trailing partial record (from a run killed mid-write) is ignored.
+    """
+    with open(path, "rb") as f:
+        header, _ = _read_header(f)
+        data = f.read()
+    usable = len(data) - len(data) % TELEMETRY_DTYPE.itemsize
+    return np.frombuffer(data[:usable], dtype=TELEMETRY_DTYPE), header
+
+
+class RunTelemetry:
+    """Buffered writer of one run's telemetry file.
+
+    `first_generation` is the generation the run starts at: a resumed run
+    passes the generation after its checkpoint, which reuses the existing
+    file's reference point and drops records from generations that will be
+    run again.
+    """
+
+    def __init__(self, path: str, problem_name: str, first_generation: int = 0, buffer_size: int = 64):
+        self.path = path
+        self.problem_name = problem_name
+        self.buffer = np.zeros(buffer_size, dtype=TELEMETRY_DTYPE)
+        self.buffered = 0
+        self.ref_point: np.ndarray | None = None
+        if first_generation > 0 and os.path.exists(path):
+            self._resume(first_generation)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def _resume(self, first_generation: int) -> None:
+        records, header = load_telemetry(self.path)
+        self.ref_point = np.array(header["ref_point"])
+        with open(self.path, "rb") as f:
+            _, offset = _read_header(f)
+        keep = int(np.count_nonzero(records["generation"] < first_generation))
+        with open(self.path, "r+b") as f:
+            f.truncate(offset + keep * TELEMETRY_DTYPE.itemsize)
+
+    def _write_header(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        header = {
+            "version": TELEMETRY_VERSION,
+            "problem_name": self.problem_name,
+            "ref_point": self.ref_point.tolist(),
+            "dtype": [[name, TELEMETRY_DTYPE[name].str] for name in TELEMETRY_DTYPE.names],
+        }
+        with open(self.path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+
+    def record(
+        self,
+        generation: int,
+        evaluations: int,
+        elapsed: float,
+        objectives: np.ndarray,
+        front_objectives: np.ndarray,
+        chromosomes: np.ndarray,
+        phase_times: dict[str, float]
+    ) -> None:
+        """Buffers the record of one finished generation (0-based)."""
+        if self.ref_point is None:
+            self.ref_point = objectives.max(axis=0) * 1.1
+            self._write_header()
+        row = self.buffer[self.buffered]
+        row["generation"] = generation
+        row["front_size"] = len(front_objectives)
+        row["unique_chromosomes"] = count_distinct_rows(chromosomes)
+        row["evaluations"] = evaluations
+        row["elapsed"] = elapsed
+        row["best_total_distance"], row["best_longest_route"] = objectives.min(axis=0)
+        row["mean_total_distance"], row["mean_longest_route"] = objectives.mean(axis=0)
+        row["hypervolume"] = hypervolume(front_objectives, self.ref_point)
+        for phase in PHASES:
+            row[f"time_{phase}"] = phase_times.get(phase, 0.0)
+        self.buffered += 1
+        if self.buffered == len(self.buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the buffered records to the file."""
+        if self.buffered == 0:
+            return
+        with open(self.path, "ab") as f:
+            f.write(self.buffer[:self.buffered].tobytes())
+        self.buffered = 0
+
+    def close(self) -> None:
+        self.flush()
@@ -1,10 +1,11 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
-import pandas as pd
 import argparse
 import os
 
+from src.ga.result_store import ResultStore
+
 # Plots the VRP scenario and routes
 class Plotter:
     def __init__(self, title="VRP Visualizer"):
@@ -115,22 +116,22 @@ class Plotter:
         
         self.show()
 
-def plot_pareto_front(csv_file_path):
+def plot_pareto_front(store_file, algorithm, problem_name, param_set_name, run_id):
     """
-    Plots the Pareto front from a final_pareto_front.csv file.
+    Plots the final Pareto front of one run stored in a results.sqlite file.
     """
-    if not os.path.exists(csv_file_path):
-        print(f"Error: File not found at {csv_file_path}")
+    if not os.path.exists(store_file):
+        print(f"Error: File not found at {store_file}")
         return
 
-    df = pd.read_csv(csv_file_path)
-
-    if "total_distance" not in df.columns or "max_route_length" not in df.columns:
-        print("Error: CSV file must contain 'total_distance' and 'max_route_length' columns.")
+    with ResultStore(store_file) as store:
+        objectives = store.run_objectives(algorithm, problem_name, param_set_name, run_id)
+    if objectives is None:
+        print(f"Error: No {algorithm} run {run_id} for {problem_name} ({param_set_name}) in {store_file}.")
         return
 
     fig, ax = plt.subplots()
-    ax.scatter(df["total_distance"], df["max_route_length"], c='blue', marker='o', label='Solutions')
+    ax.scatter(objectives[:, 0], objectives[:, 1], c='blue', marker='o', label='Solutions')
 
     ax.set_title("Pareto Front")
     ax.set_xlabel("Total Distance")
@@ -142,8 +143,12 @@ def plot_pareto_front(csv_file_path):
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description="Plot a Pareto front from a results file.")
-    parser.add_argument("csv_file", help="Path to the final_pareto_front.csv file.")
+    parser = argparse.ArgumentParser(description="Plot a Pareto front from a results store.")
+    parser.add_argument("store_file", help="Path to the campaign's results.sqlite file.")
+    parser.add_argument("algorithm", help="Algorithm name as stored, e.g. NSGA-II or SPEA2.")
+    parser.add_argument("problem", help="Problem name, e.g. A-n33-k6.")
+    parser.add_argument("param_set", help="Parameter set name, e.g. Baseline.")
+    parser.add_argument("run_id", type=int, help="Run index.")
     args = parser.parse_args()
     
-    plot_pareto_front(args.csv_file)
\ No newline at end of file
+    plot_pareto_front(args.store_file, args.algorithm, args.problem, args.param_set, args.run_id)
@@ -0,0 +1,150 @@
+"""Distance providers: how a ProblemInstance answers distance queries.
+
+- DenseDistances keeps the full (n+1, n+1) matrix, computed in one broadcast
+  pass. Lookups are plain indexing; memory is O(n^2).
+- CoordinateDistances keeps only the (n+1, 2) coordinates and computes
+  distances when asked, plus a sparse cache holding the distance from every
+  location to its k nearest customers (the edges good routes mostly use).
+  Memory is O(n k), so instances with tens of thousands of customers fit in
+  every worker.
+
+Both compute sqrt(dx * dx + dy * dy) in float64 and then round to the
+instance's distance dtype, so they return identical values for any pair.
+Callers gather with pairs(a, b) (NumPy index arrays, broadcast like fancy
+indexing) or get(i, j) for a single pair.
+
+With `rounded` set, distances are TSPLIB EUC_2D integers, nint(sqrt(...))
+(i.e. floor(d + 0.5)), stored as int32. `integer` is then True and pairs()
+returns int64, so the split DP accumulates route costs in integers.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+DISTANCE_MODES = ("auto", "dense", "on_demand")
+# Above this many customers "auto" stops materialising the dense matrix
+DENSE_MAX_CUSTOMERS = 3000
+
+
+def _nint(distances):
+    # TSPLIB's nint: round half up
+    return np.floor(distances + 0.5)
+
+
+def dense_matrix(coordinates: np.ndarray, dtype=np.float64, rounded: bool = False) -> np.ndarray:
+    """All pairwise Euclidean distances of an (n+1, 2) coordinate array (int32 if rounded)."""
+    x = coordinates[:, 0]
+    y = coordinates[:, 1]
+    dx = x[:, np.newaxis] - x[np.newaxis, :]
+    dy = y[:, np.newaxis] - y[np.newaxis, :]
+    matrix = np.sqrt(dx * dx + dy * dy)
+    if rounded:
+        return np.ascontiguousarray(_nint(matrix), dtype=np.int32)
+    return np.ascontiguousarray(matrix, dtype=dtype)
+
+
+class DenseDistances:
+    """Provider backed by a precomputed distance matrix."""
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+        self.dtype = matrix.dtype
+        self.integer = matrix.dtype.kind in "iu"
+        self.cost_dtype = np.dtype(np.int64 if self.integer else np.float64)
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+    def pairs(self, origins, destinations) -> np.ndarray:
+        """Distances (cost_dtype) of the broadcast (origin, destination) index pairs."""
+        return self.matrix[origins, destinations].astype(self.cost_dtype)
+
+    def get(self, i: int, j: int) -> float:
+        if self.integer:
+            return int(self.matrix[i, j])
+        return float(self.matrix[i, j])
+
+
+class CoordinateDistances:
+    """Provider computing distances from coordinates, with a sparse k-NN cache.
+
+    `matrix` is None: there is no dense matrix to hand out. cache_neighbours()
+    stores the distances along a neighbour index (see
+    ProblemInstance.nearest_neighbours) as `neighbour_distances`, aligned
+    with it, for operators that price candidate edges; every other query is
+    computed, which for a single pair is as cheap as any lookup.
+    """
+
+    matrix = None
+
+    def __init__(self, coordinates: np.ndarray, dtype=np.float64, rounded: bool = False):
+        self.coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        self.integer = rounded
+        self.dtype = np.dtype(np.int32 if rounded else dtype)
+        self.cost_dtype = np.dtype(np.int64 if rounded else np.float64)
+        self._points = self.coordinates.tolist()
+        self.neighbour_index: np.ndarray | None = None
+        self.neighbour_distances: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self.coordinates.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        cached = 0 if self.neighbour_distances is None else self.neighbour_distances.nbytes + self.neighbour_index.nbytes
+        return self.coordinates.nbytes + cached
+
+    def _round(self, distances: np.ndarray) -> np.ndarray:
+        # Same values a dense matrix of this dtype would hold, as cost_dtype
+        if self.integer:
+            return _nint(distances).astype(np.int64)
+        if self.dtype == np.float64:
+            return distances
+        return distances.astype(self.dtype).astype(np.float64)
+
+    def pairs(self, origins, destinations) -> np.ndarray:
+        """Distances (cost_dtype) of the broadcast (origin, destination) index pairs."""
+        a = self.coordinates[origins]
+        b = self.coordinates[destinations]
+        dx = a[..., 0] - b[..., 0]
+        dy = a[..., 1] - b[..., 1]
+        return self._round(np.sqrt(dx * dx + dy * dy))
+
+    def cache_neighbours(self, neighbour_index: np.ndarray) -> None:
+        """Caches the distance from each location to the customers in its row of neighbour_index."""
+        rows = np.arange(len(self))[:, np.newaxis]
+        self.neighbour_index = neighbour_index
+        self.neighbour_distances = self.pairs(rows, neighbour_index)
+
+    def get(self, i: int, j: int) -> float:
+        (xi, yi), (xj, yj) = self._points[i], self._points[j]
+        dx = xi - xj
+        dy = yi - yj
+        distance = math.sqrt(dx * dx + dy * dy)
+        if self.integer:
+            return math.floor(distance + 0.5)
+        if self.dtype != np.float64:
+            distance = float(self.dtype.type(distance))
+        return distance
+
+
+def make_distances(
+    coordinates: np.ndarray,
+    dtype=np.float64,
+    mode: str = "auto",
+    rounded: bool = False
+) -> DenseDistances | CoordinateDistances:
+    """The provider for `mode`; "auto" is dense up to DENSE_MAX_CUSTOMERS customers."""
+    if mode not in DISTANCE_MODES:
+        raise ValueError(f"Unknown distance mode '{mode}', expected one of {list(DISTANCE_MODES)}.")
+    if mode == "auto":
+        mode = "dense" if len(coordinates) - 1 <= DENSE_MAX_CUSTOMERS else "on_demand"
+    if mode == "dense":
+        return DenseDistances(dense_matrix(coordinates, dtype, rounded))
+    return CoordinateDistances(coordinates, dtype, rounded)
@@ -1,70 +1,273 @@
+"""CVRPLIB/TSPLIB instance loading.
+
+load_problem_instance reads an instance file line by line: header lines
+(`KEY : value`) are collected until a `*_SECTION` keyword switches to reading
+that section's data. Understood keywords:
+  - NAME, DIMENSION, CAPACITY, VEHICLES, EDGE_WEIGHT_TYPE (EUC_2D or
+    EXPLICIT), EDGE_WEIGHT_FORMAT (FULL_MATRIX and the row/column triangle
+    formats, for EXPLICIT weights);
+  - NODE_COORD_SECTION, DEMAND_SECTION, DEPOT_SECTION, EDGE_WEIGHT_SECTION,
+    DISPLAY_DATA_SECTION (coordinates of EXPLICIT instances, for plots).
+The depot is the node listed in DEPOT_SECTION (node 1 if there is none) and
+the fleet size is VEHICLES, else the `-k<number>` in the name, else the
+fewest vehicles whose capacity covers the total demand.
+
+Distances follow the header. EUC_2D distances are TSPLIB's rounded integers,
+nint(sqrt(dx^2 + dy^2)), as used by the published CVRPLIB optima, so
+objectives are comparable with them; they are stored as an int32 matrix and
+summed as integers (pass round_euc_2d=False for exact Euclidean distances).
+EXPLICIT weights that are all integers are kept as int32 as well.
+
+The parsed instance is cached next to the source file: its header values,
+coordinates and demands in an .npz file (data/X-n101-k25.npz for
+data/X-n101-k25.txt) and its distance matrix, when the instance gets a dense
+one, in an .npy file (data/X-n101-k25.distances.npy) that later loads
+memory-map. Later loads read the cache instead of parsing, as long as the
+source file's size and modification time are unchanged, so they take
+milliseconds whatever the instance size.
+"""
+from __future__ import annotations
+
+import os
 import re
+
+import numpy as np
+
+from src.vrp.distances import DENSE_MAX_CUSTOMERS, dense_matrix
 from src.vrp.problem import ProblemInstance
 
-def load_problem_instance(file_path):
-    with open(file_path, 'r') as f:
-        content = f.read()
+CACHE_VERSION = 2
+EDGE_WEIGHT_TYPES = ("EUC_2D", "EXPLICIT")
+# Entries of each explicit format, as (rows, columns) of the full matrix in
+# file order. Column-wise triangles list the same entries as the opposite
+# row-wise triangle, which is all a symmetric matrix needs.
+_TRIANGLES = {
+    "UPPER_ROW": (np.triu_indices, 1),
+    "LOWER_ROW": (np.tril_indices, -1),
+    "UPPER_DIAG_ROW": (np.triu_indices, 0),
+    "LOWER_DIAG_ROW": (np.tril_indices, 0),
+    "UPPER_COL": (np.tril_indices, -1),
+    "LOWER_COL": (np.triu_indices, 1),
+    "UPPER_DIAG_COL": (np.tril_indices, 0),
+    "LOWER_DIAG_COL": (np.triu_indices, 0),
+}
+
+
+def cache_path(file_path: str) -> str:
+    """The .npz cache of an instance file."""
+    return os.path.splitext(file_path)[0] + ".npz"
+
+
+def matrix_cache_path(file_path: str) -> str:
+    """The .npy cache of an instance file's distance matrix."""
+    return os.path.splitext(file_path)[0] + ".distances.npy"
+
+
+def _parse(file_path: str) -> dict:
+    # Header values plus the raw rows of every section, in one pass over the file
+    header: dict[str, str] = {}
+    nodes: dict[str, list[list[str]]] = {"NODE_COORD_SECTION": [], "DEMAND_SECTION": [], "DISPLAY_DATA_SECTION": []}
+    depots: list[int] = []
+    weights: list[str] = []
+    section = None
+    with open(file_path, "r") as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            if tokens[0][0].isalpha():
+                keyword, colon, value = line.partition(":")
+                keyword = keyword.strip().upper()
+                if colon:
+                    header[keyword] = value.strip().strip('"').strip()
+                    section = None
+                elif keyword == "EOF":
+                    break
+                else:
+                    section = keyword
+                continue
+            if section in nodes:
+                nodes[section].append(tokens)
+            elif section == "DEPOT_SECTION":
+                depots.extend(int(token) for token in tokens if int(token) >= 0)
+            elif section == "EDGE_WEIGHT_SECTION":
+                weights.extend(tokens)
+    return {"header": header, "nodes": nodes, "depots": depots, "weights": weights}
+
+
+def _node_table(rows: list[list[str]], columns: int, dtype) -> tuple[np.ndarray, np.ndarray]:
+    # (node ids, values) of a section whose rows are "id value..."
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, columns), dtype=dtype)
+    table = np.array([row[:columns + 1] for row in rows], dtype=np.float64)
+    return table[:, 0].astype(np.int64), table[:, 1:].astype(dtype)
+
+
+def _explicit_matrix(weights: list[str], dimension: int, edge_format: str) -> np.ndarray:
+    # Full symmetric matrix of an EDGE_WEIGHT_SECTION
+    values = np.array(weights, dtype=np.float64)
+    if edge_format == "FULL_MATRIX":
+        if values.size != dimension * dimension:
+            raise ValueError(f"EDGE_WEIGHT_SECTION has {values.size} values, expected {dimension * dimension}.")
+        return values.reshape(dimension, dimension)
+    if edge_format not in _TRIANGLES:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT '{edge_format}'.")
+    indices, offset = _TRIANGLES[edge_format]
+    rows, columns = indices(dimension, offset)
+    if values.size != rows.size:
+        raise ValueError(f"EDGE_WEIGHT_SECTION has {values.size} values, expected {rows.size}.")
+    matrix = np.zeros((dimension, dimension))
+    matrix[rows, columns] = values
+    matrix[columns, rows] = values
+    return matrix
 
-    name_match = re.search(r"NAME\s*:\s*(.*)", content)
-    if not name_match:
-        raise ValueError("Could not parse NAME from file.")
-    name = name_match.group(1).strip()
 
-    num_vehicles_match = re.search(r"k(\d+)", name)
-    if not num_vehicles_match:
-        raise ValueError("Could not parse number of vehicles from NAME.")
-    num_vehicles = int(num_vehicles_match.group(1))
+def _fleet_size(header: dict, name: str, demands: np.ndarray, capacity: int) -> int:
+    if "VEHICLES" in header:
+        return int(header["VEHICLES"])
+    name_match = re.search(r"-k(\d+)", name) or re.search(r"k(\d+)", name)
+    if name_match:
+        return int(name_match.group(1))
+    return max(1, -(-int(demands.sum()) // capacity))
 
-    capacity_match = re.search(r"CAPACITY\s*:\s*(\d+)", content)
-    if not capacity_match:
+
+def _instance_arrays(parsed: dict, round_euc_2d: bool = True) -> dict:
+    # Instance data with the depot in row 0 and the customers after it by id
+    header = parsed["header"]
+    if "NAME" not in header:
+        raise ValueError("Could not parse NAME from file.")
+    if "CAPACITY" not in header:
         raise ValueError("Could not parse CAPACITY from file.")
-    capacity = int(capacity_match.group(1))
-    
-    node_coord_match = re.search(r"NODE_COORD_SECTION\s*\n([\s\S]*?)\n\s*DEMAND_SECTION", content)
-    if not node_coord_match:
-        raise ValueError("Could not find NODE_COORD_SECTION.")
-    node_coord_section = node_coord_match.group(1)
+    name = header["NAME"]
+    capacity = int(header["CAPACITY"])
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    if edge_weight_type not in EDGE_WEIGHT_TYPES:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE '{edge_weight_type}', expected one of {list(EDGE_WEIGHT_TYPES)}.")
 
-    demand_match = re.search(r"DEMAND_SECTION\s*\n([\s\S]*?)\n\s*DEPOT_SECTION", content)
-    if not demand_match:
+    demand_ids, demand_values = _node_table(parsed["nodes"]["DEMAND_SECTION"], 1, np.int64)
+    if demand_ids.size == 0:
         raise ValueError("Could not find DEMAND_SECTION.")
-    demand_section = demand_match.group(1)
-
-    locations = {}
-    for line in node_coord_section.strip().split('\n'):
-        parts = line.strip().split()
-        node_id = int(parts[0])
-        x = float(parts[1])
-        y = float(parts[2])
-        locations[node_id] = (x, y)
-
-    demands = {}
-    for line in demand_section.strip().split('\n'):
-        parts = line.strip().split()
-        node_id = int(parts[0])
-        demand = int(parts[1])
-        demands[node_id] = demand
-
-    depot_id = 1 # based on file format
-    depot_coords = locations[depot_id]
-    
-    customers = []
-    customer_demands = []
-    customer_ids = sorted([key for key in locations.keys() if key != depot_id])
-
-    for c_id in customer_ids:
-        customers.append(locations[c_id])
-        customer_demands.append(demands[c_id])
-
-    scenario_data = {
+    coordinate_rows = parsed["nodes"]["NODE_COORD_SECTION"] or parsed["nodes"]["DISPLAY_DATA_SECTION"]
+    coordinate_ids, coordinate_values = _node_table(coordinate_rows, 2, np.float64)
+    if edge_weight_type == "EUC_2D" and coordinate_ids.size == 0:
+        raise ValueError("Could not find NODE_COORD_SECTION.")
+
+    node_ids = np.sort(demand_ids)
+    depot_id = parsed["depots"][0] if parsed["depots"] else 1
+    if depot_id not in node_ids:
+        raise ValueError(f"Depot {depot_id} is not a node of the instance.")
+    order = np.concatenate([[depot_id], node_ids[node_ids != depot_id]])
+    demands = np.zeros(order.size, dtype=np.int64)
+    demands[np.searchsorted(node_ids, demand_ids)] = demand_values[:, 0]
+    demands = demands[np.searchsorted(node_ids, order)]
+
+    coordinates = np.zeros((order.size, 2))
+    if coordinate_ids.size:
+        by_id = np.zeros((node_ids.size, 2))
+        by_id[np.searchsorted(node_ids, coordinate_ids)] = coordinate_values
+        coordinates = by_id[np.searchsorted(node_ids, order)]
+
+    distance_matrix = None
+    rounded = edge_weight_type == "EUC_2D" and round_euc_2d
+    if edge_weight_type == "EXPLICIT":
+        # Matrix rows follow node ids 1..DIMENSION
+        dimension = int(header.get("DIMENSION", node_ids.size))
+        full = _explicit_matrix(parsed["weights"], dimension, header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+        positions = order - 1
+        distance_matrix = np.ascontiguousarray(full[np.ix_(positions, positions)])
+        if np.array_equal(distance_matrix, np.round(distance_matrix)) and np.abs(distance_matrix).max() < 2 ** 31:
+            distance_matrix = distance_matrix.astype(np.int32)
+            rounded = True
+    elif order.size - 1 <= DENSE_MAX_CUSTOMERS:
+        distance_matrix = dense_matrix(coordinates, rounded=rounded)
+
+    return {
         "name": name,
-        "num_vehicles": num_vehicles,
-        "depot": depot_coords,
-        "customers": customers,
-        "customer_demands": customer_demands,
-        "num_customers": len(customers),
+        "num_vehicles": _fleet_size(header, name, demands[1:], capacity),
         "vehicle_capacity": capacity,
-        "fleet_utilization": sum(customer_demands) / (num_vehicles * capacity)
+        "edge_weight_type": edge_weight_type,
+        "coordinates": coordinates,
+        "customer_demands": demands[1:],
+        "distance_matrix": distance_matrix,
+        "rounded_distances": rounded,
     }
 
-    return ProblemInstance(scenario_data)
+
+def _source_stamp(file_path: str, round_euc_2d: bool) -> np.ndarray:
+    stat = os.stat(file_path)
+    return np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns, round_euc_2d], dtype=np.int64)
+
+
+def _read_cache(file_path: str, round_euc_2d: bool) -> dict | None:
+    # The cached arrays if the cache exists and matches the source file
+    path = cache_path(file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            if not np.array_equal(cache["stamp"], _source_stamp(file_path, round_euc_2d)):
+                return None
+            matrix = np.load(matrix_cache_path(file_path), mmap_mode="r") if cache["has_matrix"] else None
+            return {
+                "name": str(cache["name"]),
+                "num_vehicles": int(cache["num_vehicles"]),
+                "vehicle_capacity": int(cache["vehicle_capacity"]),
+                "edge_weight_type": str(cache["edge_weight_type"]),
+                "coordinates": cache["coordinates"],
+                "customer_demands": cache["customer_demands"],
+                "distance_matrix": matrix,
+                "rounded_distances": bool(cache["rounded_distances"]),
+            }
+    except (OSError, KeyError, ValueError):
+        return None  # unreadable or from another version: parse again
+
+
+def _write_cache(file_path: str, arrays: dict, round_euc_2d: bool) -> None:
+    path = cache_path(file_path)
+    matrix = arrays["distance_matrix"]
+    try:
+        # Written to temporary files first so a concurrent load never sees half a
+        # cache; the .npz goes last since it is what marks the cache as valid
+        if matrix is not None:
+            with open(matrix_cache_path(file_path) + ".tmp", "wb") as f:
+                np.save(f, matrix)
+            os.replace(matrix_cache_path(file_path) + ".tmp", matrix_cache_path(file_path))
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                stamp=_source_stamp(file_path, round_euc_2d),
+                name=np.array(arrays["name"]),
+                num_vehicles=np.array(arrays["num_vehicles"]),
+                vehicle_capacity=np.array(arrays["vehicle_capacity"]),
+                edge_weight_type=np.array(arrays["edge_weight_type"]),
+                coordinates=arrays["coordinates"],
+                customer_demands=arrays["customer_demands"],
+                has_matrix=np.array(matrix is not None),
+                rounded_distances=np.array(arrays["rounded_distances"]),
+            )
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # read-only data directory: simply parse every time
+
+
+def load_problem_instance(file_path: str, use_cache: bool = True, round_euc_2d: bool = True) -> ProblemInstance:
+    """Loads a CVRPLIB/TSPLIB instance, from its .npz cache when it is up to date.
+
+    round_euc_2d=False keeps exact (float64) EUC_2D distances instead of
+    TSPLIB's rounded integers.
+    """
+    arrays = _read_cache(file_path, round_euc_2d) if use_cache else None
+    if arrays is None:
+        arrays = _instance_arrays(_parse(file_path), round_euc_2d)
+        if use_cache:
+            _write_cache(file_path, arrays, round_euc_2d)
+    return ProblemInstance.from_arrays(
+        arrays["name"],
+        arrays["num_vehicles"],
+        arrays["vehicle_capacity"],
+        arrays["coordinates"],
+        arrays["customer_demands"],
+        arrays["distance_matrix"],
+        edge_weight_type=arrays["edge_weight_type"],
+        rounded_distances=arrays["rounded_distances"],
+    )
@@ -0,0 +1,112 @@
+"""k-nearest-neighbour index over the locations of a problem.
+
+Row i of the index lists the k customers (ids 1..n) closest to location i,
+closest first; row 0 is the depot's nearest customers and no row lists its
+own location. Rows are int32, so the index of a 10,000-customer instance
+with k = 10 takes 400 KB.
+
+Three builders give the same neighbours (up to ties at the k-th distance):
+  - "matrix": argpartition over blocks of rows of the distance matrix,
+    used for moderate n when the matrix is already there;
+  - "kdtree": one scipy cKDTree query over the coordinates, used for large
+    n when scipy is installed;
+  - "brute": argpartition over blocks of squared distances computed from
+    the coordinates, the fallback without scipy. Memory stays O(block * n).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:  # scipy is optional
+    SCIPY_AVAILABLE = False
+
+NEIGHBOUR_METHODS = ("auto", "matrix", "kdtree", "brute")
+# Above this many customers "auto" prefers the KD-tree over the distance matrix
+KD_TREE_MIN_SIZE = 2000
+# Rows of distances handled at once by the argpartition builders
+_BLOCK_ROWS = 512
+
+
+def _rank_rows(distances: np.ndarray, rows: np.ndarray, k: int) -> np.ndarray:
+    # k nearest customer ids of each row of a (block, n + 1) distance block, closest first
+    distances[np.arange(len(rows)), rows] = np.inf  # never a location's own neighbour
+    distances[:, 0] = np.inf                       # the depot is not a customer
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+    # Closest first, ties by id, so every builder orders its rows the same way
+    order = np.lexsort((nearest, nearest_distances), axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def _from_matrix(distance_matrix: np.ndarray, k: int) -> np.ndarray:
+    size = distance_matrix.shape[0]
+    index = np.empty((size, k), dtype=np.int32)
+    for first in range(0, size, _BLOCK_ROWS):
+        rows = np.arange(first, min(first + _BLOCK_ROWS, size))
+        index[rows] = _rank_rows(np.array(distance_matrix[rows], dtype=np.float64), rows, k)
+    return index
+
+
+def _from_coordinates(coordinates: np.ndarray, k: int) -> np.ndarray:
+    size = coordinates.shape[0]
+    index = np.empty((size, k), dtype=np.int32)
+    squared_norms = np.einsum("ij,ij->i", coordinates, coordinates)
+    for first in range(0, size, _BLOCK_ROWS):
+        rows = np.arange(first, min(first + _BLOCK_ROWS, size))
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b; the ranking only needs squared distances
+        squared = squared_norms[rows, np.newaxis] + squared_norms[np.newaxis, :] - 2.0 * coordinates[rows] @ coordinates.T
+        index[rows] = _rank_rows(squared, rows, k)
+    return index
+
+
+def _from_kdtree(coordinates: np.ndarray, k: int) -> np.ndarray:
+    size = coordinates.shape[0]
+    customers = coordinates[1:]
+    # One extra neighbour covers a customer finding itself
+    distances, nearest = cKDTree(customers).query(coordinates, k=min(k + 1, len(customers)))
+    nearest = nearest.reshape(size, -1) + 1
+    distances = distances.reshape(size, -1)
+    own = nearest == np.arange(size)[:, np.newaxis]
+    # Push each row's own id (or, if absent, the surplus farthest candidate) to the end
+    distances = np.where(own, np.inf, distances)
+    order = np.lexsort((nearest, distances), axis=1)
+    return np.take_along_axis(nearest, order, axis=1)[:, :k].astype(np.int32)
+
+
+def build_neighbour_index(
+    coordinates: np.ndarray | None,
+    k: int,
+    distance_matrix: np.ndarray | None = None,
+    method: str = "auto"
+) -> np.ndarray:
+    """(n + 1, k) int32 ids of the k customers nearest to each location.
+
+    k is capped at n - 1 (no customer is its own neighbour). "auto" uses the
+    distance matrix up to KD_TREE_MIN_SIZE customers, then the KD-tree if
+    scipy is installed and the blocked coordinate scan otherwise; without
+    coordinates it always uses the matrix.
+    """
+    if method not in NEIGHBOUR_METHODS:
+        raise ValueError(f"Unknown neighbour method '{method}', expected one of {list(NEIGHBOUR_METHODS)}.")
+    size = (distance_matrix if coordinates is None else coordinates).shape[0]
+    k = max(0, min(k, size - 2))
+    if k == 0:
+        return np.zeros((size, 0), dtype=np.int32)
+    if method == "auto":
+        if coordinates is None or (distance_matrix is not None and size - 1 <= KD_TREE_MIN_SIZE):
+            method = "matrix"
+        else:
+            method = "kdtree" if SCIPY_AVAILABLE else "brute"
+    if method == "matrix":
+        if distance_matrix is None:
+            raise ValueError("The 'matrix' neighbour method needs a distance matrix.")
+        return _from_matrix(distance_matrix, k)
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    if method == "kdtree":
+        if not SCIPY_AVAILABLE:
+            raise ImportError("The 'kdtree' neighbour method needs scipy.")
+        return _from_kdtree(coordinates, k)
+    return _from_coordinates(coordinates, k)
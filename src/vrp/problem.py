@@ -1,8 +1,21 @@
-import math
+import numpy as np
+
+from src.vrp.distances import CoordinateDistances, DenseDistances, make_distances
+from src.vrp.neighbours import build_neighbour_index
+
+# Candidate list size used when an operator does not ask for a specific k
+DEFAULT_NEIGHBOURS = 10
 
 # Holds all the info for a single VRP scenario
+# Distances are served by a provider (see src/vrp/distances.py): a dense matrix
+# for small instances, or computed from the coordinates for very large ones
+# (distance_mode "auto" picks by size, "dense"/"on_demand" force one).
+# edge_weight_type is the TSPLIB header's: "EUC_2D", or "EXPLICIT" when the
+# matrix comes from the file and the coordinates are for display only.
+# With rounded_distances (or an integer matrix) distances are TSPLIB integers
+# in int32 and route costs are summed in integers (integer_distances)
 class ProblemInstance:
-    def __init__(self, scenario_data):
+    def __init__(self, scenario_data, distance_dtype=np.float64, distance_mode="auto"):
         self.name = scenario_data["name"]
         self.num_vehicles = scenario_data["num_vehicles"]
         self.depot = scenario_data["depot"]
@@ -12,24 +25,69 @@ class ProblemInstance:
         self.vehicle_capacity = scenario_data["vehicle_capacity"]
         self.toughness = scenario_data["fleet_utilization"]
         self.all_locations = [self.depot] + self.customers
-        self.distance_matrix = self._calculate_distance_matrix()
-
-    def _calculate_euclidean_distance(self, p1, p2):
-        # Standard distance formula
-        return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-
-    def _calculate_distance_matrix(self):
-        # Precompute all pairwise distances
-        num_locations = len(self.all_locations)
-        matrix = [[0.0] * num_locations for _ in range(num_locations)]
-        for i in range(num_locations):
-            for j in range(num_locations):
-                if i != j:
-                    matrix[i][j] = self._calculate_euclidean_distance(
-                        self.all_locations[i], self.all_locations[j]
-                    )
-        return matrix
+        # (n+1, 2) coordinate array, row 0 is the depot
+        self.coordinates = np.asarray(self.all_locations, dtype=np.float64).reshape(-1, 2)
+        self.edge_weight_type = scenario_data.get("edge_weight_type", "EUC_2D")
+        matrix = scenario_data.get("distance_matrix")
+        if matrix is not None:
+            # An integer matrix keeps its integer type
+            matrix = np.asarray(matrix)
+            self.distances = DenseDistances(np.ascontiguousarray(matrix, dtype=np.int32 if matrix.dtype.kind in "iu" else distance_dtype))
+        else:
+            rounded = scenario_data.get("rounded_distances", False)
+            self.distances = make_distances(self.coordinates, distance_dtype, distance_mode, rounded)
+        self._neighbour_index: np.ndarray | None = None
+
+    @classmethod
+    def from_arrays(cls, name, num_vehicles, vehicle_capacity, coordinates, customer_demands, distance_matrix,
+                    distance_dtype=np.float64, edge_weight_type="EUC_2D", rounded_distances=False):
+        # Rebuild an instance around existing arrays (e.g. views onto shared memory)
+        # without recomputing the distance matrix; row 0 of coordinates is the depot.
+        # Without a matrix, distances are computed from the coordinates (rounded
+        # to integers if rounded_distances); a matrix's dtype decides on its own
+        problem = cls.__new__(cls)
+        problem.name = name
+        problem.num_vehicles = num_vehicles
+        problem.vehicle_capacity = vehicle_capacity
+        problem.coordinates = coordinates
+        problem.edge_weight_type = edge_weight_type
+        if distance_matrix is not None:
+            problem.distances = DenseDistances(distance_matrix)
+        else:
+            problem.distances = CoordinateDistances(coordinates, distance_dtype, rounded_distances)
+        problem.customer_demands = [int(d) for d in customer_demands]
+        problem.num_customers = len(problem.customer_demands)
+        locations = [tuple(xy) for xy in coordinates.tolist()]
+        problem.depot = locations[0]
+        problem.customers = locations[1:]
+        problem.all_locations = locations
+        problem.toughness = sum(problem.customer_demands) / (num_vehicles * vehicle_capacity)
+        problem._neighbour_index = None
+        return problem
+
+    @property
+    def integer_distances(self) -> bool:
+        # True when distances are integers and split costs are accumulated as int64
+        return self.distances.integer
+
+    @property
+    def distance_matrix(self):
+        # The dense (n+1, n+1) matrix, or None when distances are computed on demand
+        return self.distances.matrix
+
+    def nearest_neighbours(self, k: int = DEFAULT_NEIGHBOURS) -> np.ndarray:
+        # (n+1, k) int32 ids of the k customers closest to each location, closest
+        # first (row 0 is the depot). Built on first use (see src/vrp/neighbours.py)
+        # and cached; a smaller k is served from the cached index of a larger one
+        k = max(0, min(k, self.num_customers - 1))
+        if self._neighbour_index is None or self._neighbour_index.shape[1] < k:
+            # Display coordinates of EXPLICIT instances say nothing about distances
+            coordinates = None if self.edge_weight_type == "EXPLICIT" else self.coordinates
+            self._neighbour_index = build_neighbour_index(coordinates, k, self.distance_matrix)
+            if isinstance(self.distances, CoordinateDistances):
+                self.distances.cache_neighbours(self._neighbour_index)
+        return self._neighbour_index[:, :k]
 
     def get_distance(self, idx1, idx2):
         # Look up the distance between two points
-        return self.distance_matrix[idx1][idx2]
\ No newline at end of file
+        return self.distances.get(idx1, idx2)
@@ -0,0 +1,120 @@
+"""Problem data shared between the main process and pool workers.
+
+The parent publishes every ProblemInstance once with SharedProblemStore. The
+distance matrix (if the instance has a dense one), coordinates and demand
+vector are copied into multiprocessing.shared_memory blocks. Workers receive only the small,
+picklable handles (through init_worker) and rebuild each instance with
+get_problem(key) around zero-copy, read-only views of those blocks, so tasks
+never carry the O(n^2) matrix.
+"""
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.vrp.problem import ProblemInstance
+
+# Arrays published per instance
+_SHARED_FIELDS = ("distance_matrix", "coordinates", "customer_demands")
+
+
+class SharedProblemStore:
+    """Owns the shared-memory copies of published problems (parent process only).
+
+    Use as a context manager, or call close() when all workers are done: the
+    blocks are unlinked then.
+    """
+
+    def __init__(self):
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._handles: dict[str, dict] = {}
+
+    def publish(self, problem: ProblemInstance) -> str:
+        """Copies the problem's arrays into shared memory; returns its key."""
+        key = problem.name
+        if key in self._handles:
+            return key
+        arrays = {
+            "distance_matrix": problem.distance_matrix,
+            "coordinates": np.asarray(problem.coordinates, dtype=np.float64),
+            "customer_demands": np.asarray(problem.customer_demands, dtype=np.int64),
+        }
+        specs = {}
+        for field in _SHARED_FIELDS:
+            array = arrays[field]
+            if array is None:
+                continue  # distances computed on demand: each worker keeps only O(n k) data
+            array = np.asarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            specs[field] = (block.name, array.shape, array.dtype.str)
+        self._handles[key] = {
+            "name": problem.name,
+            "num_vehicles": problem.num_vehicles,
+            "vehicle_capacity": problem.vehicle_capacity,
+            "distance_dtype": problem.distances.dtype.str,
+            "edge_weight_type": problem.edge_weight_type,
+            "integer_distances": problem.integer_distances,
+            "arrays": specs,
+        }
+        return key
+
+    def handles(self) -> dict[str, dict]:
+        """Picklable description of every published problem, for init_worker."""
+        return dict(self._handles)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self._handles = {}
+
+    def __enter__(self) -> SharedProblemStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Worker-side state: handles received from the parent, and problems attached so far
+_handles: dict[str, dict] = {}
+_attached: dict[str, tuple[ProblemInstance, list[shared_memory.SharedMemory]]] = {}
+
+
+def init_worker(handles: dict[str, dict]) -> None:
+    """ProcessPoolExecutor initializer: remembers where the published problems live."""
+    global _handles
+    _handles = handles
+
+
+def get_problem(key: str) -> ProblemInstance:
+    """The published problem `key`, attached on first use and reused afterwards."""
+    if key not in _attached:
+        if key not in _handles:
+            raise KeyError(f"Problem '{key}' was not published to this process.")
+        handle = _handles[key]
+        blocks = []
+        arrays = {}
+        for field, (block_name, shape, dtype) in handle["arrays"].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            array.flags.writeable = False
+            blocks.append(block)
+            arrays[field] = array
+        problem = ProblemInstance.from_arrays(
+            handle["name"],
+            handle["num_vehicles"],
+            handle["vehicle_capacity"],
+            arrays["coordinates"],
+            arrays["customer_demands"],
+            arrays.get("distance_matrix"),
+            np.dtype(handle["distance_dtype"]),
+            handle["edge_weight_type"],
+            handle["integer_distances"],
+        )
+        # Keep the blocks referenced for as long as the arrays are in use
+        _attached[key] = (problem, blocks)
+    return _attached[key][0]